@@ -48,10 +48,14 @@ from normalize.record import Record
 from normalize.record.meta import RecordMeta
 from normalize.record.json import AutoJsonRecord
 from normalize.record.json import from_json
+from normalize.record.json import from_json_parallel
+from normalize.record.json import from_ndjson
 from normalize.record.json import JsonRecord
 from normalize.record.json import JsonRecordList
+from normalize.record.json import LazyJsonRecord
 from normalize.record.json import NCAutoJsonRecord
 from normalize.record.json import to_json
+from normalize.record.json import to_ndjson
 from normalize.selector import FieldSelector
 from normalize.selector import FieldSelectorException
 from normalize.selector import MultiFieldSelector
@@ -77,6 +81,8 @@ __all__ = [
     "FieldSelectorException",
     "FloatProperty",
     "from_json",
+    "from_json_parallel",
+    "from_ndjson",
     "IntegerProperty",
     "IntProperty",
     "JsonCollection",  # deprecated - use JsonRecordList
@@ -86,6 +92,7 @@ __all__ = [
     "JsonProperty",
     "JsonRecord",
     "JsonRecordList",
+    "LazyJsonRecord",
     "LazyProperty",
     "LazySafeProperty",
     "ListCollection",
@@ -105,6 +112,7 @@ __all__ = [
     "StringProperty",
     "subtype",
     "to_json",
+    "to_ndjson",
     "UnicodeProperty",
     "V1Property",
     "Visitor",
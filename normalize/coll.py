@@ -22,6 +22,8 @@ import sys
 import types
 
 import normalize.exc as exc
+from normalize.property import _generation
+from normalize.record import _box_batch_error
 from normalize.record import Record
 
 """This class contains container classes which can act like collections but
@@ -101,6 +103,19 @@ class Collection(Record):
         )
         super(Collection, self).__init__(**kwargs)
 
+    @classmethod
+    def from_trusted(cls, values=None, **kwargs):
+        """Trusted version of the constructor, which does not coerce the
+        items in ``values``; see
+        :py:meth:`normalize.record.Record.from_trusted`."""
+        if cls.validate_trusted:
+            return cls(values, **kwargs)
+        self = super(Collection, cls).from_trusted(**kwargs)
+        self._values = cls.tuples_to_coll(
+            cls.coll_to_tuples(values), coerce=False,
+        )
+        return self
+
     def __iter__(self):
         """The default iterator always iterates over the *values* of a
         Collection."""
@@ -193,9 +208,11 @@ class KeyedCollection(Collection):
 
     def __setitem__(self, key, item):
         self._values[key] = self.coerce_value(item)
+        _generation[0] += 1
 
     def __delitem__(self, key):
         del self._values[key]
+        _generation[0] += 1
 
 
 class DictCollection(KeyedCollection):
@@ -247,6 +264,7 @@ class DictCollection(KeyedCollection):
 
     def clear(self):
         self._values.clear()
+        _generation[0] += 1
 
     def iterkeys(self):
         return (k for k, v in self.itertuples())
@@ -261,10 +279,14 @@ class DictCollection(KeyedCollection):
         return self._values.values()
 
     def pop(self, k):
-        return self._values.pop(k)
+        value = self._values.pop(k)
+        _generation[0] += 1
+        return value
 
     def popitem(self):
-        return self._values.popitem()
+        item = self._values.popitem()
+        _generation[0] += 1
+        return item
 
     def update(self, iterable=None, **kw):
         keys = getattr(iterable, "keys", None)
@@ -336,16 +358,41 @@ class ListCollection(KeyedCollection):
                 colltype=cls,
             )
 
+    @classmethod
+    def from_many(cls, iterable, **kwargs):
+        """Alternate constructor for large collections of records; the members
+        are built using :py:meth:`normalize.record.Record.from_many` if the
+        ``itemtype`` is a ``Record`` type and ``coerceitem`` is not
+        customized.  Any failure raises a
+        :py:class:`normalize.exc.BatchConversionError` with the index of the
+        failing member."""
+        itemtype = cls.itemtype
+        if isinstance(itemtype, type) and issubclass(itemtype, Record) and \
+                cls.coerceitem is itemtype:
+            values = itemtype.from_many(iterable)
+        else:
+            values = []
+            for i, item in enumerate(iterable):
+                try:
+                    values.append(cls.coerce_value(item))
+                except Exception as e:
+                    raise _box_batch_error(i, e)
+        self = cls(**kwargs)
+        self._values = cls.colltype(values)
+        return self
+
     def append(self, item):
         """Adds a new value to the collection, coercing it.
         """
         self._values.append(self.coerce_value(item))
+        _generation[0] += 1
 
     def extend(self, iterable):
         """Adds new values to the end of the collection, coercing items.
         """
         # perhaps: self[len(self):len(self)] = iterable
         self._values.extend(self.coerce_value(item) for item in iterable)
+        _generation[0] += 1
 
     def count(self, value):
         return self._values.count(value)
@@ -388,13 +435,16 @@ class ListCollection(KeyedCollection):
 
     def reverse(self):
         self._values.reverse()
+        _generation[0] += 1
 
     def sort(self, *a, **kw):
         self._values.sort(*a, **kw)
+        _generation[0] += 1
 
     def __setitem__(self, key, value):
         if isinstance(key, slice):
             self._values[key] = (self.coerce_value(item) for item in value)
+            _generation[0] += 1
         else:
             return super(ListCollection, self).__setitem__(key, value)
 
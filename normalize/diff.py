@@ -17,8 +17,13 @@
 from __future__ import absolute_import
 
 import collections
+import copy
+import cPickle
+import datetime
+import decimal
+import hashlib
+import heapq
 from itertools import chain
-from itertools import product
 import re
 import types
 import unicodedata
@@ -26,6 +31,7 @@ import unicodedata
 from richenum import OrderedRichEnum
 from richenum import OrderedRichEnumValue
 
+from normalize.property import _generation
 from normalize.property import SafeProperty
 from normalize.coll import Collection
 from normalize.coll import DictCollection
@@ -35,6 +41,7 @@ from normalize.record import Record
 from normalize.record import record_id
 from normalize.selector import FieldSelector
 from normalize.selector import MultiFieldSelector
+from normalize.utils import _LruCache
 
 
 class DiffTypes(OrderedRichEnum):
@@ -109,6 +116,40 @@ class DiffInfo(Record):
         return "<DiffInfo: %s %s>" % (difftype, pathinfo)
 
 
+_new_object = object.__new__
+
+# types of keys which a FieldSelector accepts
+_fs_key_types = (basestring, int, long, types.NoneType)
+
+
+def _fs_plus(fs, key):
+    """Returns ``fs + [key]``, without re-checking the path already in
+    ``fs``."""
+    if type(fs) is not FieldSelector or not isinstance(key, _fs_key_types):
+        return fs + [key]
+    new_fs = _new_object(FieldSelector)
+    new_fs.selectors = fs.selectors + [key]
+    return new_fs
+
+
+def _new_diff_info(diff_type, base, other):
+    """Builds a ``DiffInfo``, without checking the values; the diff functions
+    only ever pass ``DiffTypes`` values and ``FieldSelector`` objects.  If
+    ``DiffInfo.validate_trusted`` is set, it is built by the constructor
+    instead."""
+    if DiffInfo.validate_trusted:
+        return DiffInfo(diff_type=diff_type, base=base, other=other)
+    diff = _new_object(DiffInfo)
+    diff.__dict__.update(diff_type=diff_type, base=base, other=other)
+    return diff
+
+
+# light-weight stand-in for DiffInfo, used when differences are only counted
+_DiffTuple = collections.namedtuple(
+    "_DiffTuple", ("diff_type", "base", "other"),
+)
+
+
 class _Nothing(object):
     def __repr__(self):
         return "(not set)"
@@ -116,6 +157,21 @@ class _Nothing(object):
 
 _nothing = _Nothing()
 
+_whitespace_re = re.compile(r'\s+', re.UNICODE)
+
+# DiffOptions hooks which, if overridden, may normalize values based on state
+# that ``digest_key()`` does not know about
+_normalize_hooks = (
+    "normalize_whitespace", "normalize_unf", "normalize_case",
+    "normalize_text", "normalize_val", "normalize_slot",
+    "normalize_object_slot", "normalize_item", "value_is_empty", "record_id",
+)
+
+#: returned by :py:meth:`DiffOptions.normalize_memo_info`
+NormalizeMemoInfo = collections.namedtuple(
+    "NormalizeMemoInfo", ("hits", "misses", "maxsize", "size"),
+)
+
 
 class DiffOptions(object):
     """Optional data structure to pass diff options down.  Some functions are
@@ -123,12 +179,19 @@ class DiffOptions(object):
     forming the *DiffOptions sub-class API*.
     """
     _nothing = _nothing
+    # type of the differences yielded; diff_summary and records_differ swap
+    # in a light-weight one
+    _diff_info = staticmethod(_new_diff_info)
+    # the normalize_memo caches, and the options they were made for
+    _text_memos = None
+    _text_memos_key = None
 
     def __init__(self, ignore_ws=True, ignore_case=False,
                  unicode_normal=True, unchanged=False,
                  ignore_empty_slots=False, ignore_empty_items=False,
                  duck_type=False, extraneous=False,
-                 compare_filter=None, fuzzy_match=True, moved=False):
+                 compare_filter=None, fuzzy_match=True, moved=False,
+                 workers=None, normalize_memo=None):
         """Create a new ``DiffOptions`` instance.
 
         args:
@@ -183,6 +246,24 @@ class DiffOptions(object):
                 Restrict comparison to the fields described by the passed
                 :py:class:`MultiFieldSelector` (or list of FieldSelector
                 lists/objects)
+
+            ``workers=``\ *INT*
+                Compare the matched members of large collections of records
+                in a ``multiprocessing`` pool of this many worker processes.
+                The records and the ``DiffOptions`` must be picklable; if
+                not, they are compared in this process.  The differences
+                within members are yielded in the order of the members in
+                the base collection.
+
+            ``normalize_memo=``\ *INT*
+                Remember the results of normalizing up to about this many
+                recently seen strings (of each of ``str`` and ``unicode``),
+                so that strings which appear many times, for instance in
+                both the objects being compared or in primary keys, are only
+                normalized once.  The hit rate can be checked with
+                :py:meth:`normalize_memo_info`.  Off by default.  The cache
+                is emptied if ``ignore_ws``, ``ignore_case``,
+                ``unicode_normal`` or ``normalize_memo`` are changed.
         """
         self.ignore_ws = ignore_ws
         self.ignore_case = ignore_case
@@ -194,23 +275,103 @@ class DiffOptions(object):
         self.moved = moved
         self.duck_type = duck_type
         self.extraneous = extraneous
+        self.workers = workers
+        self.normalize_memo = normalize_memo
         if isinstance(compare_filter, (MultiFieldSelector, types.NoneType)):
             self.compare_filter = compare_filter
         else:
             self.compare_filter = MultiFieldSelector(*compare_filter)
 
+    def _get_text_memos(self):
+        """Returns the ``normalize_memo`` caches, making new ones if the
+        options which affect ``normalize_text`` have changed."""
+        key = (self.normalize_memo, self.ignore_ws, self.ignore_case,
+               self.unicode_normal)
+        if key != self._text_memos_key:
+            if self.normalize_memo:
+                self._text_memos = dict(
+                    (text_type,
+                     _LruCache(self.normalize_text, self.normalize_memo))
+                    for text_type in (str, unicode)
+                )
+            else:
+                self._text_memos = None
+            self._text_memos_key = key
+        return self._text_memos
+
+    def __getstate__(self):
+        """The memos hold bound methods, so they are not pickled (or copied)
+        but re-created."""
+        state = dict(self.__dict__)
+        state.pop("_text_memos", None)
+        state.pop("_text_memos_key", None)
+        return state
+
+    def normalize_memo_info(self):
+        """Returns a :py:data:`NormalizeMemoInfo` ``(hits, misses, maxsize,
+        size)`` tuple of statistics for the ``normalize_memo`` cache, or
+        ``None`` if it is not enabled."""
+        memos = self._get_text_memos()
+        if not memos:
+            return None
+        return NormalizeMemoInfo(
+            hits=sum(x.hits for x in memos.values()),
+            misses=sum(x.misses for x in memos.values()),
+            maxsize=self.normalize_memo,
+            size=sum(
+                len(x.recent) + len(x.older) for x in memos.values()
+            ),
+        )
+
     def items_equal(self, a, b):
         """Sub-class hook which performs value comparison.  Only called for
         comparisons which are not Records."""
         return a == b
 
+    def digest_key(self):
+        """Sub-class hook which returns a hashable summary of the options
+        which affect how values are normalized, or ``None``.  Records and
+        collections whose digests (see :py:func:`diff_digest`) are equal are
+        not compared any further, and the digests are cached in the instances
+        under this key.
+
+        ``None`` is returned, disabling the digests, when a
+        ``compare_filter`` is in use, when ``duck_type`` is set or when
+        :py:meth:`items_equal` or :py:meth:`is_filtered` have been
+        overridden.  It is also returned if any of the ``normalize_``\ *X*,
+        :py:meth:`value_is_empty` or :py:meth:`record_id` hooks have been
+        overridden, unless this method is too; sub-classes which do so
+        should add any state those hooks depend on to the key.
+        """
+        cls = type(self)
+        if self.compare_filter is not None or self.duck_type or (
+            cls.items_equal.im_func is not DiffOptions.items_equal.im_func
+        ) or (
+            cls.is_filtered.im_func is not DiffOptions.is_filtered.im_func
+        ):
+            return None
+        stock_hooks = cls.__dict__.get("_stock_normalize_hooks")
+        if stock_hooks is None:
+            stock_hooks = (
+                cls.digest_key.im_func is not
+                DiffOptions.digest_key.im_func
+            ) or all(
+                getattr(cls, name).im_func is
+                getattr(DiffOptions, name).im_func
+                for name in _normalize_hooks
+            )
+            cls._stock_normalize_hooks = stock_hooks
+        if not stock_hooks:
+            return None
+        return (
+            type(self), self.ignore_ws, self.ignore_case,
+            self.unicode_normal, self.ignore_empty_slots, self.extraneous,
+        )
+
     def normalize_whitespace(self, value):
         """Normalizes whitespace; called if ``ignore_ws`` is true."""
         if isinstance(value, unicode):
-            return u" ".join(
-                x for x in re.split(r'\s+', value, flags=re.UNICODE) if
-                len(x)
-            )
+            return u" ".join(x for x in _whitespace_re.split(value) if len(x))
         else:
             return " ".join(value.split())
 
@@ -256,7 +417,13 @@ class DiffOptions(object):
         value is not set.
         """
         if isinstance(value, basestring):
-            value = self.normalize_text(value)
+            memos = self._text_memos
+            if memos is not None or self.normalize_memo:
+                memos = self._get_text_memos()
+            if memos and type(value) in memos:
+                value = memos[type(value)](value)
+            else:
+                value = self.normalize_text(value)
         if self.ignore_empty_slots and self.value_is_empty(value):
             value = _nothing
         return value
@@ -320,8 +487,15 @@ class DiffOptions(object):
     def record_id(self, record, type_=None, selector=None):
         """Retrieve an object identifier from the given record; if it is an
         alien class, and the type is provided, then use duck typing to get the
-        corresponding fields of the alien class."""
-        pk = record_id(record, type_, selector, self.normalize_object_slot)
+        corresponding fields of the alien class.
+
+        Identifiers are cached in the record under :py:meth:`digest_key`, so
+        they are only cached if the normalization hooks are the stock ones
+        or the sub-class says how to key its own."""
+        pk = record_id(
+            record, type_, selector, self.normalize_object_slot,
+            self.digest_key(),
+        )
         return pk
 
     def id_args(self, type_, fs):  # XXX deprecated
@@ -349,6 +523,90 @@ class DiffOptions(object):
         return self.compare_filter and not self.compare_filter[fs]
 
 
+def _diff_plan(record_type, extraneous):
+    """Returns the properties of ``record_type`` to compare, in order, as
+    ``(propname, prop, compare_as_info, checked)``, leaving out extraneous
+    properties unless ``extraneous`` is true.  ``compare_as_info`` is
+    ``(method, nargs)`` for properties with a ``compare_as`` function, and
+    ``checked`` says whether assignments to the property are seen (see
+    :py:func:`diff_digest`).  Cached in the type."""
+    plans = record_type.__dict__.get("_diff_plans")
+    if plans is None:
+        plans = record_type._diff_plans = {}
+    plan = plans.get(extraneous)
+    if plan is None:
+        plan = plans[extraneous] = tuple(
+            (
+                propname, prop,
+                getattr(prop, "compare_as_info", (False, 1)) if
+                hasattr(prop, "compare_as") else None,
+                hasattr(type(prop), "__set__"),
+            ) for propname, prop in sorted(record_type.properties.iteritems())
+            if extraneous or not prop.extraneous
+        )
+    return plan
+
+
+def _compare_as(prop, compare_as_info, obj, value):
+    """Applies a property's ``compare_as`` function, as
+    :py:meth:`DiffOptions.normalize_object_slot` does."""
+    method, nargs = compare_as_info
+    args = []
+    if method:
+        args.append(obj)
+    if nargs:
+        args.append(value)
+    return prop.compare_as(*args)
+
+
+def _slot_normalizer(options):
+    """Returns a function ``(value, prop, compare_as_info, obj)`` which is
+    equivalent to ``options.normalize_object_slot(value, prop, obj)``, but
+    avoids looking for ``compare_as`` if the method is not overridden."""
+    if type(options).normalize_object_slot.im_func is not \
+            DiffOptions.normalize_object_slot.im_func:
+        normalize_object_slot = options.normalize_object_slot
+
+        def normalize(value, prop, compare_as_info, obj):
+            return normalize_object_slot(value, prop, obj)
+
+        return normalize
+
+    normalize_slot = options.normalize_slot
+
+    def normalize(value, prop, compare_as_info, obj):
+        if compare_as_info is not None and value is not _nothing:
+            value = _compare_as(prop, compare_as_info, obj, value)
+        return normalize_slot(value, prop)
+
+    return normalize
+
+
+# whether values of each type are compared by one of COMPARE_FUNCTIONS, and
+# which ones; COMPARE_FUNCTIONS is only consulted once for each type
+_comparable_types = {}
+_type_compare_functions = {}
+
+
+def _compare_functions(value_type):
+    functions = _type_compare_functions.get(value_type)
+    if functions is None:
+        functions = _type_compare_functions[value_type] = tuple(
+            func for type_union, func in COMPARE_FUNCTIONS.iteritems() if
+            issubclass(value_type, type_union)
+        )
+    return functions
+
+
+def _is_comparable(value_type):
+    comparable = _comparable_types.get(value_type)
+    if comparable is None:
+        comparable = _comparable_types[value_type] = issubclass(
+            value_type, COMPARABLE,
+        )
+    return comparable
+
+
 def compare_record_iter(a, b, fs_a=None, fs_b=None, options=None):
     """This generator function compares a record, slot by slot, and yields
     differences found as ``DiffInfo`` objects.
@@ -390,21 +648,29 @@ def compare_record_iter(a, b, fs_a=None, fs_b=None, options=None):
         fs_a = FieldSelector(tuple())
         fs_b = FieldSelector(tuple())
 
-    properties = (
-        type(a).properties if a is not _nothing else type(b).properties
+    record_type = type(a) if a is not _nothing else type(b)
+    stock_filter = (
+        type(options).is_filtered.im_func is DiffOptions.is_filtered.im_func
     )
-    for propname in sorted(properties):
-
-        prop = properties[propname]
-
-        if options.is_filtered(prop, fs_a + propname):
+    compare_filter = options.compare_filter
+    normalize = _slot_normalizer(options)
+    # with the stock is_filtered(), extraneous properties are left out of
+    # the plan, and the selector is only needed for a compare_filter
+    plan = _diff_plan(record_type, options.extraneous or not stock_filter)
+    for propname, prop, compare_as_info, checked in plan:
+
+        if stock_filter:
+            if compare_filter and \
+                    not compare_filter[_fs_plus(fs_a, propname)]:
+                continue
+        elif options.is_filtered(prop, fs_a + propname):
             continue
 
-        propval_a = options.normalize_object_slot(
-            getattr(a, propname, _nothing), prop, a,
+        propval_a = normalize(
+            getattr(a, propname, _nothing), prop, compare_as_info, a,
         )
-        propval_b = options.normalize_object_slot(
-            getattr(b, propname, _nothing), prop, b,
+        propval_b = normalize(
+            getattr(b, propname, _nothing), prop, compare_as_info, b,
         )
 
         if propval_a is _nothing and propval_b is _nothing:
@@ -414,17 +680,17 @@ def compare_record_iter(a, b, fs_a=None, fs_b=None, options=None):
         one_side_nothing = (propval_a is _nothing) != (propval_b is _nothing)
         types_match = type(propval_a) == type(propval_b)
         comparable = (
-            isinstance(propval_a, COMPARABLE) or
-            isinstance(propval_b, COMPARABLE)
+            _is_comparable(type(propval_a)) or
+            _is_comparable(type(propval_b))
         )
-        prop_fs_a = fs_a + [propname]
-        prop_fs_b = fs_b + [propname]
 
         if comparable and (
             types_match or options.duck_type or (
                 options.ignore_empty_slots and one_side_nothing
             )
         ):
+            prop_fs_a = _fs_plus(fs_a, propname)
+            prop_fs_b = _fs_plus(fs_b, propname)
             if one_side_nothing:
                 diff_types_found = set()
 
@@ -446,34 +712,34 @@ def compare_record_iter(a, b, fs_a=None, fs_b=None, options=None):
                 elif options.unchanged:
                     net_diff = DiffTypes.NO_CHANGE
                 if net_diff:
-                    yield DiffInfo(
+                    yield options._diff_info(
                         diff_type=net_diff,
                         base=prop_fs_a,
                         other=prop_fs_b,
                     )
 
         elif one_side_nothing:
-            yield DiffInfo(
+            yield options._diff_info(
                 diff_type=(
                     DiffTypes.ADDED if propval_a is _nothing else
                     DiffTypes.REMOVED
                 ),
-                base=fs_a + [propname],
-                other=fs_b + [propname],
+                base=_fs_plus(fs_a, propname),
+                other=_fs_plus(fs_b, propname),
             )
 
         elif not options.items_equal(propval_a, propval_b):
-            yield DiffInfo(
+            yield options._diff_info(
                 diff_type=DiffTypes.MODIFIED,
-                base=fs_a + [propname],
-                other=fs_b + [propname],
+                base=_fs_plus(fs_a, propname),
+                other=_fs_plus(fs_b, propname),
             )
 
         elif options.unchanged:
-            yield DiffInfo(
+            yield options._diff_info(
                 diff_type=DiffTypes.NO_CHANGE,
-                base=fs_a + [propname],
-                other=fs_b + [propname],
+                base=_fs_plus(fs_a, propname),
+                other=_fs_plus(fs_b, propname),
             )
 
 
@@ -523,6 +789,127 @@ def collection_generator(collection):
     return generator()
 
 
+# types of values which digest as their repr(): immutable, and such that
+# equal reprs imply equal values (but not necessarily the reverse)
+_digest_leaf_types = frozenset((
+    str, unicode, int, long, float, bool, types.NoneType, decimal.Decimal,
+    datetime.date, datetime.datetime, datetime.time, datetime.timedelta,
+))
+
+
+def diff_digest(value, options=None):
+    """Returns a digest of a record or collection (or simple value), such that
+    if two values have the same digest, then comparing them with the same
+    options would find no differences.  Differences in normalization, such as
+    whitespace when ``ignore_ws`` is set, do not affect the digest; the
+    opposite is not guaranteed, so different digests may still compare equal.
+
+    Returns ``None`` if no digest can be computed; for instance, if the value
+    or any value it contains is a ``list`` or ``dict``, an unknown type, or is
+    stored in a property which allows unchecked assignment (see
+    :py:class:`normalize.property.SafeProperty`).  Digests are cached in the
+    instances of records and collections.  As a digest covers the records a
+    record contains, the cache is not invalidated per instance: any checked
+    property assignment or collection mutation, of any record in the
+    process, discards every cached digest.  Code which modifies records
+    while diffing others gets little benefit from the cache.
+
+    args:
+
+        ``value=``\ *Record*\ \|\ *Collection*\ \|\ *anything*
+            The value to digest.
+
+        ``options=``\ *DiffOptions*
+            The diff options to normalize values with.  A default
+            ``DiffOptions`` is used if not passed.
+    """
+    if options is None:
+        options = DiffOptions()
+    key = options.digest_key()
+    if key is None:
+        return None
+    return _diff_digest(value, options, key)
+
+
+def _diff_digest(value, options, key):
+    if not isinstance(value, Record):
+        value_type = type(value)
+        if value_type not in _digest_leaf_types:
+            return None
+        elif value_type is float or value_type is decimal.Decimal:
+            # NaN is not equal to itself
+            if value_type is float and value != value or (
+                value_type is decimal.Decimal and value.is_nan()
+            ):
+                return None
+        elif value_type is datetime.datetime or value_type is datetime.time:
+            # the repr() of a tzinfo might not say what it is
+            if value.tzinfo is not None:
+                return None
+        return "%s:%r" % (value_type.__name__, value)
+
+    generation = _generation[0]
+    instance_dict = getattr(value, "__dict__", None)
+    if instance_dict is not None:
+        cached = instance_dict.get("_diff_digest")
+        if cached is not None and cached[0] == generation and \
+                cached[1] == key:
+            return cached[2]
+    digest = _record_digest(value, options, key)
+    if instance_dict is not None:
+        instance_dict["_diff_digest"] = (generation, key, digest)
+    return digest
+
+
+def _record_digest(record, options, key):
+    """Computes the digest of a record (or collection) from the digests of
+    the normalized values in its slots (and items)."""
+    record_type = type(record)
+    normalize = _slot_normalizer(options)
+    digest = hashlib.sha1(
+        "%s.%s" % (record_type.__module__, record_type.__name__)
+    )
+    for propname, prop, compare_as_info, checked in _diff_plan(
+        record_type, options.extraneous,
+    ):
+        if not checked:
+            return None
+        value = normalize(
+            getattr(record, propname, _nothing), prop, compare_as_info,
+            record,
+        )
+        if value is _nothing:
+            continue
+        value_digest = _diff_digest(value, options, key)
+        if value_digest is None:
+            return None
+        digest.update("\0%s=%s" % (propname, value_digest))
+
+    if isinstance(record, Collection):
+        itemtype = record_type.itemtype
+        if isinstance(itemtype, type) and issubclass(itemtype, Record):
+            normalize_item = None
+        elif isinstance(record, (DictCollection, ListCollection)):
+            normalize_item = options.normalize_item
+        else:
+            return None
+        items = []
+        for k, v in collection_generator(record):
+            if normalize_item:
+                v = normalize_item(v, record)
+                if v is _nothing:
+                    continue
+            k_digest = _diff_digest(k, options, key)
+            v_digest = _diff_digest(v, options, key)
+            if k_digest is None or v_digest is None:
+                return None
+            items.append("%s=%s" % (k_digest, v_digest))
+        items.sort()
+        digest.update("\0[%s]" % "\0".join(items))
+
+    return digest.hexdigest()
+
+
 def _nested_falsy(x):
     if isinstance(x, tuple):
         return not all(not _nested_falsy(y) for y in x)
@@ -537,48 +924,137 @@ def _nested_empty(x):
         return x is _nothing or x is None or x is ''
 
 
-def _fuzzy_match(set_a, set_b):
-    seen = dict()
-    scores = list()
-
-    # Yes, this is O(n.m), but python's equality operator is
-    # fast for hashable types.
-    for a_pk_seq, b_pk_seq in product(set_a, set_b):
-        a_pk, a_seq = a_pk_seq
-        b_pk, b_seq = b_pk_seq
-        if (a_pk, b_pk) in seen:
-            if seen[a_pk, b_pk][0]:
-                score = list(seen[a_pk, b_pk])
-                scores.append(score + [a_pk_seq, b_pk_seq])
+def _fuzzy_score(a_pk, b_pk):
+    """Returns ``(match, no_match)`` for two primary keys: the number of
+    positions at which they have the same value (ignoring empty values), and
+    the number of positions at which they differ or only one has a value."""
+    match = 0
+    common = min((len(a_pk), len(b_pk)))
+    no_match = max((len(a_pk), len(b_pk))) - common
+    for i in range(0, common):
+        if a_pk[i] == b_pk[i]:
+            if not _nested_falsy(a_pk[i]):
+                match += 1
         else:
-            match = 0
-            common = min((len(a_pk), len(b_pk)))
-            no_match = max((len(a_pk), len(b_pk))) - common
-            for i in range(0, common):
-                if a_pk[i] == b_pk[i]:
-                    if not _nested_falsy(a_pk[i]):
-                        match += 1
-                else:
-                    no_match += 1
-            seen[a_pk, b_pk] = (match, no_match)
+            no_match += 1
+    return match, no_match
+
+
+def _fuzzy_match(set_a, set_b):
+    """Pairs up ``(pk, seq)`` items from ``set_a`` and ``set_b`` whose primary
+    keys have any values in common, best matches first.
+
+    Only pairs which share a value at some position are scored, using an
+    index of the positions and values of the primary keys in ``set_b``.
+    Pairs are taken in order of ``match - no_match``, and then of the order
+    of the two sets (the order a stable sort of every pair would give),
+    using a heap holding the best remaining pair for each item in
+    ``set_a``."""
+    list_a = list(set_a)
+    list_b = list(set_b)
+
+    index = collections.defaultdict(list)
+    for j, (b_pk, b_seq) in enumerate(list_b):
+        for position, value in enumerate(b_pk):
+            index[position, value].append(j)
+
+    choices = list()
+    heap = list()
+    for i, (a_pk, a_seq) in enumerate(list_a):
+        candidates = set()
+        for position, value in enumerate(a_pk):
+            if not _nested_falsy(value):
+                candidates.update(index.get((position, value), ()))
+        scored = list()
+        for j in candidates:
+            match, no_match = _fuzzy_score(a_pk, list_b[j][0])
             if match:
-                scores.append([match, no_match, a_pk_seq, b_pk_seq])
+                scored.append((no_match - match, j))
+        # best last, so that they can be popped off in turn
+        scored.sort(reverse=True)
+        choices.append(scored)
+        if scored:
+            score, j = scored.pop()
+            heap.append((score, i, j))
+    heapq.heapify(heap)
+
+    matched_b = set()
+    while heap and len(matched_b) < len(list_b):
+        score, i, j = heapq.heappop(heap)
+        if j in matched_b:
+            if choices[i]:
+                score, j = choices[i].pop()
+                heapq.heappush(heap, (score, i, j))
+        else:
+            matched_b.add(j)
+            yield list_a[i], list_b[j]
 
-    remaining_a = set(set_a)
-    remaining_b = set(set_b)
 
-    for match, no_match, a_pk_seq, b_pk_seq in sorted(
-        scores,
-        key=lambda x: x[0] - x[1],
-        reverse=True,
-    ):
-        if a_pk_seq in remaining_a and b_pk_seq in remaining_b:
-            remaining_a.remove(a_pk_seq)
-            remaining_b.remove(b_pk_seq)
-            yield a_pk_seq, b_pk_seq
+# collections with fewer matched members than this are not compared in
+# parallel, even if 'workers' is set
+_parallel_min_pairs = 1000
+
+
+def _diff_pairs_batch(job):
+    """Compares ``(a_key, b_key, a_val, b_val)`` pairs, and returns the
+    differences as ``(diff_type index, base path, other path)``."""
+    options, fs_a, fs_b, pairs = job
+    results = []
+    for a_key, b_key, a_val, b_val in pairs:
+        for diff in _diff_iter(
+            a_val, b_val, _fs_plus(fs_a, a_key), _fs_plus(fs_b, b_key),
+            options,
+        ):
+            results.append((
+                diff.diff_type.index, diff.base.selectors,
+                diff.other.selectors,
+            ))
+    return results
+
+
+def _trusted_fs(selectors):
+    fs = _new_object(FieldSelector)
+    fs.selectors = selectors
+    return fs
+
+
+def _diff_pairs_parallel(key_pairs, propval_a, propval_b, fs_a, fs_b,
+                         options):
+    """Compares the members of two collections with the given keys in a
+    pool of ``options.workers`` processes, and yields the differences in the
+    order of ``key_pairs``."""
+    from normalize.record.json import _map_batches
+
+    worker_options = copy.copy(options)
+    worker_options.workers = None
+    worker_options._diff_info = _DiffTuple
+    batch_size = max(1, min(1000, len(key_pairs) // (options.workers * 4)))
+
+    def jobs():
+        for i in xrange(0, len(key_pairs), batch_size):
+            yield worker_options, fs_a, fs_b, list(
+                (a_key, b_key, propval_a[a_key], propval_b[b_key]) for
+                a_key, b_key in key_pairs[i:i + batch_size]
+            )
 
-        if not remaining_a or not remaining_b:
-            break
+    job_iter = jobs()
+    first_job = next(job_iter)
+    try:
+        cPickle.dumps(first_job, cPickle.HIGHEST_PROTOCOL)
+        workers = options.workers
+    except Exception:
+        # eg, local classes; these can't be sent to a worker process
+        workers = None
+
+    for results in _map_batches(
+        _diff_pairs_batch, chain((first_job,), job_iter), workers,
+    ):
+        for type_index, base, other in results:
+            yield options._diff_info(
+                diff_type=DiffTypes.from_index(type_index),
+                base=_trusted_fs(base),
+                other=_trusted_fs(other),
+            )
 
 
 # There's a lot of repetition in the following code.  It could be served by one
@@ -666,6 +1142,17 @@ def compare_collection_iter(propval_a, propval_b, fs_a=None, fs_b=None,
 
     if compare_values or force_descent:
         descendable = (removed | added) if force_descent else common
+        if options.workers > 1 and not force_descent and \
+                len(descendable) >= _parallel_min_pairs:
+            for diff in _diff_pairs_parallel(
+                sorted(
+                    (rev_keys['a'][pk_seq], rev_keys['b'][pk_seq]) for
+                    pk_seq in descendable
+                ),
+                propval_a, propval_b, fs_a, fs_b, options,
+            ):
+                yield diff
+            descendable = ()
 
         for pk, seq in descendable:
             if not force_descent or propval_a is not _nothing:
@@ -681,8 +1168,8 @@ def compare_collection_iter(propval_a, propval_b, fs_a=None, fs_b=None,
                 else:
                     b_key = a_key
                     b_val = _nothing
-            selector_a = fs_a + a_key
-            selector_b = fs_b + b_key
+            selector_a = _fs_plus(fs_a, a_key)
+            selector_b = _fs_plus(fs_b, b_key)
             for diff in _diff_iter(
                 a_val, b_val, selector_a, selector_b, options,
             ):
@@ -696,8 +1183,8 @@ def compare_collection_iter(propval_a, propval_b, fs_a=None, fs_b=None,
                 a_val = propval_a[a_key]
                 b_key = rev_keys['b'][b_pk_seq]
                 b_val = propval_b[b_key]
-                selector_a = fs_a + a_key
-                selector_b = fs_b + b_key
+                selector_a = _fs_plus(fs_a, a_key)
+                selector_b = _fs_plus(fs_b, b_key)
                 any_diffs = False
                 for diff in _diff_iter(
                     a_val, b_val, selector_a, selector_b, options,
@@ -707,16 +1194,16 @@ def compare_collection_iter(propval_a, propval_b, fs_a=None, fs_b=None,
                     yield diff
 
                 if options.moved and a_key != b_key:
-                    yield DiffInfo(
+                    yield options._diff_info(
                         diff_type=DiffTypes.MOVED,
-                        base=fs_a + [a_key],
-                        other=fs_b + [b_key],
+                        base=_fs_plus(fs_a, a_key),
+                        other=_fs_plus(fs_b, b_key),
                     )
                 elif options.unchanged and not any_diffs:
-                    yield DiffInfo(
+                    yield options._diff_info(
                         diff_type=DiffTypes.NO_CHANGE,
-                        base=fs_a + [a_key],
-                        other=fs_b + [b_key],
+                        base=_fs_plus(fs_a, a_key),
+                        other=_fs_plus(fs_b, b_key),
                     )
 
     if options.unchanged or options.moved:
@@ -725,23 +1212,23 @@ def compare_collection_iter(propval_a, propval_b, fs_a=None, fs_b=None,
             a_key = rev_keys['a'][pk, seq]
             b_key = rev_keys['b'][pk, seq]
             if options.moved and a_key != b_key:
-                yield DiffInfo(
+                yield options._diff_info(
                     diff_type=DiffTypes.MOVED,
-                    base=fs_a + [a_key],
-                    other=fs_b + [b_key],
+                    base=_fs_plus(fs_a, a_key),
+                    other=_fs_plus(fs_b, b_key),
                 )
             elif options.unchanged:
-                yield DiffInfo(
+                yield options._diff_info(
                     diff_type=DiffTypes.NO_CHANGE,
-                    base=fs_a + [a_key],
-                    other=fs_b + [b_key],
+                    base=_fs_plus(fs_a, a_key),
+                    other=_fs_plus(fs_b, b_key),
                 )
 
     if not force_descent:
         for pk, seq in removed:
             a_key = rev_keys['a'][pk, seq]
-            selector = fs_a + [a_key]
-            yield DiffInfo(
+            selector = _fs_plus(fs_a, a_key)
+            yield options._diff_info(
                 diff_type=DiffTypes.REMOVED,
                 base=selector,
                 other=fs_b,
@@ -749,8 +1236,8 @@ def compare_collection_iter(propval_a, propval_b, fs_a=None, fs_b=None,
 
         for pk, seq in added:
             b_key = rev_keys['b'][pk, seq]
-            selector = fs_b + [b_key]
-            yield DiffInfo(
+            selector = _fs_plus(fs_b, b_key)
+            yield options._diff_info(
                 diff_type=DiffTypes.ADDED,
                 base=fs_a,
                 other=selector,
@@ -796,16 +1283,16 @@ def compare_list_iter(propval_a, propval_b, fs_a=None, fs_b=None,
             a_idx = indices['a'][v, seq]
             b_idx = indices['b'][v, seq]
             if options.moved and a_idx != b_idx:
-                yield DiffInfo(
+                yield options._diff_info(
                     diff_type=DiffTypes.MOVED,
-                    base=fs_a + [a_idx],
-                    other=fs_b + [b_idx],
+                    base=_fs_plus(fs_a, a_idx),
+                    other=_fs_plus(fs_b, b_idx),
                 )
             elif options.unchanged:
-                yield DiffInfo(
+                yield options._diff_info(
                     diff_type=DiffTypes.NO_CHANGE,
-                    base=fs_a + [a_idx],
-                    other=fs_b + [b_idx],
+                    base=_fs_plus(fs_a, a_idx),
+                    other=_fs_plus(fs_b, b_idx),
                 )
 
     removed_idx = set(indices['a'][v, seq] for v, seq in removed)
@@ -816,8 +1303,8 @@ def compare_list_iter(propval_a, propval_b, fs_a=None, fs_b=None,
         a_key = indices['a'][v, seq]
         if a_key in modified_idx:
             continue
-        selector = fs_a + [a_key]
-        yield DiffInfo(
+        selector = _fs_plus(fs_a, a_key)
+        yield options._diff_info(
             diff_type=DiffTypes.REMOVED,
             base=selector,
             other=fs_b,
@@ -827,18 +1314,18 @@ def compare_list_iter(propval_a, propval_b, fs_a=None, fs_b=None,
         b_key = indices['b'][v, seq]
         if b_key in modified_idx:
             continue
-        selector = fs_b + [b_key]
-        yield DiffInfo(
+        selector = _fs_plus(fs_b, b_key)
+        yield options._diff_info(
             diff_type=DiffTypes.ADDED,
             base=fs_a,
             other=selector,
         )
 
     for idx in modified_idx:
-        yield DiffInfo(
+        yield options._diff_info(
             diff_type=DiffTypes.MODIFIED,
-            base=fs_a + [idx],
-            other=fs_b + [idx],
+            base=_fs_plus(fs_a, idx),
+            other=_fs_plus(fs_b, idx),
         )
 
 
@@ -881,16 +1368,16 @@ def compare_dict_iter(propval_a, propval_b, fs_a=None, fs_b=None,
             a_key = rev_keys['a'][v, seq]
             b_key = rev_keys['b'][v, seq]
             if options.moved and a_key != b_key:
-                yield DiffInfo(
+                yield options._diff_info(
                     diff_type=DiffTypes.MOVED,
-                    base=fs_a + [a_key],
-                    other=fs_b + [b_key],
+                    base=_fs_plus(fs_a, a_key),
+                    other=_fs_plus(fs_b, b_key),
                 )
             elif options.unchanged:
-                yield DiffInfo(
+                yield options._diff_info(
                     diff_type=DiffTypes.NO_CHANGE,
-                    base=fs_a + [a_key],
-                    other=fs_b + [b_key],
+                    base=_fs_plus(fs_a, a_key),
+                    other=_fs_plus(fs_b, b_key),
                 )
 
     removed_keys = set(rev_keys['a'][v, seq] for v, seq in removed)
@@ -901,8 +1388,8 @@ def compare_dict_iter(propval_a, propval_b, fs_a=None, fs_b=None,
         a_key = rev_keys['a'][v, seq]
         if a_key in modified_keys:
             continue
-        selector = fs_a + [a_key]
-        yield DiffInfo(
+        selector = _fs_plus(fs_a, a_key)
+        yield options._diff_info(
             diff_type=DiffTypes.REMOVED,
             base=selector,
             other=fs_b,
@@ -912,21 +1399,126 @@ def compare_dict_iter(propval_a, propval_b, fs_a=None, fs_b=None,
         b_key = rev_keys['b'][v, seq]
         if b_key in modified_keys:
             continue
-        selector = fs_b + [b_key]
-        yield DiffInfo(
+        selector = _fs_plus(fs_b, b_key)
+        yield options._diff_info(
             diff_type=DiffTypes.ADDED,
             base=fs_a,
             other=selector,
         )
 
     for key in modified_keys:
-        yield DiffInfo(
+        yield options._diff_info(
             diff_type=DiffTypes.MODIFIED,
-            base=fs_a + [key],
-            other=fs_b + [key],
+            base=_fs_plus(fs_a, key),
+            other=_fs_plus(fs_b, key),
         )
 
 
+def _keyed_stream(side, iterable, record_type, fs, options):
+    """Generates ``(pk, index, record)`` for the records in ``iterable``,
+    which must be sorted by their ``record_id``.  Items which are not
+    ``record_type`` instances are passed to its constructor."""
+    id_args = options.id_args(record_type, fs)
+    if not callable(id_args) and 'selector' in id_args and \
+            not id_args['selector']:
+        return
+    prev_pk = _nothing
+    for index, record in enumerate(iterable):
+        if not isinstance(record, record_type):
+            record = record_type(record)
+        if callable(id_args):
+            if fs + [index] not in options.compare_filter:
+                continue
+        pk = options.record_id(
+            record, **(id_args(index) if callable(id_args) else id_args)
+        )
+        if options.ignore_empty_items and _nested_empty(pk):
+            continue
+        if prev_pk is not _nothing and pk < prev_pk:
+            raise exc.DiffStreamNotSorted(
+                side=side, pk=pk, index=index, prev_pk=prev_pk,
+            )
+        prev_pk = pk
+        yield pk, index, record
+
+
+def diff_sorted_iter(iter_a, iter_b, record_type, options=None, **kwargs):
+    """Compares two streams of records which are sorted by their primary key
+    (as returned by :py:meth:`DiffOptions.record_id`), such as two snapshots
+    of a table, and yields differences as :py:class:`DiffInfo` objects.
+    This is a merge join, so the streams are only read once and in step,
+    and memory use does not depend on their length.
+
+    The differences are as :py:func:`compare_collection_iter` would find
+    comparing two lists of the records, with items identified by their
+    position in each stream: ``ADDED`` and ``REMOVED`` records, and the
+    differences within records with the same primary key (matched in order,
+    if a key is repeated).  Records with different primary keys are not
+    fuzzy matched.
+
+    args:
+
+        ``iter_a=``\ *iterable*, ``iter_b=``\ *iterable*
+            The 'base' and 'other' records.  Items which are not instances of
+            ``record_type`` are passed to its constructor.  If an item sorts
+            before the previous one from the same stream, a
+            :py:class:`normalize.exc.DiffStreamNotSorted` is raised.
+
+        ``record_type=``\ *Record sub-class*
+            The type of the records.
+
+        ``options=``\ *DiffOptions*, ``**kwargs``
+            As for :py:func:`diff_iter`.
+    """
+    if options is None:
+        options = DiffOptions(**kwargs)
+    elif len(kwargs):
+        raise exc.DiffOptionsException()
+
+    null_fs = FieldSelector(tuple())
+    stream_a = _keyed_stream("a", iter_a, record_type, null_fs, options)
+    stream_b = _keyed_stream("b", iter_b, record_type, null_fs, options)
+    a = next(stream_a, None)
+    b = next(stream_b, None)
+    while a is not None or b is not None:
+        if b is None or a is not None and a[0] < b[0]:
+            yield options._diff_info(
+                diff_type=DiffTypes.REMOVED,
+                base=_fs_plus(null_fs, a[1]),
+                other=null_fs,
+            )
+            a = next(stream_a, None)
+        elif a is None or b[0] < a[0]:
+            yield options._diff_info(
+                diff_type=DiffTypes.ADDED,
+                base=null_fs,
+                other=_fs_plus(null_fs, b[1]),
+            )
+            b = next(stream_b, None)
+        else:
+            a_key, b_key = a[1], b[1]
+            selector_a = _fs_plus(null_fs, a_key)
+            selector_b = _fs_plus(null_fs, b_key)
+            for diff in _diff_iter(
+                a[2], b[2], selector_a, selector_b, options,
+            ):
+                yield diff
+            if options.moved and a_key != b_key:
+                yield options._diff_info(
+                    diff_type=DiffTypes.MOVED,
+                    base=selector_a,
+                    other=selector_b,
+                )
+            elif options.unchanged:
+                yield options._diff_info(
+                    diff_type=DiffTypes.NO_CHANGE,
+                    base=selector_a,
+                    other=selector_b,
+                )
+            a = next(stream_a, None)
+            b = next(stream_b, None)
+
+
 COMPARE_FUNCTIONS = {
     list: compare_list_iter,
     tuple: compare_list_iter,
@@ -971,13 +1563,22 @@ def diff_iter(base, other, options=None, **kwargs):
 
 
 def _diff_iter(base, other, fs_a, fs_b, options):
-    generators = []
-
-    for type_union, func in COMPARE_FUNCTIONS.iteritems():
-        matches = (isinstance(base, type_union) if base is not _nothing else
-                   isinstance(other, type_union))
-        if matches:
-            generators.append(func(base, other, fs_a, fs_b, options=options))
+    # skip over records and collections which are the same, unless every
+    # comparison is to be reported
+    if not options.unchanged and type(base) is type(other) and \
+            isinstance(base, Record) and hasattr(base, "__dict__") and \
+            hasattr(other, "__dict__"):
+        key = options.digest_key()
+        if key is not None:
+            digest = _diff_digest(base, options, key)
+            if digest is not None and \
+                    digest == _diff_digest(other, options, key):
+                return iter(())
+
+    generators = list(
+        func(base, other, fs_a, fs_b, options=options) for func in
+        _compare_functions(type(base if base is not _nothing else other))
+    )
 
     if len(generators) == 1:
         return generators[0]
@@ -1045,3 +1646,54 @@ def diff(base, other, **kwargs):
     return Diff(diff_iter(base, other, **kwargs),
                 base_type_name=type(base).__name__,
                 other_type_name=type(other).__name__)
+
+
+def _counting_options(options, kwargs):
+    """Returns a copy of the passed ``DiffOptions`` (or a new one, from
+    ``kwargs``) which yields ``_DiffTuple`` rather than ``DiffInfo``
+    objects."""
+    if options is None:
+        options = DiffOptions(**kwargs)
+    elif len(kwargs):
+        raise exc.DiffOptionsException()
+    options = copy.copy(options)
+    options._diff_info = _DiffTuple
+    return options
+
+
+def records_differ(base, other, options=None, **kwargs):
+    """Returns ``True`` if :py:func:`diff_iter` would find any differences
+    between ``base`` and ``other``, stopping at the first one.  No
+    ``DiffInfo`` objects are built.  Takes the same arguments as
+    ``diff_iter``; the ``unchanged`` option is ignored."""
+    options = _counting_options(options, kwargs)
+    options.unchanged = False
+    null_fs = FieldSelector(tuple())
+    for diff in _diff_iter(base, other, null_fs, null_fs, options):
+        return True
+    return False
+
+
+def diff_summary(base, other, options=None, **kwargs):
+    """Counts the differences which :py:func:`diff_iter` would yield, without
+    building ``DiffInfo`` objects.  Takes the same arguments as
+    ``diff_iter``.
+
+    Returns a ``collections.Counter`` keyed by ``(diff_type, key)``, where
+    *key* is the first component of the path to the difference (a property
+    name, or a collection index or key), or ``None`` for a difference at
+    the top level.  ``ADDED`` differences are counted under their path in
+    ``other``, and the rest under their path in ``base``.
+    """
+    options = _counting_options(options, kwargs)
+    summary = collections.Counter()
+    null_fs = FieldSelector(tuple())
+    for diff in _diff_iter(base, other, null_fs, null_fs, options):
+        selector = (
+            diff.other if diff.diff_type == DiffTypes.ADDED else diff.base
+        )
+        summary[
+            diff.diff_type, selector.selectors[0] if selector.selectors else
+            None
+        ] += 1
+    return summary
@@ -138,6 +138,12 @@ class BadAssignment(EmptyAttributeError, TypeError):
     )
 
 
+class BatchConversionError(CoercionError):
+    message = (
+        "Conversion failed at {error_fs.path}; {sub_exception}"
+    )
+
+
 class CastTypeError(UsageException, TypeError):
     message = "Cannot cast to {badtype}; not a record type"
 
@@ -232,6 +238,13 @@ class DiffOptionsException(UsageException):
     message = "pass options= or DiffOptions constructor arguments; not both"
 
 
+class DiffStreamNotSorted(UsageException, ValueError):
+    message = (
+        "'{side}' records are not in record_id order: {pk!r} at [{index}] "
+        "sorts before {prev_pk!r}"
+    )
+
+
 class EmptyDefinitionMissing(PropertyDefinitionError):
     message = (
         "'{classname}()' threw {exc_type_name}; define an empty value or "
@@ -255,6 +268,13 @@ class FieldSelectorKeyError(FieldSelectorException, KeyError):
     message = "Could not find Record specified by index: {key}"
 
 
+class FromJsonErrorsMode(UsageException):
+    message = (
+        "from_json errors= must be 'raise', or 'collect' without "
+        "trusted=True; not {errors!r}"
+    )
+
+
 class IdentityCrisis(FeatureNotImplementedException):
     message = (
         "Can't obtain anything hashable from {val_type_name} instance "
@@ -412,6 +432,13 @@ class JsonCollectionCoerceError(CoercionError):
     )
 
 
+class JsonDiscriminatorUnknown(CoercionError):
+    message = (
+        "{value!r} is not a known {key!r} value for a "
+        "{recordtype.__name__}"
+    )
+
+
 class JsonRecordCoerceError(CoercionError):
     message = (
         "Cannot interpret {passed!r} as a {recordtype.__name__} "
@@ -442,6 +469,13 @@ class SubtypeNoCoerceFunc(CoercionError):
     )
 
 
+class UnknownJsonKeysPolicyError(RecordDefinitionError):
+    message = (
+        "{recordtype.__name__}.unknown_json_keys_policy must be one of "
+        "'copy', 'share', 'drop' or 'lazy'; not {policy!r}"
+    )
+
+
 class ValueCheckError(AttributeValueError):
     message = "value {passed!r} failed value check for {prop.fullname}"
 
@@ -19,22 +19,84 @@ import normalize.exc as exc
 import normalize.record
 
 
-def record_id(object_, type_=None, selector=None, normalize_object_slot=None):
+from normalize.property import _generation
+
+
+def record_id(object_, type_=None, selector=None, normalize_object_slot=None,
+              cache_key=None):
     """Implementation of id() which is overridable and knows about record's
     primary_key property.  Returns if the two objects may be the "same";
     returns None for other types, meaning all bets about identity are off.
 
     Curiously, this function resembles conversion between a "record" and a
     "tuple": stripping the logical names from the atomic values.
+
+    The result is cached in the record, until the next checked assignment
+    (see :py:class:`normalize.property.SafeProperty`) or collection
+    mutation of any record, as the id may include those of the records it
+    contains; the cache is not invalidated per instance.  Nothing is cached
+    if a ``selector`` is passed, or the record (or any record it contains)
+    has properties which allow unchecked assignment.  If a
+    ``normalize_object_slot`` function is passed, then the result is only
+    cached if a hashable ``cache_key`` is also passed, which must identify
+    what that function does.
     """
+    if normalize_object_slot is not None and cache_key is None:
+        cache_key = False
+    return _record_id(
+        object_, type_, selector, normalize_object_slot, cache_key,
+    )[0]
+
+
+def _checked_props(type_):
+    """Returns whether all of the properties of ``type_`` which make up its
+    identity see assignments to them.  Cached in the type."""
+    checked = type_.__dict__.get("_record_id_checked")
+    if checked is None:
+        checked = type_._record_id_checked = all(
+            hasattr(type(prop), "__set__") for prop in (
+                type_.primary_key or type_._sorted_properties
+            )
+        )
+    return checked
+
+
+def _record_id(object_, type_, selector, normalize_object_slot, cache_key):
+    """Returns ``(record_id, cacheable)``; see :py:func:`record_id`.  If
+    ``cache_key`` is ``False``, nothing is cached."""
     if type_ is None or isinstance(type_, tuple):
         type_ = type(object_)
 
+    instance_dict = None
+    if cache_key is not False and selector is None and \
+            isinstance(object_, normalize.record.Record):
+        instance_dict = getattr(object_, "__dict__", None)
+    if instance_dict is not None:
+        key = (type_, cache_key)
+        cached = instance_dict.get("_record_ids", {}).get(key)
+        if cached is not None and cached[0] == _generation[0]:
+            return cached[1], True
+        generation = _generation[0]
+        pk, cacheable = _compute_record_id(
+            object_, type_, selector, normalize_object_slot, cache_key,
+        )
+        if cacheable:
+            instance_dict.setdefault("_record_ids", {})[key] = (
+                generation, pk,
+            )
+        return pk, cacheable
+    return _compute_record_id(
+        object_, type_, selector, normalize_object_slot, cache_key,
+    )
+
+
+def _compute_record_id(object_, type_, selector, normalize_object_slot,
+                       cache_key):
     key_vals = list()
     if hasattr(type_, "primary_key"):
         pk_cols = type_.primary_key
     elif object_.__hash__:
-        return object_
+        return object_, True
     else:
         raise exc.IdentityCrisis(
             val=object_,
@@ -55,15 +117,25 @@ def record_id(object_, type_=None, selector=None, normalize_object_slot=None):
             object_.itertuples() if hasattr(object_, "itertuples") else
             type_.coll_to_tuples(object_)
         )
-        return tuple(
-            record_id(
+        ids = tuple(
+            _record_id(
                 v, type_.itemtype, selector[k], normalize_object_slot,
+                cache_key,
             ) for k, v in gen if selector[(k,)]
         ) if selector else tuple(
-            record_id(v, type_.itemtype, None, normalize_object_slot) for
-            k, v in gen
+            _record_id(
+                v, type_.itemtype, None, normalize_object_slot, cache_key,
+            ) for k, v in gen
+        )
+        return (
+            tuple(pk for pk, cacheable in ids),
+            isinstance(object_, normalize.coll.Collection) and
+            all(cacheable for pk, cacheable in ids),
         )
 
+    cacheable = selector is None and isinstance(
+        object_, normalize.record.Record,
+    ) and _checked_props(type_)
     if not pk_cols:
         all_properties = type_._sorted_properties
         if selector:
@@ -88,9 +160,12 @@ def record_id(object_, type_=None, selector=None, normalize_object_slot=None):
             set_elements = 0
             for value_type in value_type_list:
                 if issubclass(value_type, normalize.record.Record):
-                    pk = record_id(val, value_type,
-                                   selector[prop.name] if selector else None,
-                                   normalize_object_slot)
+                    pk, pk_cacheable = _record_id(
+                        val, value_type,
+                        selector[prop.name] if selector else None,
+                        normalize_object_slot, cache_key,
+                    )
+                    cacheable = cacheable and pk_cacheable
                     pk_elements = len([x for x in pk if x is not None])
                     if not val_pk or pk_elements > set_elements:
                         val_pk = pk
@@ -108,4 +183,4 @@ def record_id(object_, type_=None, selector=None, normalize_object_slot=None):
         else:
             key_vals.append(val)
 
-    return tuple(key_vals)
+    return tuple(key_vals), cacheable
@@ -34,6 +34,7 @@ import normalize.empty as empty
 import normalize.exc as exc
 from normalize.property.meta import looks_like_v1_none
 from normalize.property.meta import MetaProperty
+from normalize.subtype import subtype
 
 
 class _Default(object):
@@ -43,6 +44,15 @@ class _Default(object):
 
 _none = _Default()
 
+#: bumped after every checked assignment or deletion of a property, and by the
+#: mutators of :py:class:`normalize.coll.Collection` types.  Values derived
+#: from the contents of records which are cached (such as the digests used by
+#: :py:mod:`normalize.diff`) are only valid for the generation they were
+#: computed in.  There is one counter for the whole process, rather than one
+#: per instance, as such values also depend on the records a record contains;
+#: so any mutation invalidates every cached value.
+_generation = [0]
+
 
 class Property(object):
     """This is the base class for all property types.  It is a data descriptor,
@@ -117,6 +127,7 @@ class Property(object):
         """
         self.name = None
         self.class_ = None
+        self.slot = None
         self.__doc__ = doc
         super(Property, self).__init__()
         self.default = default
@@ -156,6 +167,7 @@ class Property(object):
             raise exc.CoerceWithoutType()
         self.empty_attr = empty_attr
         self.extraneous = extraneous
+        self.compile_validator()
 
     def func_info(self, func):
         args = inspect.getargspec(func)
@@ -184,6 +196,34 @@ class Property(object):
 
     def bind(self, class_):
         self.class_ = weakref.ref(class_)
+        self.compile_validator()
+
+    def _fetch_slot(self, obj, default=None):
+        """Returns the value stored for this property in ``obj``, or
+        ``default`` if there is none.  The value is normally kept in the
+        instance dictionary, but for ``compact`` record types ``slot`` is set
+        to the member descriptor which holds it instead (see
+        :py:class:`normalize.record.meta.RecordMeta`)"""
+        if self.slot is None:
+            return obj.__dict__.get(self.name, default)
+        try:
+            return self.slot.__get__(obj)
+        except AttributeError:
+            return default
+
+    def _store_slot(self, obj, value):
+        """Stores a value for this property in ``obj``, without checks"""
+        if self.slot is None:
+            obj.__dict__[self.name] = value
+        else:
+            self.slot.__set__(obj, value)
+
+    def _clear_slot(self, obj):
+        """Removes the value for this property from ``obj``"""
+        if self.slot is None:
+            del obj.__dict__[self.name]
+        else:
+            self.slot.__delete__(obj)
 
     @property
     def fullname(self):
@@ -200,51 +240,125 @@ class Property(object):
             classname = self.class_().__name__
         return "%s.%s" % (classname, self.name)
 
-    def type_safe_value(self, value, _none_ok=False):
-        if value is None and self.required and not self.valuetype:
-            raise exc.PropertyRequired(prop=self)
-        if self.valuetype and not isinstance(value, self.valuetype):
-            try:
-                new_value = self.coerce(value)
-            except exc.SubtypeCoerceError as e:
-                # this particular coerce error will be re-caught below,
-                # unless the coerce method returned None
-                new_value = e.coerced
-            except Exception as e:
-                raise exc.CoerceError(
-                    prop=self,
-                    passed=value,
-                    exc=e,
-                    func=(
-                        "%s constructor" % self.coerce.__name__ if
-                        isinstance(self.coerce, type) else self.coerce
-                    ),
-                    valuetype=(
-                        "(" + ", ".join(
-                            x.__name__ for x in self.valuetype
-                        ) + ")" if isinstance(self.valuetype, tuple) else
-                        self.valuetype.__name__
-                    ),
-                )
-            if not isinstance(new_value, self.valuetype):
-                if _none_ok and new_value is None and not self.required:
-                    # allow coerce functions to return 'None' to silently
-                    # swallow optional properties on initialization
-                    return _none
-                else:
-                    raise exc.ValueCoercionError(
-                        prop=self,
-                        passed=value,
-                        coerced=new_value,
-                    )
+    def compile_validator(self):
+        """Selects the function which checks and coerces values assigned to
+        this property, based on its ``isa``, ``coerce``, ``check`` and
+        ``required`` options.  This is called when the property is declared
+        and again when it is bound to a class; if these options are changed
+        after that, call it again.
+
+        The selected function is stored as ``validator``, which is what
+        the setters call.  If a sub-class overrides ``type_safe_value``,
+        ``validator`` is that method instead.
+        """
+        self._validate = self._make_validator()
+        if type(self).type_safe_value.im_func is \
+                Property.type_safe_value.im_func:
+            self.validator = self._validate
+        else:
+            self.validator = self.type_safe_value
+
+    def _make_validator(self):
+        valuetype = self.valuetype
+        check = self.check
+        coerce_value = self._coerce_value
+
+        if not valuetype:
+            required = self.required
+            if not (required or check):
+                def validate(value, _none_ok=False):
+                    return value
             else:
-                value = new_value
-        if self.check and not self.check(value):
-            raise exc.ValueCheckError(
+                def validate(value, _none_ok=False):
+                    if value is None and required:
+                        raise exc.PropertyRequired(prop=self)
+                    if check and not check(value):
+                        raise exc.ValueCheckError(prop=self, passed=value)
+                    return value
+
+        elif isinstance(valuetype, subtype) and \
+                type(valuetype).__instancecheck__.im_func is \
+                subtype.__instancecheck__.im_func:
+            # skip the python-level isinstance() hook, and test directly
+            of = valuetype.of
+            where_funcs = valuetype.where_funcs
+
+            def validate(value, _none_ok=False):
+                ok = isinstance(value, of)
+                if ok:
+                    try:
+                        for where in where_funcs:
+                            if not where(value):
+                                ok = False
+                                break
+                    except Exception:
+                        ok = False
+                if not ok:
+                    value = coerce_value(value, _none_ok)
+                    if value is _none:
+                        return value
+                if check and not check(value):
+                    raise exc.ValueCheckError(prop=self, passed=value)
+                return value
+
+        elif check:
+            def validate(value, _none_ok=False):
+                if not isinstance(value, valuetype):
+                    value = coerce_value(value, _none_ok)
+                    if value is _none:
+                        return value
+                if not check(value):
+                    raise exc.ValueCheckError(prop=self, passed=value)
+                return value
+
+        else:
+            def validate(value, _none_ok=False):
+                if isinstance(value, valuetype):
+                    return value
+                return coerce_value(value, _none_ok)
+
+        return validate
+
+    def _coerce_value(self, value, _none_ok):
+        """Called by the ``validator`` for values which are not of the
+        right type already"""
+        try:
+            new_value = self.coerce(value)
+        except exc.SubtypeCoerceError as e:
+            # this particular coerce error will be re-caught below,
+            # unless the coerce method returned None
+            new_value = e.coerced
+        except Exception as e:
+            raise exc.CoerceError(
                 prop=self,
                 passed=value,
+                exc=e,
+                func=(
+                    "%s constructor" % self.coerce.__name__ if
+                    isinstance(self.coerce, type) else self.coerce
+                ),
+                valuetype=(
+                    "(" + ", ".join(
+                        x.__name__ for x in self.valuetype
+                    ) + ")" if isinstance(self.valuetype, tuple) else
+                    self.valuetype.__name__
+                ),
             )
-        return value
+        if not isinstance(new_value, self.valuetype):
+            if _none_ok and new_value is None and not self.required:
+                # allow coerce functions to return 'None' to silently
+                # swallow optional properties on initialization
+                return _none
+            else:
+                raise exc.ValueCoercionError(
+                    prop=self,
+                    passed=value,
+                    coerced=new_value,
+                )
+        return new_value
+
+    def type_safe_value(self, value, _none_ok=False):
+        return self._validate(value, _none_ok)
 
     def get_default(self, obj):
         if callable(self.default):
@@ -263,14 +377,16 @@ class Property(object):
 
         new_value = (
             _none if value is _none else
-            self.type_safe_value(value, _none_ok=True)
+            self.validator(value, True)
         )
 
         if new_value is _none:
             if self.required:
                 raise exc.PropertyRequired(prop=self)
-        else:
+        elif self.slot is None:
             obj.__dict__[self.name] = new_value
+        else:
+            self.slot.__set__(obj, new_value)
 
     def eager_init(self):
         return self.required or self.default is not _none
@@ -283,12 +399,19 @@ class Property(object):
         """
         if obj is None:
             return self
+        if self.slot is not None:
+            try:
+                return self.slot.__get__(obj)
+            except AttributeError:
+                return self.attribute_error_hook()
         if self.name not in obj.__dict__:
             return self.attribute_error_hook()
         return obj.__dict__[self.name]
 
     def slot_is_empty(self, obj):
-        return self.name not in obj.__dict__
+        if self.slot is None:
+            return self.name not in obj.__dict__
+        return self._fetch_slot(obj, _none) is _none
 
     def __str__(self):
         metaclass = str(type(self).__name__)
@@ -317,7 +440,7 @@ class EmptyAuxProp(object):
 
     def __get__(self, obj, type_=None):
         try:
-            return self.prop.__get__(obj)
+            return getattr(obj, self.prop.name)
         except AttributeError:
             return empty.placeholder(self.valuetype)
 
@@ -363,9 +486,9 @@ class LazyProperty(Property):
         if obj is None:
             return self
 
-        if self.name not in obj.__dict__:
+        if self._fetch_slot(obj, _none) is _none:
             value = self.get_default(obj)
-            obj.__dict__[self.name] = self.type_safe_value(value)
+            self._store_slot(obj, self.validator(value))
 
         return super(LazyProperty, self).__get__(obj, type_)
 
@@ -393,8 +516,9 @@ class ROLazyProperty(LazyProperty, ROProperty):
         and if so, returns it."""
         if obj is None:
             return self
-        if self.name in obj.__dict__:
-            return obj.__dict__[self.name]
+        value = self._fetch_slot(obj, _none)
+        if value is not _none:
+            return value
         return super(ROLazyProperty, self).__get__(obj, type_)
 
 
@@ -411,14 +535,19 @@ class SafeProperty(Property):
     def __set__(self, obj, value):
         """This setter checks the type of the value before allowing it to be
         set."""
-        obj.__dict__[self.name] = self.type_safe_value(value)
+        if self.slot is None:
+            obj.__dict__[self.name] = self.validator(value)
+        else:
+            self.slot.__set__(obj, self.validator(value))
+        _generation[0] += 1
 
     def __delete__(self, obj):
         """Checks the property's ``required`` setting, and allows the delete if
         it is false"""
         if self.required:
             raise exc.PropertyRequired(prop=self)
-        del obj.__dict__[self.name]
+        self._clear_slot(obj)
+        _generation[0] += 1
 
 
 class LazySafeProperty(SafeProperty, LazyProperty):
@@ -427,11 +556,30 @@ class LazySafeProperty(SafeProperty, LazyProperty):
         and if so, returns it."""
         if obj is None:
             return self
-        if self.name in obj.__dict__:
-            return obj.__dict__[self.name]
+        value = self._fetch_slot(obj, _none)
+        if value is not _none:
+            return value
         return super(LazySafeProperty, self).__get__(obj, type_)
 
 
+class CompactProperty(Property):
+    """A Property which permits unchecked assignment and deletion, like a
+    regular attribute.  ``RecordMeta`` converts properties without a setter
+    to this trait when they are stored in ``__slots__`` (see
+    :py:class:`normalize.record.meta.RecordMeta`), as there is then no
+    instance dictionary for assignments to fall through to.
+    """
+    __trait__ = "compact"
+
+    def __set__(self, obj, value):
+        self._store_slot(obj, value)
+        _generation[0] += 1
+
+    def __delete__(self, obj):
+        self._clear_slot(obj)
+        _generation[0] += 1
+
+
 class V1Property(SafeProperty):
     __trait__ = "v1"
 
@@ -455,7 +603,7 @@ class V1Property(SafeProperty):
     def slot_is_empty(self, obj):
         if self.v1_upgraded:
             return False
-        return super(V1Property, obj).slot_is_empty(obj)
+        return super(V1Property, self).slot_is_empty(obj)
 
     def attribute_error_hook(self):
         return self.v1_none
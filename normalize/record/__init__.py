@@ -25,10 +25,21 @@ class _Unset(object):
     pass
 
 
+#: names of values derived from the properties, which are cached in the
+#: instance dict by :py:func:`normalize.identity.record_id`,
+#: :py:mod:`normalize.diff` and lazy ``AutoJsonRecord`` types
+_instance_caches = ("_diff_digest", "_record_ids", "_auto_upgrades")
+
+
 class Record(object):
     """Base class for normalize instances and collections.
     """
     __metaclass__ = RecordMeta
+    __slots__ = ()
+
+    #: set to ``True`` (eg, on ``Record`` itself, in a staging environment)
+    #: to make :py:meth:`from_trusted` validate its input after all
+    validate_trusted = False
 
     def __init__(self, init_dict=None, **kwargs):
         """Instantiates a new ``Record`` type.
@@ -50,22 +61,59 @@ class Record(object):
             return
         if init_dict and kwargs:
             raise exc.AmbiguousConstruction()
-        if not init_dict:
-            init_dict = kwargs
-        for prop, val in init_dict.iteritems():
-            meta_prop = type(self).properties.get(prop, None)
-            if meta_prop is None:
-                raise exc.PropertyNotKnown(
-                    propname=prop,
-                    recordtype=type(self),
-                    typename=type(self).__name__,
-                )
-            meta_prop.init_prop(self, val)
-        missing = type(self).eager_properties - set(init_dict.keys())
-
-        for propname in missing:
-            meta_prop = type(self).properties[propname]
-            meta_prop.init_prop(self)
+        # the per-type initializer is compiled by RecordMeta
+        self._init_props(self, init_dict or kwargs)
+
+    @classmethod
+    def from_trusted(cls, **kwargs):
+        """Alternate constructor, for values which are already known to be
+        valid; for instance, because they were saved from the properties of
+        another instance.  Values are stored directly without any ``isa``
+        check, ``coerce`` or ``check`` function being called.  Unknown
+        properties are still refused, and missing properties are still
+        defaulted (or raise ``PropertyRequired``), as for ``__init__``.
+
+        If the class attribute ``validate_trusted`` is true, then this just
+        calls the regular constructor.
+        """
+        if cls.validate_trusted:
+            return cls(**kwargs)
+        self = cls.__new__(cls)
+        self._init_trusted(self, kwargs)
+        return self
+
+    @classmethod
+    def from_many(cls, iterable):
+        """Alternate constructor, which builds a list of records from an
+        iterable of ``dict`` objects (or anything else the constructor
+        accepts as its only argument).  Members which are already of this
+        type are passed through.  This is much faster than calling the
+        constructor in a loop, unless the type has its own ``__init__``.
+
+        If any member cannot be converted, a
+        :py:class:`normalize.exc.BatchConversionError` is raised, with the
+        position of the failing member in its ``error_fs``.
+        """
+        records = []
+        append = records.append
+        new = cls.__new__
+        init_props = (
+            cls._init_props if cls.__init__.im_func is Record.__init__.im_func
+            else None
+        )
+        for i, item in enumerate(iterable):
+            try:
+                if isinstance(item, cls):
+                    append(item)
+                elif init_props is None:
+                    append(cls(item))
+                else:
+                    self = new(cls)
+                    init_props(self, item or {})
+                    append(self)
+            except Exception as e:
+                raise _box_batch_error(i, e)
+        return records
 
     def __getnewargs__(self):
         """Stub method which arranges for an ``OhPickle`` instance to be passed
@@ -75,13 +123,34 @@ class Record(object):
 
     def __getstate__(self):
         """Implement saving, for the pickle out API.  Returns the instance
-        dict"""
-        return self.__dict__
+        dict, or for ``compact`` types a dict of the values in the slots.
+        Values which are cached in the instance dict are left out."""
+        if not type(self)._slot_properties and not any(
+            name in self.__dict__ for name in _instance_caches
+        ):
+            return self.__dict__
+        state = dict(getattr(self, "__dict__", ()))
+        for name in _instance_caches:
+            state.pop(name, None)
+        for prop in type(self)._slot_properties:
+            value = prop._fetch_slot(self, _Unset)
+            if value is not _Unset:
+                state[prop.name] = value
+        return state
 
     def __setstate__(self, instance_dict):
         """Implement loading, for the pickle in API.  Sets the instance dict
-        directly."""
-        self.__dict__.update(instance_dict)
+        (and any slots) directly."""
+        if not type(self)._slot_properties:
+            self.__dict__.update(instance_dict)
+            return
+        properties = type(self).properties
+        for key, value in instance_dict.iteritems():
+            prop = properties.get(key, None)
+            if prop is not None and prop.slot is not None:
+                prop.slot.__set__(self, value)
+            else:
+                self.__dict__[key] = value
 
     def __str__(self):
         """Marshalling to string form.  This is what you see if you cast the
@@ -109,12 +178,13 @@ class Record(object):
         implement ``__repr__`` as suggested in the python documentation.
         """
         typename = type(self).__name__
+        state = self.__getstate__()
         values = list()
         for propname in sorted(type(self).properties):
-            if propname not in self.__dict__:
+            if propname not in state:
                 continue
             else:
-                values.append("%s=%r" % (propname, self.__dict__[propname]))
+                values.append("%s=%r" % (propname, state[propname]))
         return "%s(%s)" % (typename, ", ".join(values))
 
     def __eq__(self, other):
@@ -176,6 +246,21 @@ class Record(object):
         return diff(self, other, **kwargs)
 
 
+def _box_batch_error(index, exception):
+    """Wraps an exception raised converting a member of a batch with a
+    ``FieldSelector`` which says which member it was"""
+    from normalize.selector import FieldSelector
+    error_fs = FieldSelector([index])
+    if hasattr(exception, "error_fs"):
+        error_fs.extend(exception.error_fs)
+    if hasattr(exception, "sub_exception"):
+        exception = exception.sub_exception
+    return exc.BatchConversionError(
+        error_fs=error_fs,
+        sub_exception=exception,
+    )
+
+
 class OhPickle(object):
     """Sentinel type for Un-Pickling.  ``pickle`` does not allow a
     ``__getinitargs__``/``__getnewargs__`` to return keyword constructor
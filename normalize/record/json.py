@@ -19,9 +19,14 @@ from __future__ import absolute_import
 
 import collections
 from copy import deepcopy
+import functools
 import inspect
+import itertools
 import json
+from json.scanner import py_make_scanner
+import multiprocessing
 import re
+import time
 import types
 
 from normalize.coll import Collection
@@ -31,22 +36,23 @@ from normalize.coll import list_of
 from normalize.diff import Diff
 from normalize.diff import DiffInfo
 import normalize.exc as exc
+from normalize.property import _none
+from normalize.property import Property
 from normalize.property.json import JsonProperty
 from normalize.record import OhPickle
 from normalize.record import Record
 from normalize.selector import FieldSelector
+from normalize.utils import _LruCache
 
 
-def _json_to_value_initializer(json_val, proptype):
-    if proptype:
-        if isinstance(proptype, JsonRecord):
-            return json_val
-        elif hasattr(proptype, "from_json"):
-            return proptype.from_json(json_val)
-        elif isinstance(proptype, Record) and isinstance(json_val, dict):
-            return from_json(proptype, json_val)
-
-    return json_val
+def _json_in_is_stock(proptype):
+    """Returns true if values of the passed type are marshalled in by
+    :py:func:`from_json` without any customization, so that it is safe to
+    pass the ``trusted`` option through"""
+    return isinstance(proptype, type) and issubclass(proptype, Record) and (
+        getattr(getattr(proptype, "from_json", None), "im_func", None) in
+        (None, JsonRecord.from_json.im_func)
+    )
 
 
 def _box_ingress_error(context, exception):
@@ -61,14 +67,404 @@ def _box_ingress_error(context, exception):
     )
 
 
-def json_to_initkwargs(record_type, json_struct, kwargs=None):
+def _json_record_is_stock(record_type):
+    """Returns true if the passed ``JsonRecord`` type is constructed from JSON
+    exactly as ``JsonRecord`` does it"""
+    return _json_in_is_stock(record_type) and (
+        record_type.json_to_initkwargs.im_func is
+        JsonRecord.json_to_initkwargs.im_func
+    ) and all(
+        klass in (JsonRecord, Record, object) or
+        "__init__" not in klass.__dict__
+        for klass in record_type.__mro__
+    )
+
+
+def _json_decoder(proptype):
+    """Returns the function used to marshal in JSON values for a property of
+    the passed type.  For ``JsonRecord`` types which do not customize how they
+    are marshalled in, this is a function which skips the constructor
+    and goes straight to the type's decoding plan; see
+    :py:func:`_json_decode_plan`.  For polymorphic types, it picks the
+    sub-class to decode to first; see :py:func:`_json_subtype`.  The
+    function is cached in the class."""
+    if not (isinstance(proptype, type) and issubclass(proptype, JsonRecord)):
+        return proptype.from_json
+    decoder = proptype.__dict__.get("_json_decoder")
+    if decoder is None:
+        if _json_polymorphic(proptype):
+            decoder = _make_json_dispatcher(proptype)
+        else:
+            decoder = _json_concrete_decoder(proptype)
+        proptype._json_decoder = decoder
+    return decoder
+
+
+def _member_decoder(record_type):
+    """Returns the function used to marshal in a member of a collection, or
+    a whole value, of the passed type: :py:func:`_json_decoder` if the type
+    has a ``from_json`` method, otherwise :py:func:`from_json`."""
+    if hasattr(record_type, "from_json"):
+        return _json_decoder(record_type)
+    return functools.partial(from_json, record_type)
+
+
+def _json_concrete_decoder(record_type):
+    """Returns the function which decodes JSON to exactly the passed
+    ``JsonRecord`` type, even if it is polymorphic"""
+    decoder = record_type.__dict__.get("_json_concrete_decoder")
+    if decoder is None:
+        if _json_record_is_stock(record_type):
+            decoder = _make_json_decoder(record_type)
+        elif _json_in_is_stock(record_type):
+            decoder = record_type
+        else:
+            decoder = record_type.from_json
+        record_type._json_concrete_decoder = decoder
+    return decoder
+
+
+def _json_polymorphic(record_type):
+    """Returns true if JSON for the passed type may be decoded to one of its
+    sub-classes; see :py:class:`JsonRecord`"""
+    return (
+        record_type.json_discriminator is not None or
+        record_type.json_duck_typing
+    ) and _json_in_is_stock(record_type) and (
+        not issubclass(record_type, Collection)
+    )
+
+
+def _make_json_dispatcher(record_type):
+    def decode(json_data):
+        if isinstance(json_data, basestring):
+            json_data = json.loads(json_data)
+        subtype = _json_subtype(record_type, json_data)
+        return _json_concrete_decoder(subtype)(json_data)
+
+    return decode
+
+
+# number of key signatures remembered per polymorphic type
+_json_signatures_max = 4096
+
+
+def _json_subtype(record_type, json_data):
+    """Returns the sub-class of the polymorphic ``record_type`` (or the type
+    itself) which the passed JSON dictionary should be decoded to.  With a
+    ``json_discriminator``, this is one dictionary lookup; with
+    ``json_duck_typing``, the JSON keys which any of the types know are a
+    'signature', and the type picked for each signature is remembered.  See
+    :py:func:`_json_subtype_index`."""
+    if not isinstance(json_data, dict):
+        return record_type
+    index = record_type.__dict__.get("_json_subtypes")
+    if index is None:
+        index = record_type._json_subtypes = _json_subtype_index(record_type)
+    key, by_value, relevant, candidates, signatures = index
+    if key is not None and key in json_data:
+        value = json_data[key]
+        try:
+            return by_value[value]
+        except (KeyError, TypeError):
+            raise exc.JsonDiscriminatorUnknown(
+                key=key,
+                value=value,
+                recordtype=record_type,
+            )
+    if not candidates:
+        return record_type
+    signature = relevant.intersection(json_data)
+    subtype = signatures.get(signature)
+    if subtype is None:
+        subtype = _json_best_subtype(candidates, signature)
+        if len(signatures) < _json_signatures_max:
+            signatures[signature] = subtype
+    return subtype
+
+
+def _json_subtype_index(record_type):
+    """Builds the index used by :py:func:`_json_subtype` from the sub-classes
+    of ``record_type``: ``(key, by_value, relevant, candidates,
+    signatures)``.  ``key`` is the ``json_discriminator`` and ``by_value``
+    maps its values to types.  For duck typing, ``candidates`` is a tuple of
+    ``(type, json_names, required_json_names)``, with the type itself first,
+    and ``relevant`` is all of the ``json_names``.  It is stored in the
+    class, and removed from it when a new sub-class is declared (see
+    :py:class:`normalize.record.meta.RecordMeta`)."""
+    subtypes = []
+
+    def walk(subtype):
+        if subtype not in subtypes:
+            subtypes.append(subtype)
+            for sub in subtype.__subclasses__():
+                walk(sub)
+
+    walk(record_type)
+    key = record_type.json_discriminator
+    by_value = dict()
+    if key is not None:
+        for subtype in subtypes:
+            by_value.setdefault(
+                subtype.__dict__.get(
+                    "json_discriminator_value", subtype.__name__,
+                ),
+                subtype,
+            )
+    candidates = []
+    relevant = frozenset()
+    if record_type.json_duck_typing:
+        for subtype in subtypes:
+            known_keys, steps = _json_decode_plan(subtype)[:2]
+            required = frozenset(
+                step[0] for step in steps if step[5].required
+            )
+            candidates.append((subtype, known_keys, required))
+            relevant |= known_keys
+    return (key, by_value, relevant, tuple(candidates), dict())
+
+
+def _json_best_subtype(candidates, signature):
+    """Picks the type which knows the most keys in the signature, and has all
+    of its required keys; on a tie, the one which knows fewer keys, and
+    then the first."""
+    best = candidates[0][0]
+    best_score = None
+    for subtype, known_keys, required in candidates:
+        if required <= signature:
+            score = (len(signature & known_keys), -len(known_keys))
+            if best_score is None or score > best_score:
+                best = subtype
+                best_score = score
+    return best
+
+
+def _make_json_decoder(record_type):
+    new = record_type.__new__
+    init_props = record_type._init_props
+
+    def decode(json_data):
+        # this is what JsonRecord.__init__ does
+        if isinstance(json_data, basestring):
+            json_data = json.loads(json_data)
+        self = new(record_type)
+        init_props(self, {} if json_data is None else json_to_initkwargs(
+            record_type, json_data,
+        ))
+        return self
+
+    return decode
+
+
+def _json_decode_plan(record_type):
+    """Returns the plan used by :py:func:`json_to_initkwargs` to map the keys
+    of a JSON dictionary to the properties of ``record_type``.  This is a
+    tuple of the known JSON keys, a tuple of steps, one per property
+    which is marshalled in, of ``(json_name, propname, json_in, decode,
+    trusted_decode, prop, first)``, the type's ``unknown_json_keys_policy``,
+    and the names of the properties whose decoding is deferred (see
+    :py:class:`LazyJsonRecord`); ``json_in`` is the property's
+    conversion function, ``decode`` and ``trusted_decode`` are the
+    type's marshal in function (see :py:func:`_json_decoder`), and
+    ``first`` is true unless an earlier property has the same
+    ``json_name``.
+
+    The plan is built the first time a type is marshalled in, and stored in
+    the class.
+    """
+    plan = record_type.__dict__.get("_json_decode_plan")
+    if plan is not None:
+        return plan
+    steps = []
+    known_keys = set()
+    lazy = set()
+    for propname, prop in record_type.properties.iteritems():
+        # think "does" here rather than "is"; the slot does JSON
+        if isinstance(prop, JsonProperty):
+            json_name = prop.json_name
+            if json_name is None:
+                continue
+            json_in = (
+                prop.json_in if type(prop).from_json.im_func is
+                JsonProperty.from_json.im_func else prop.from_json
+            )
+        else:
+            json_name = prop.name
+            json_in = None
+        proptype = prop.valuetype
+        decode = trusted_decode = None
+        if proptype:
+            if hasattr(proptype, "from_json"):
+                decode = trusted_decode = _json_decoder(proptype)
+            if _json_in_is_stock(proptype):
+                trusted_decode = functools.partial(
+                    from_json, proptype, trusted=True,
+                )
+        steps.append((json_name, propname, json_in, decode, trusted_decode,
+                      prop, json_name not in known_keys))
+        known_keys.add(json_name)
+        if decode and _json_defers(record_type, prop, json_in):
+            lazy.add(propname)
+    policy = getattr(record_type, "unknown_json_keys_policy", "copy")
+    if policy not in _unknown_json_keys_policies:
+        raise exc.UnknownJsonKeysPolicyError(
+            recordtype=record_type,
+            policy=policy,
+        )
+    plan = (frozenset(known_keys), tuple(steps), policy, frozenset(lazy))
+    record_type._json_decode_plan = plan
+    return plan
+
+
+def _json_defers(record_type, prop, json_in):
+    """Returns true if ``record_type`` is a :py:class:`LazyJsonRecord`, and
+    the passed property can be left empty with its JSON value kept in
+    ``deferred_json`` until it is first read."""
+    return issubclass(record_type, LazyJsonRecord) and json_in is None and (
+        not prop.required and prop.default is _none and prop.slot is None
+    ) and (
+        type(prop).__get__.im_func is Property.__get__.im_func
+    ) and (
+        type(prop).attribute_error_hook.im_func is
+        Property.attribute_error_hook.im_func
+    ) and (
+        not isinstance(prop, JsonProperty) or prop.json_out is None and
+        type(prop).to_json.im_func is JsonProperty.to_json.im_func
+    )
+
+
+_unknown_json_keys_policies = frozenset(("copy", "share", "drop", "lazy"))
+
+
+class _LazyCopyDict(dict):
+    """The ``unknown_json_keys`` dictionary used by the "lazy" policy.  It
+    starts out holding the JSON values it was passed, and takes a deep copy
+    of a ``dict`` or ``list`` value the first time it is read from the
+    dictionary, as from then on it might be modified.  Marshalling out
+    reads the values without copying them.
+
+    Only reads through the methods of the dictionary take copies; reads
+    which go straight to the underlying ``dict`` in C, such as ``dict(d)``,
+    ``**d`` or ``dict.__getitem__(d, key)``, return the shared values,
+    which must not be modified.  ``d.copy()``, ``copy.copy(d)`` and
+    pickling are safe."""
+    def __init__(self, *args, **kwargs):
+        super(_LazyCopyDict, self).__init__(*args, **kwargs)
+        self._shared = set(
+            k for k, v in dict.iteritems(self) if isinstance(v, (dict, list))
+        )
+
+    def __reduce__(self):
+        # pickle (or copy) as an unshared copy; the items are restored
+        # before any instance __dict__ would be, so ``_shared`` is not
+        # pickled
+        return (type(self), (), None, None, self.iteritems())
+
+    def _snapshot(self, key):
+        if key in self._shared:
+            self._shared.discard(key)
+            dict.__setitem__(self, key, deepcopy(dict.__getitem__(self, key)))
+
+    def _snapshot_all(self):
+        for key in list(self._shared):
+            self._snapshot(key)
+
+    def __getitem__(self, key):
+        self._snapshot(key)
+        return dict.__getitem__(self, key)
+
+    def get(self, key, default=None):
+        self._snapshot(key)
+        return dict.get(self, key, default)
+
+    def setdefault(self, key, default=None):
+        self._snapshot(key)
+        return dict.setdefault(self, key, default)
+
+    def pop(self, key, *default):
+        self._snapshot(key)
+        return dict.pop(self, key, *default)
+
+    def popitem(self):
+        key, value = dict.popitem(self)
+        if key in self._shared:
+            self._shared.discard(key)
+            value = deepcopy(value)
+        return key, value
+
+    def __setitem__(self, key, value):
+        self._shared.discard(key)
+        dict.__setitem__(self, key, value)
+
+    def __delitem__(self, key):
+        self._shared.discard(key)
+        dict.__delitem__(self, key)
+
+    def update(self, *args, **kwargs):
+        other = dict(*args, **kwargs)
+        self._shared.difference_update(other)
+        dict.update(self, other)
+
+    def clear(self):
+        self._shared.clear()
+        dict.clear(self)
+
+    def copy(self):
+        self._snapshot_all()
+        return dict.copy(self)
+
+    def items(self):
+        self._snapshot_all()
+        return dict.items(self)
+
+    def iteritems(self):
+        self._snapshot_all()
+        return dict.iteritems(self)
+
+    def viewitems(self):
+        self._snapshot_all()
+        return dict.viewitems(self)
+
+    def values(self):
+        self._snapshot_all()
+        return dict.values(self)
+
+    def itervalues(self):
+        self._snapshot_all()
+        return dict.itervalues(self)
+
+    def viewvalues(self):
+        self._snapshot_all()
+        return dict.viewvalues(self)
+
+
+def _unknown_json_keys(json_struct, known_keys, policy):
+    """Returns the ``unknown_json_keys`` value for a JSON dictionary, following
+    the passed ``unknown_json_keys_policy`` (other than "drop")"""
+    unknown = (
+        (k, v) for k, v in json_struct.iteritems() if k not in known_keys
+    )
+    if policy == "copy":
+        return dict((k, deepcopy(v)) for k, v in unknown)
+    elif policy == "lazy":
+        return _LazyCopyDict(unknown)
+    else:
+        return dict(unknown)
+
+
+def json_to_initkwargs(record_type, json_struct, kwargs=None, trusted=False):
     """This function converts a JSON dict (json_struct) to a set of init
     keyword arguments for the passed Record (or JsonRecord).
 
     It is called by the JsonRecord constructor.  This function takes a JSON
     data structure and returns a keyword argument list to be passed to the
     class constructor.  Any keys in the input dictionary which are not known
-    are passed as a single ``unknown_json_keys`` value as a dict.
+    are passed as a single ``unknown_json_keys`` value as a dict, according
+    to the type's ``unknown_json_keys_policy`` (see :py:class:`JsonRecord`).
+
+    If ``trusted`` is passed, the keyword arguments returned are intended for
+    :py:meth:`normalize.record.Record.from_trusted`: values have been coerced
+    to the property type if required, but not checked.
 
     This function should generally not be called directly, except as a part of
     a ``__init__`` or specialized visitor application.
@@ -82,43 +478,48 @@ def json_to_initkwargs(record_type, json_struct, kwargs=None):
             passed=json_struct,
             recordtype=record_type,
         )
-    unknown_keys = set(json_struct.keys())
-    for propname, prop in record_type.properties.iteritems():
-        # think "does" here rather than "is"; the slot does JSON
-        if isinstance(prop, JsonProperty):
-            json_name = prop.json_name
-            if json_name is not None:
-                if json_name in json_struct:
-                    if propname not in kwargs:
-                        try:
-                            kwargs[propname] = _json_to_value_initializer(
-                                prop.from_json(
-                                    json_struct[json_name]
-                                ),
-                                prop.valuetype,
-                            )
-                        except Exception as e:
-                            raise _box_ingress_error(json_name, e)
-                    unknown_keys.remove(json_name)
-        elif prop.name in json_struct:
-            json_val = json_struct[prop.name]
-            unknown_keys.remove(prop.name)
-            if prop.name not in kwargs:
-                proptype = prop.valuetype
+    known_keys, steps, policy, lazy = _json_decode_plan(record_type)
+    deferred = None
+    found = 0
+    for (json_name, propname, json_in, decode, trusted_decode,
+         prop, first) in steps:
+        if json_name in json_struct:
+            if propname not in kwargs:
                 try:
-                    kwargs[propname] = _json_to_value_initializer(
-                        json_val, proptype,
-                    )
+                    value = json_struct[json_name]
+                    if json_in:
+                        value = json_in(value)
+                    if trusted:
+                        if trusted_decode:
+                            value = trusted_decode(value)
+                        # values which are already of the right type are
+                        # passed through unchecked; others (eg, dates, which
+                        # have no JSON form) still need ``coerce``.
+                        if prop.valuetype and not isinstance(
+                            value, prop.valuetype,
+                        ):
+                            value = prop.type_safe_value(value, True)
+                    elif lazy and propname in lazy:
+                        if deferred is None:
+                            deferred = kwargs["deferred_json"] = {}
+                        deferred[propname] = value
+                        value = _none
+                    elif decode:
+                        value = decode(value)
+                    if value is not _none:
+                        kwargs[propname] = value
                 except Exception as e:
-                    raise _box_ingress_error(prop.name, e)
-    if unknown_keys:
-        kwargs["unknown_json_keys"] = dict(
-            (k, deepcopy(json_struct[k])) for k in unknown_keys
+                    raise _box_ingress_error(json_name, e)
+            if first:
+                found += 1
+    if found != len(json_struct) and policy != "drop":
+        kwargs["unknown_json_keys"] = _unknown_json_keys(
+            json_struct, known_keys, policy,
         )
     return kwargs
 
 
-def from_json(record_type, json_struct):
+def from_json(record_type, json_struct, trusted=False, errors="raise"):
     """JSON marshall in function: a 'visitor' function which looks for JSON
     types/hints on types being converted to, but does not require them.
 
@@ -129,8 +530,43 @@ def from_json(record_type, json_struct):
         ``json_struct=``\ *DICT|LIST*
             a loaded (via ``json.loads``) data structure, normally a
             dict or a list.
+
+        ``trusted=``\ *BOOL*
+            The data is known to be good; for instance it was previously
+            marshalled out from a valid object.  Records are constructed
+            using :py:meth:`normalize.record.Record.from_trusted`, and so
+            ``check`` functions are not called, and values which are
+            already of the right type for their property are not coerced.
+            This applies recursively, except for types which customize
+            ``from_json`` or ``json_to_initkwargs``.
+
+        ``errors=``\ *"raise"|"collect"*
+            With ``"collect"``, members of ``JsonRecordList`` and
+            ``JsonRecordDict`` collections which can't be converted are
+            left out, rather than failing the whole conversion, and a
+            tuple of the converted value and a list of the failures is
+            returned.  Each failure is ``(FieldSelector, exception,
+            raw_json)``: the position of the member left out in the input
+            JSON, the exception raised converting it, and its JSON.  If
+            the top-level value itself can't be converted, the value
+            returned is ``None``.  This applies recursively, except
+            through types which customize ``from_json``,
+            ``json_to_initkwargs`` or ``__init__``; it can't be combined
+            with ``trusted``.
     """
-    if issubclass(record_type, JsonRecord):
+    if errors != "raise":
+        if errors != "collect" or trusted:
+            raise exc.FromJsonErrorsMode(errors=errors)
+        return _from_json_collect(record_type, json_struct)
+
+    if trusted and issubclass(record_type, Record) and (
+        not record_type.validate_trusted
+    ):
+        return _from_json_trusted(record_type, json_struct)
+
+    elif issubclass(record_type, JsonRecord):
+        if _json_polymorphic(record_type):
+            return _json_decoder(record_type)(json_struct)
         return record_type(json_struct)
 
     elif issubclass(record_type, Record):
@@ -142,34 +578,314 @@ def from_json(record_type, json_struct):
         raise exc.CastTypeError(badtype=record_type)
 
 
+def _from_json_trusted(record_type, json_struct):
+    if isinstance(json_struct, basestring):
+        json_struct = json.loads(json_struct)
+    if issubclass(record_type, JsonRecord) and _json_polymorphic(record_type):
+        record_type = _json_subtype(record_type, json_struct)
+    to_initkwargs = getattr(record_type, "json_to_initkwargs", None)
+    if to_initkwargs is None:
+        init_kwargs = json_to_initkwargs(
+            record_type, json_struct, trusted=True,
+        )
+    elif to_initkwargs.im_func in _STOCK_JSON_TO_INITKWARGS:
+        init_kwargs = to_initkwargs(json_struct, {}, trusted=True)
+    else:
+        return record_type(json_struct)
+    return record_type.from_trusted(**init_kwargs)
+
+
+def _from_json_collect(record_type, json_struct):
+    """Implements ``from_json(record_type, json_struct, errors="collect")``"""
+    if isinstance(json_struct, basestring):
+        json_struct = json.loads(json_struct)
+    failures = []
+    try:
+        value = _json_scrub(record_type, json_struct, [], failures)
+    except Exception as e:
+        return None, [(FieldSelector([]), e, json_struct)]
+    return value, failures
+
+
+# cache for _json_scrub_kind
+_json_scrub_kinds = dict()
+
+
+def _json_scrub_kind(value_type):
+    """Returns how :py:func:`_json_scrub` converts values of the passed type:
+    "list" or "dict" for collections which it converts member by member,
+    "record" for records with properties of such types, or ``None`` for
+    values which are simply converted."""
+    if value_type in _json_scrub_kinds:
+        return _json_scrub_kinds[value_type]
+    kind = _json_scrub_kinds[value_type] = None
+    if not (isinstance(value_type, type) and issubclass(value_type, Record)):
+        pass
+    elif issubclass(value_type, Collection):
+        member_type = value_type.itemtype
+        if isinstance(member_type, type) and issubclass(member_type, Record):
+            for coll_type, coll_kind in ((JsonRecordList, "list"),
+                                         (JsonRecordDict, "dict")):
+                if issubclass(value_type, coll_type) and (
+                    _json_in_is_stock(value_type)
+                ) and value_type.json_to_initkwargs.im_func is (
+                    coll_type.json_to_initkwargs.im_func
+                ) and value_type.__init__.im_func is (
+                    coll_type.__init__.im_func
+                ):
+                    kind = coll_kind
+    elif not issubclass(value_type, JsonRecord) and any(
+        hasattr(value_type, x) for x in ("from_json", "json_to_initkwargs")
+    ):
+        pass
+    elif issubclass(value_type, Record) and (
+        not issubclass(value_type, JsonRecord) or
+        _json_record_is_stock(value_type) and
+        not _json_polymorphic(value_type)
+    ):
+        if any(_json_scrub_kind(step[5].valuetype) for step in
+               _json_decode_plan(value_type)[1]):
+            kind = "record"
+    _json_scrub_kinds[value_type] = kind
+    return kind
+
+
+def _json_scrub(value_type, json_struct, path, failures):
+    """Converts ``json_struct`` to ``value_type``, leaving out collection
+    members which fail to convert, and appending them to ``failures``; see
+    :py:func:`from_json`.  ``path`` is the position of ``json_struct`` in the
+    input.  Other failures are raised."""
+    kind = _json_scrub_kind(value_type)
+    if kind == "record":
+        return _json_scrub_record(value_type, json_struct, path, failures)
+    elif kind:
+        return _json_scrub_coll(value_type, kind, json_struct, path, failures)
+    else:
+        return _member_decoder(value_type)(json_struct)
+
+
+def _json_scrub_record(record_type, json_struct, path, failures):
+    # this is json_to_initkwargs, using _json_scrub for the values
+    if json_struct is None:
+        json_struct = {}
+    if not isinstance(json_struct, dict):
+        raise exc.JsonRecordCoerceError(
+            passed=json_struct,
+            recordtype=record_type,
+        )
+    known_keys, steps, policy, lazy = _json_decode_plan(record_type)
+    kwargs = {}
+    # failures from within are only reported if this record converts
+    record_failures = []
+    found = 0
+    for (json_name, propname, json_in, decode, trusted_decode,
+         prop, first) in steps:
+        if json_name in json_struct:
+            if propname not in kwargs:
+                try:
+                    value = json_struct[json_name]
+                    if json_in:
+                        value = json_in(value)
+                    if _json_scrub_kind(prop.valuetype):
+                        value = _json_scrub(
+                            prop.valuetype, value, path + [json_name],
+                            record_failures,
+                        )
+                    elif decode:
+                        value = decode(value)
+                    if value is not _none:
+                        kwargs[propname] = value
+                except Exception as e:
+                    raise _box_ingress_error(json_name, e)
+            if first:
+                found += 1
+    if found != len(json_struct) and policy != "drop":
+        kwargs["unknown_json_keys"] = _unknown_json_keys(
+            json_struct, known_keys, policy,
+        )
+    record = record_type(**kwargs)
+    failures.extend(record_failures)
+    return record
+
+
+def _json_scrub_coll(coll_type, kind, json_struct, path, failures):
+    # this is JsonRecordList/JsonRecordDict.json_to_initkwargs, leaving out
+    # members which fail
+    member_type = coll_type.itemtype
+    if kind == "list":
+        if json_struct is None:
+            json_struct = tuple()
+        if not isinstance(json_struct, (list, tuple)):
+            raise exc.JsonCollectionCoerceError(
+                passed=json_struct,
+                colltype=coll_type,
+            )
+        values = []
+    else:
+        if json_struct is None:
+            json_struct = {}
+        if not isinstance(json_struct, collections.Mapping):
+            raise exc.JsonCollectionCoerceError(
+                passed=json_struct,
+                colltype=coll_type,
+            )
+        values = {}
+    scrub = _json_scrub_kind(member_type)
+    decode = _member_decoder(member_type)
+    for k, x in coll_type.coll_to_tuples(json_struct):
+        member_failures = []
+        try:
+            if isinstance(x, member_type):
+                value = x
+            elif scrub:
+                value = _json_scrub(
+                    member_type, x, path + [k], member_failures,
+                )
+            else:
+                value = decode(x)
+        except Exception as e:
+            failures.append((FieldSelector(path + [k]), e, x))
+        else:
+            failures.extend(member_failures)
+            if kind == "list":
+                values.append(value)
+            else:
+                values[k] = value
+    return coll_type(values=values)
+
+
 # caches for _json_data
 has_json_data = dict()
 json_data_takes_extraneous = dict()
 
+# types which are passed through to JSON as they are
+_json_native_types = frozenset(
+    (str, unicode, int, float, bool, types.NoneType)
+)
+
 
 def _json_data(x, extraneous):
     """This function calls a json_json method, if the type has one, otherwise
     calls back into to_json().  It also check whether the method takes an
     'extraneous' argument and passes that through if possible."""
-
-    if type(x) in has_json_data and has_json_data[type(x)]:
-        if json_data_takes_extraneous[type(x)]:
-            return x.json_data(extraneous=extraneous)
-        else:
-            return x.json_data()
-    else:
+    if type(x) in _json_native_types:
+        return x
+    htj = has_json_data.get(type(x))
+    if htj is None:
         htj = hasattr(x, "json_data") and callable(x.json_data)
         has_json_data[type(x)] = htj
         if htj:
             argspec = inspect.getargspec(x.json_data)
             tjte = 'extraneous' in argspec.args or argspec.keywords
             json_data_takes_extraneous[type(x)] = tjte
-            if tjte:
-                return x.json_data(extraneous=extraneous)
-            else:
-                return x.json_data()
+    if htj:
+        if json_data_takes_extraneous[type(x)]:
+            return x.json_data(extraneous=extraneous)
         else:
-            return to_json(x, extraneous)
+            return x.json_data()
+    else:
+        return to_json(x, extraneous)
+
+
+def _json_encoder(record_type, extraneous):
+    """Returns the function which ``to_json`` uses to convert instances of
+    the passed ``Record`` type to a JSON dictionary.  There are two variants
+    of it, depending on ``extraneous``; they are built the first time they
+    are needed and stored in the class."""
+    encoders = record_type.__dict__.get("_json_encoders")
+    if encoders is None:
+        encoders = record_type._json_encoders = {}
+    extraneous = bool(extraneous)
+    encoder = encoders.get(extraneous)
+    if encoder is None:
+        encoder = encoders[extraneous] = _make_json_encoder(
+            record_type, extraneous,
+        )
+    return encoder
+
+
+def _make_json_encoder(record_type, extraneous):
+    # properties which keep their value in the instance dictionary, and
+    # whose getter does nothing else, are read from the dictionary
+    # directly.  'out' is the property's conversion function if it has
+    # one, otherwise None.
+    direct = []
+    other = []
+    for propname, prop in record_type.properties.iteritems():
+        if not extraneous and prop.extraneous:
+            continue
+        json_name = getattr(prop, "json_name", prop.name)
+        if json_name is None:
+            continue
+        if not hasattr(prop, "to_json"):
+            out = None
+        elif type(prop).to_json.im_func is not \
+                JsonProperty.to_json.im_func:
+            out = functools.partial(
+                _prop_to_json, prop, extraneous=extraneous,
+            )
+        else:
+            out = prop.json_out
+        if prop.slot is None and (
+            type(prop).__get__.im_func is Property.__get__.im_func
+        ) and (
+            type(prop).slot_is_empty.im_func is
+            Property.slot_is_empty.im_func
+        ):
+            direct.append((propname, json_name, out))
+        else:
+            other.append((prop, json_name, out))
+    direct = tuple(direct)
+    other = tuple(other)
+    # properties of a LazyJsonRecord which may still be in 'deferred_json'
+    lazy = dict(
+        (propname, getattr(prop, "json_name", propname)) for propname, prop in
+        record_type.properties.iteritems()
+        if propname in _json_decode_plan(record_type)[3] and (
+            extraneous or not prop.extraneous
+        )
+    ) if issubclass(record_type, LazyJsonRecord) else None
+
+    def encode(record):
+        rv_dict = {}
+        if direct:
+            instance_dict = record.__dict__
+            for propname, json_name, out in direct:
+                if propname in instance_dict:
+                    value = instance_dict[propname]
+                    try:
+                        rv_dict[json_name] = (
+                            out(value) if out else
+                            value if type(value) in _json_native_types else
+                            _json_data(value, extraneous)
+                        )
+                    except AttributeError:
+                        pass
+        for prop, json_name, out in other:
+            if prop.slot_is_empty(record):
+                continue
+            try:
+                value = prop.__get__(record)
+                rv_dict[json_name] = (
+                    out(value) if out else _json_data(value, extraneous)
+                )
+            except AttributeError:
+                pass
+        if lazy:
+            # values not decoded yet are returned as they were passed in
+            for propname, value in record.__dict__.get(
+                "deferred_json", {},
+            ).iteritems():
+                if propname in lazy:
+                    rv_dict[lazy[propname]] = value
+        return rv_dict
+
+    encode.fields = (direct, other, lazy)
+    return encode
+
+
+def _prop_to_json(prop, value, extraneous):
+    return prop.to_json(value, extraneous, _json_data)
 
 
 def to_json(record, extraneous=True, prop=None):
@@ -212,19 +928,7 @@ def to_json(record, extraneous=True, prop=None):
             return list(_json_data(x, extraneous) for x in record)
 
     elif isinstance(record, Record):
-        rv_dict = {}
-        for propname, prop in type(record).properties.iteritems():
-            if not extraneous and prop.extraneous:
-                pass
-            elif prop.slot_is_empty(record):
-                pass
-            elif not hasattr(prop, "json_name") or prop.json_name is not None:
-                json_name = getattr(prop, "json_name", prop.name)
-                try:
-                    rv_dict[json_name] = to_json(record, extraneous, prop)
-                except AttributeError:
-                    pass
-        return rv_dict
+        return _json_encoder(type(record), extraneous)(record)
 
     elif isinstance(record, long):
         return str(record) if abs(record) > 2**50 else record
@@ -259,8 +963,50 @@ class JsonRecord(Record):
     2. Unknown keys are permitted, and saved in the "unknown_json_keys"
        property, which is merged back on output (ie, calling ``.json_data()``
        or ``to_json()``)
+
+    How the unknown keys are saved is set by the ``unknown_json_keys_policy``
+    class attribute:
+
+    ``"copy"``
+        the values are deep copied from the JSON data (the default)
+
+    ``"share"``
+        the values are the same objects as in the JSON data
+
+    ``"drop"``
+        unknown keys are not saved
+
+    ``"lazy"``
+        the values are shared with the JSON data, until they are read from
+        ``unknown_json_keys``, at which point they are copied.  Marshalling
+        out does not copy them.  Values read by passing the dictionary to
+        ``dict()`` or as ``**kwargs`` are not copied, and must not be
+        modified.
+
+    JSON can be decoded to sub-classes of a type (eg, in a
+    ``JsonListProperty`` with mixed members), by setting either of these
+    class attributes on it:
+
+    ``json_discriminator``
+        the JSON key which names the type to decode to.  Each sub-class
+        is named by its ``json_discriminator_value`` attribute, or
+        otherwise its class name.  Values which are not known raise
+        :py:class:`normalize.exc.JsonDiscriminatorUnknown`.
+
+    ``json_duck_typing``
+        if true, the type is picked by the keys present: the one (the
+        type itself, or a sub-class) which knows the most of them, and
+        for which none of its ``required`` properties are missing.  If
+        several match, the type knowing fewer keys is used.
+
+    If both are set, duck typing is used when the discriminator key is
+    missing.  This applies to ``from_json()`` and the ``from_json``
+    class method, but not to the constructor.
     """
     unknown_json_keys = JsonProperty(json_name=None, extraneous=True)
+    unknown_json_keys_policy = "copy"
+    json_discriminator = None
+    json_duck_typing = False
 
     def __init__(self, json_data=None, **kwargs):
         """Build a new JsonRecord sub-class.
@@ -288,18 +1034,20 @@ class JsonRecord(Record):
         super(JsonRecord, self).__init__(**kwargs)
 
     @classmethod
-    def json_to_initkwargs(self, json_data, kwargs):
+    def json_to_initkwargs(self, json_data, kwargs, trusted=False):
         """Subclassing hook to specialize how JSON data is converted
         to keyword arguments"""
         if isinstance(json_data, basestring):
             json_data = json.loads(json_data)
-        return json_to_initkwargs(self, json_data, kwargs)
+        return json_to_initkwargs(self, json_data, kwargs, trusted)
 
     @classmethod
     def from_json(self, json_data):
         """This method can be overridden to specialize how the class is loaded
         when marshalling in; however beware that it is not invoked when the
         caller uses the ``from_json()`` function directly."""
+        if _json_polymorphic(self):
+            return _json_decoder(self)(json_data)
         return self(json_data)
 
     def json_data(self, extraneous=False):
@@ -315,7 +1063,7 @@ class JsonRecord(Record):
         if hasattr(self, "unknown_json_keys"):
             prop = type(self).properties['unknown_json_keys']
             if extraneous or not prop.extraneous:
-                for k, v in self.unknown_json_keys.iteritems():
+                for k, v in dict.iteritems(self.unknown_json_keys):
                     if k not in jd:
                         jd[k] = to_json(v, extraneous)
         return jd
@@ -341,6 +1089,59 @@ class JsonRecord(Record):
         )
 
 
+class LazyJsonRecord(JsonRecord):
+    """Version of a ``JsonRecord`` which decodes its record and collection
+    properties from JSON when they are first read, rather than when it is
+    constructed.  Until then, their JSON values are kept in the
+    ``deferred_json`` property, and are returned as they are by ``to_json``
+    and ``json_data``.
+
+    Properties with ``json_in`` or ``json_out`` functions, ``required`` or
+    ``default`` values, or which are stored in ``__slots__``, are decoded
+    when the record is constructed, as usual.  Decoding errors are raised
+    when the property is read.  Assigning to or deleting a property
+    discards its JSON value.  The JSON data passed in should not be
+    modified afterwards.
+    """
+    deferred_json = JsonProperty(json_name=None, extraneous=True)
+
+    def __getattr__(self, name):
+        deferred = (
+            None if name.startswith("__") else
+            self.__dict__.get("deferred_json")
+        )
+        if not deferred or name not in deferred:
+            raise AttributeError(name)
+        prop = type(self).properties[name]
+        try:
+            prop.init_prop(self, _json_decoder(prop.valuetype)(deferred[name]))
+        except Exception as e:
+            raise _box_ingress_error(getattr(prop, "json_name", name), e)
+        self._drop_deferred(name)
+        return prop.__get__(self)
+
+    def __setattr__(self, name, value):
+        self._drop_deferred(name)
+        super(LazyJsonRecord, self).__setattr__(name, value)
+
+    def __delattr__(self, name):
+        if self._drop_deferred(name) and name not in self.__dict__:
+            return
+        super(LazyJsonRecord, self).__delattr__(name)
+
+    def _drop_deferred(self, name):
+        """Removes ``name`` from ``deferred_json``, returning true if it was
+        there.  The dictionary is replaced rather than modified, as copies of
+        the record share it."""
+        deferred = self.__dict__.get("deferred_json")
+        if not deferred or name not in deferred:
+            return False
+        self.__dict__["deferred_json"] = dict(
+            (k, v) for k, v in deferred.iteritems() if k != name
+        )
+        return True
+
+
 class JsonRecordList(RecordList, JsonRecord):
     """Version of a RecordList which deals primarily in JSON"""
     json_coll_name = "array"
@@ -365,7 +1166,7 @@ class JsonRecordList(RecordList, JsonRecord):
         super(JsonRecordList, self).__init__(**kwargs)
 
     @classmethod
-    def json_to_initkwargs(cls, json_struct, kwargs):
+    def json_to_initkwargs(cls, json_struct, kwargs, trusted=False):
         member_type = cls.itemtype
         if not member_type:
             raise exc.CollectionDefinitionError(
@@ -382,12 +1183,22 @@ class JsonRecordList(RecordList, JsonRecord):
                     colltype=cls,
                 )
 
-            if hasattr(member_type, "from_json"):
+            if trusted and _json_in_is_stock(member_type):
                 for i, x in cls.coll_to_tuples(json_struct):
                     try:
                         values.append(
                             x if isinstance(x, member_type) else
-                            member_type.from_json(x)
+                            from_json(member_type, x, trusted=True)
+                        )
+                    except Exception as e:
+                        raise _box_ingress_error(i, e)
+
+            elif hasattr(member_type, "from_json"):
+                decode = _json_decoder(member_type)
+                for i, x in cls.coll_to_tuples(json_struct):
+                    try:
+                        values.append(
+                            x if isinstance(x, member_type) else decode(x)
                         )
                     except Exception as e:
                         raise _box_ingress_error(i, e)
@@ -439,7 +1250,7 @@ class JsonRecordDict(RecordDict, JsonRecord):
         super(JsonRecordDict, self).__init__(**kwargs)
 
     @classmethod
-    def json_to_initkwargs(cls, json_struct, kwargs):
+    def json_to_initkwargs(cls, json_struct, kwargs, trusted=False):
         member_type = cls.itemtype
         if not member_type:
             raise exc.CollectionDefinitionError(
@@ -456,12 +1267,22 @@ class JsonRecordDict(RecordDict, JsonRecord):
                     colltype=cls,
                 )
 
-            if hasattr(member_type, "from_json"):
+            if trusted and _json_in_is_stock(member_type):
                 for k, x in cls.coll_to_tuples(json_struct):
                     try:
                         values[k] = (
                             x if isinstance(x, member_type) else
-                            member_type.from_json(x)
+                            from_json(member_type, x, trusted=True)
+                        )
+                    except Exception as e:
+                        raise _box_ingress_error(k, e)
+
+            elif hasattr(member_type, "from_json"):
+                decode = _json_decoder(member_type)
+                for k, x in cls.coll_to_tuples(json_struct):
+                    try:
+                        values[k] = (
+                            x if isinstance(x, member_type) else decode(x)
                         )
                     except Exception as e:
                         raise _box_ingress_error(k, e)
@@ -488,6 +1309,666 @@ class JsonRecordDict(RecordDict, JsonRecord):
         return super_repr.replace("{", "values={", 1)
 
 
+_STOCK_JSON_TO_INITKWARGS = frozenset((
+    JsonRecord.json_to_initkwargs.im_func,
+    JsonRecordList.json_to_initkwargs.im_func,
+    JsonRecordDict.json_to_initkwargs.im_func,
+))
+
+
+# how iterencode() can stream values of each type, or False if it has to
+# build the JSON data first; see _json_stream_kind
+_json_stream_kinds = dict()
+
+
+def _json_stream_kind(value_type):
+    kind = _json_stream_kinds.get(value_type)
+    if kind is None:
+        json_data = getattr(
+            getattr(value_type, "json_data", None), "im_func", None,
+        )
+        if not issubclass(value_type, Record):
+            kind = False
+        elif issubclass(value_type, Collection):
+            if json_data not in (None, JsonRecordList.json_data.im_func,
+                                 JsonRecordDict.json_data.im_func):
+                kind = False
+            elif issubclass(value_type, RecordDict):
+                kind = "dict"
+            else:
+                kind = "list"
+        elif json_data is None:
+            kind = "record"
+        elif json_data is JsonRecord.json_data.im_func:
+            kind = "json_record"
+        else:
+            kind = False
+        _json_stream_kinds[value_type] = kind
+    return kind
+
+
+def _json_key(key):
+    """Converts a dictionary key the way ``json.dumps`` does"""
+    if isinstance(key, basestring):
+        return key
+    elif key is True:
+        return "true"
+    elif key is False:
+        return "false"
+    elif key is None:
+        return "null"
+    elif isinstance(key, float):
+        return repr(key)
+    elif isinstance(key, (int, long)):
+        return str(key)
+    raise TypeError("key %r is not a string" % (key,))
+
+
+def _iter_json_fields(record, extraneous):
+    """Generates ``(json_name, value, out)`` for each property of the record
+    which ``to_json`` would include, in the same way that the encoder from
+    :py:func:`_json_encoder` does."""
+    direct, other, lazy = _json_encoder(type(record), extraneous).fields
+    if direct:
+        instance_dict = record.__dict__
+        for propname, json_name, out in direct:
+            if propname in instance_dict:
+                yield json_name, instance_dict[propname], out
+    if lazy:
+        for propname, value in record.__dict__.get(
+            "deferred_json", {},
+        ).iteritems():
+            if propname in lazy:
+                yield lazy[propname], value, _json_raw
+    for prop, json_name, out in other:
+        if prop.slot_is_empty(record):
+            continue
+        try:
+            value = prop.__get__(record)
+        except AttributeError:
+            continue
+        yield json_name, value, out
+
+
+def _json_raw(value):
+    return value
+
+
+def _iterencode_member(value, extraneous, encoder):
+    """Members of collections are converted and written out one at a time,
+    unless they are collections themselves"""
+    if _json_stream_kind(type(value)) in ("list", "dict"):
+        return _iterencode(value, extraneous, encoder)
+    return (encoder.encode(_json_data(value, extraneous)),)
+
+
+def _iterencode(value, extraneous, encoder):
+    kind = _json_stream_kind(type(value))
+    if not kind:
+        for chunk in encoder.iterencode(_json_data(value, extraneous)):
+            yield chunk
+        return
+
+    item_separator = encoder.item_separator
+    key_separator = encoder.key_separator
+    if kind == "list":
+        yield "["
+        first = True
+        for item in value:
+            if first:
+                first = False
+            else:
+                yield item_separator
+            for chunk in _iterencode_member(item, extraneous, encoder):
+                yield chunk
+        yield "]"
+        return
+
+    yield "{"
+    first = True
+    if kind == "dict":
+        for k, v in value.items():
+            if first:
+                first = False
+            else:
+                yield item_separator
+            yield encoder.encode(_json_key(k)) + key_separator
+            for chunk in _iterencode_member(v, extraneous, encoder):
+                yield chunk
+        yield "}"
+        return
+
+    names = set()
+    for json_name, v, out in _iter_json_fields(value, extraneous):
+        # values are converted before the key is written, so that an
+        # AttributeError can skip the key, as in to_json
+        if out:
+            try:
+                chunks = encoder.iterencode(out(v))
+            except AttributeError:
+                continue
+        elif type(v) in _json_native_types:
+            chunks = (encoder.encode(v),)
+        elif _json_stream_kind(type(v)):
+            chunks = _iterencode(v, extraneous, encoder)
+        else:
+            try:
+                chunks = encoder.iterencode(_json_data(v, extraneous))
+            except AttributeError:
+                continue
+        if first:
+            first = False
+        else:
+            yield item_separator
+        yield encoder.encode(json_name) + key_separator
+        for chunk in chunks:
+            yield chunk
+        names.add(json_name)
+
+    # merge the unknown keys back in, as JsonRecord.json_data does
+    if kind == "json_record" and hasattr(value, "unknown_json_keys"):
+        prop = type(value).properties['unknown_json_keys']
+        if extraneous or not prop.extraneous:
+            for k, v in dict.iteritems(value.unknown_json_keys):
+                if k in names:
+                    continue
+                if first:
+                    first = False
+                else:
+                    yield item_separator
+                yield encoder.encode(k) + key_separator
+                for chunk in encoder.iterencode(to_json(v, extraneous)):
+                    yield chunk
+    yield "}"
+
+
+def iterencode(record, extraneous=False, separators=None):
+    """Streaming JSON marshal out function.  Returns a generator of chunks of
+    JSON text, which join together to make the same document as
+    ``json.dumps(record.json_data(extraneous=extraneous))`` (or the
+    ``to_json`` form of the record, if it has no ``json_data`` method),
+    except that the keys of objects may be in a different order.
+
+    Records and collections which do not customize ``json_data`` are written
+    out as they are visited: collections one member at a time, and records
+    one property at a time.  So, the JSON data structure for the whole
+    document is never built in memory at once, only that of each member.
+
+    args:
+        ``record=``\ *anything*
+            The value to convert.
+
+        ``extraneous=``\ *BOOL*
+            Include extraneous properties, as for ``to_json``.
+
+        ``separators=``\ *TUPLE*
+            ``(item_separator, key_separator)``, as for ``json.dumps``.
+    """
+    encoder = json.JSONEncoder(separators=separators)
+    return _iterencode(record, extraneous, encoder)
+
+
+def dump(record, fp, extraneous=False, separators=None):
+    """Writes the JSON form of ``record`` to the file-like object ``fp`` as it
+    is generated by :py:func:`iterencode`."""
+    for chunk in iterencode(record, extraneous, separators):
+        fp.write(chunk)
+
+
+# input which might be the rest of a number split across reads
+_number_tail_re = re.compile(r'[0-9.eE+\-]*\Z')
+# where in the input a JSON decoding error was found
+_json_error_pos_re = re.compile(r'\(char (\d+)\)')
+# errors which mean the input ended in the middle of a string
+_json_truncated_string_errors = ("Unterminated string", "end is out of bounds")
+# errors this close to the end of the input might be a token (eg, "false"
+# or a "\uXXXX" escape) split across reads
+_json_token_slack = 16
+
+
+class _JsonStreamReader(object):
+    """Reads JSON values one at a time from a file-like object, keeping only
+    the unconsumed part of the input in memory"""
+    def __init__(self, fp, chunk_size):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.consumed = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+        self.py_decoder = None
+
+    @property
+    def offset(self):
+        return self.consumed + self.pos
+
+    def fill(self, size=None):
+        """Reads more input; returns false at the end of the file"""
+        if self.eof:
+            return False
+        data = self.fp.read(size or self.chunk_size)
+        if not data:
+            self.eof = True
+            return False
+        self.consumed += self.pos
+        self.buf = self.buf[self.pos:] + data
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Returns the next character which is not whitespace, or an empty
+        string at the end of the file"""
+        while True:
+            buf = self.buf
+            pos = self.pos
+            while pos < len(buf) and buf[pos] in " \t\n\r":
+                pos += 1
+            self.pos = pos
+            if pos < len(buf):
+                return buf[pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, chars):
+        """Consumes the next character, which must be one of ``chars``"""
+        char = self.peek()
+        if not char or char not in chars:
+            raise ValueError(
+                "Expecting %s at offset %d" % (
+                    " or ".join(repr(c) for c in chars), self.offset,
+                )
+            )
+        self.pos += 1
+        return char
+
+    def value(self):
+        """Decodes the next value"""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buf, self.pos)
+            except ValueError as e:
+                # the value may not be all in the buffer yet; read at least
+                # as much again, so that large values are not re-scanned too
+                # many times
+                if self.truncated(e) and self.fill(
+                    max(self.chunk_size, len(self.buf) - self.pos),
+                ):
+                    continue
+                raise
+            # a number at the end of the buffer might continue, and may
+            # have been decoded only up to a "." or "e" before the rest
+            if not isinstance(value, (dict, list, basestring)) and \
+                    _number_tail_re.match(self.buf, end) and self.fill():
+                continue
+            self.pos = end
+            return value
+
+    def truncated(self, error):
+        """Returns true if a decoding error could be because the value
+        continues past the end of the buffer, rather than a syntax error"""
+        message = str(error)
+        match = _json_error_pos_re.search(message)
+        if not match and not message.startswith(
+            _json_truncated_string_errors,
+        ):
+            # the C scanner does not report where errors inside arrays and
+            # objects are, but the pure Python one does
+            if self.py_decoder is None:
+                self.py_decoder = json.JSONDecoder()
+                self.py_decoder.scan_once = py_make_scanner(self.py_decoder)
+            try:
+                self.py_decoder.raw_decode(self.buf, self.pos)
+            except ValueError as e:
+                message = str(e)
+                match = _json_error_pos_re.search(message)
+        if message.startswith(_json_truncated_string_errors):
+            return True
+        pos = int(match.group(1)) if match else self.pos
+        return pos >= len(self.buf) - _json_token_slack
+
+
+def iterload(record_type, fp, key=None, chunk_size=65536):
+    """Streaming JSON marshal in function, for large JSON arrays.  Reads the
+    array from the file-like object ``fp`` a piece at a time, and yields its
+    members one at a time, converted to the item type.  Unlike passing the
+    whole document to ``json.loads``, only the member being converted needs
+    to be held in memory.
+
+    args:
+        ``record_type=``\ *TYPE*
+            Either a collection type, such as a ``JsonRecordList``
+            sub-class, in which case the members are converted to its
+            ``itemtype``, or the ``Record`` type of the members.
+
+        ``fp=``\ *FILE*
+            File-like object to read from; only its ``read`` method is used.
+
+        ``key=``\ *STR*
+            The array is not the top level JSON value, but is found under
+            this key in the top level object; for instance, where the list is
+            wrapped in a dictionary with paging information.  The other keys
+            are skipped, and input after the array is not read.
+
+        ``chunk_size=``\ *INT*
+            How much to read from ``fp`` at once.
+
+    Errors, including JSON syntax errors, are raised as
+    :py:class:`normalize.exc.JsonConversionError`, with the position of the
+    member in the array in ``error_fs``.
+    """
+    if issubclass(record_type, Collection):
+        itemtype = record_type.itemtype
+        coerce_value = record_type.coerce_value
+    else:
+        itemtype = coerce_value = record_type
+    if hasattr(itemtype, "from_json"):
+        decode = _json_decoder(itemtype)
+    elif issubclass(itemtype, Record):
+        decode = functools.partial(from_json, itemtype)
+    else:
+        decode = coerce_value
+    context = [] if key is None else [key]
+
+    def box(index, exception):
+        error = _box_ingress_error(index, exception)
+        error_fs = FieldSelector(context)
+        error_fs.extend(error.error_fs)
+        return exc.JsonConversionError(
+            error_fs=error_fs,
+            sub_exception=error.sub_exception,
+        )
+
+    reader = _JsonStreamReader(fp, chunk_size)
+    try:
+        if key is not None:
+            reader.expect("{")
+            while True:
+                if reader.peek() != '"':
+                    raise ValueError("key %r not found" % (key,))
+                if reader.value() == key:
+                    reader.expect(":")
+                    break
+                reader.expect(":")
+                reader.value()
+                reader.expect(",}")
+        reader.expect("[")
+    except ValueError as e:
+        raise exc.JsonConversionError(
+            error_fs=FieldSelector(context),
+            sub_exception=e,
+        )
+
+    if reader.peek() == "]":
+        return
+    index = 0
+    while True:
+        try:
+            item = decode(reader.value())
+        except Exception as e:
+            raise box(index, e)
+        yield item
+        index += 1
+        try:
+            if reader.expect(",]") == "]":
+                return
+        except ValueError as e:
+            raise box(index, e)
+
+
+class NdjsonStats(Record):
+    """Progress and throughput counters for :py:func:`from_ndjson` and
+    :py:func:`to_ndjson`"""
+    records = Property(isa=int, default=0,
+                       doc="Number of records read or written so far")
+    bytes = Property(isa=(int, long), default=0,
+                     doc="Number of bytes of JSON read or written so far")
+    elapsed = Property(isa=float, default=0.0,
+                       doc="Seconds since the operation started")
+
+    @property
+    def records_per_second(self):
+        return self.records / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def bytes_per_second(self):
+        return self.bytes / self.elapsed if self.elapsed else 0.0
+
+
+def _batches(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        batch = list(itertools.islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _map_batches(func, jobs, workers):
+    """Generates ``func(job)`` for each job, in order, optionally using a
+    pool of ``workers`` processes.  Jobs are handed to the pool a few at a
+    time, so that reading input does not run too far ahead of the
+    results."""
+    if not workers or workers < 2:
+        for job in jobs:
+            yield func(job)
+        return
+    pool = multiprocessing.Pool(workers)
+    try:
+        for window in _batches(jobs, workers * 2):
+            for result in pool.imap(func, window):
+                yield result
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def _ndjson_decode_batch(job):
+    """Decodes ``(record_type, lines, start)``.  Returns the records, the
+    number of bytes decoded, and ``(index, lines)`` of the first line which
+    fails to decode and the lines from there on, or ``None``.  Exceptions
+    are not raised from here, as they might not survive being returned
+    from a worker process."""
+    record_type, lines, start = job
+    decode = _member_decoder(record_type)
+    records = []
+    nbytes = 0
+    for index, line in enumerate(lines, start):
+        if line.strip():
+            try:
+                records.append(decode(json.loads(line)))
+            except Exception:
+                return records, nbytes, (index, lines[index - start:])
+        nbytes += len(line)
+    return records, nbytes, None
+
+
+def from_ndjson(record_type, fp, workers=None, batch_size=1000,
+                progress=None):
+    """Generator which reads newline-delimited JSON ("JSON lines") from the
+    file-like object ``fp``, and yields a ``record_type`` instance for each
+    line.  Blank lines are skipped.
+
+    args:
+        ``workers=``\ *INT*
+            Decode batches of lines in a ``multiprocessing`` pool of this
+            many processes.  ``record_type`` must be importable by the
+            workers, ie declared at module level.
+
+        ``batch_size=``\ *INT*
+            Number of lines read and decoded at a time.
+
+        ``progress=``\ *FUNCTION*
+            Called with a :py:class:`NdjsonStats` after each batch.
+
+    Failures raise :py:class:`normalize.exc.JsonConversionError`, with the
+    index of the line in the file (counting from 0) in ``error_fs``.
+    """
+    stats = NdjsonStats()
+    started = time.time()
+    jobs = (
+        (record_type, lines, i * batch_size) for i, lines in
+        enumerate(_batches(fp, batch_size))
+    )
+    for records, nbytes, error in _map_batches(
+        _ndjson_decode_batch, jobs, workers,
+    ):
+        for record in records:
+            yield record
+        stats.records += len(records)
+        stats.bytes += nbytes
+        if error:
+            # decode the rest of the batch here, to raise the exception in
+            # this process, or carry on if the failure was in the worker
+            start, rest = error
+            decode = _member_decoder(record_type)
+            for index, line in enumerate(rest, start):
+                if line.strip():
+                    try:
+                        record = decode(json.loads(line))
+                    except Exception as e:
+                        raise _box_ingress_error(index, e)
+                    yield record
+                    stats.records += 1
+                stats.bytes += len(line)
+        stats.elapsed = time.time() - started
+        if progress:
+            progress(stats)
+
+
+def _ndjson_encode_batch(job):
+    """Encodes ``(records, extraneous)``.  Returns the JSON lines for the
+    records which encoded, and the index of the first record which fails to
+    encode, or ``None``."""
+    records, extraneous = job
+    lines = []
+    for index, record in enumerate(records):
+        try:
+            lines.append(json.dumps(_json_data(record, extraneous)) + "\n")
+        except Exception:
+            return "".join(lines), index
+    return "".join(lines), None
+
+
+def to_ndjson(records, fp, extraneous=False, workers=None, batch_size=1000,
+              progress=None):
+    """Writes each of the records in the iterable ``records`` to the
+    file-like object ``fp`` as a line of JSON, and returns a
+    :py:class:`NdjsonStats` with the totals.  Each line is
+    ``json.dumps(record.json_data(extraneous=extraneous))``, or the
+    ``to_json`` form if the record has no ``json_data`` method.
+
+    The ``workers``, ``batch_size`` and ``progress`` arguments are as for
+    :py:func:`from_ndjson`; each batch is written with a single call to
+    ``fp.write``.
+    """
+    stats = NdjsonStats()
+    started = time.time()
+    pending = collections.deque()
+
+    def jobs():
+        for batch in _batches(records, batch_size):
+            pending.append(batch)
+            yield batch, extraneous
+
+    for text, error in _map_batches(_ndjson_encode_batch, jobs(), workers):
+        batch = pending.popleft()
+        if error is not None:
+            # encode the rest of the batch here, to raise the exception in
+            # this process, or carry on if the failure was in the worker
+            text += "".join(
+                json.dumps(_json_data(record, extraneous)) + "\n"
+                for record in batch[error:]
+            )
+        fp.write(text)
+        stats.records += len(batch)
+        stats.bytes += len(text)
+        stats.elapsed = time.time() - started
+        if progress:
+            progress(stats)
+    return stats
+
+
+def _decode_members_batch(job):
+    """Decodes ``(member_type, members, start)`` for
+    :py:func:`from_json_parallel`.  Returns the members decoded and the
+    position of the first member which failed, or ``None``."""
+    member_type, members, start = job
+    decode = _member_decoder(member_type)
+    values = []
+    for index, x in enumerate(members, start):
+        try:
+            values.append(x if isinstance(x, member_type) else decode(x))
+        except Exception:
+            return values, index
+    return values, None
+
+
+def from_json_parallel(list_type, json_data, workers=None, chunk_size=None):
+    """Marshal in function for large JSON arrays, which decodes the members
+    in a pool of ``multiprocessing`` worker processes.  Returns the same
+    result as ``list_type(json_data)``.
+
+    args:
+        ``list_type=``\ *TYPE*
+            A ``JsonRecordList`` sub-class.  Its ``itemtype`` must be a
+            ``Record`` type importable by the workers (ie, declared at
+            module level); the decoded records are returned using pickle.
+            Types which override ``json_to_initkwargs`` are decoded
+            normally.
+
+        ``json_data=``\ *LIST|STR*
+            The JSON array, or a string containing it.
+
+        ``workers=``\ *INT*
+            Number of processes; defaults to the number of CPUs.
+
+        ``chunk_size=``\ *INT*
+            Number of members decoded by a worker at a time; the default
+            splits the array into four chunks per worker.
+
+    If a member can't be decoded, a
+    :py:class:`normalize.exc.JsonConversionError` is raised with its
+    position in the whole array in ``error_fs``.
+    """
+    if isinstance(json_data, basestring):
+        json_data = json.loads(json_data)
+    if workers is None:
+        workers = multiprocessing.cpu_count()
+    member_type = list_type.itemtype
+    if workers < 2 or not isinstance(json_data, (list, tuple)) or (
+        list_type.json_to_initkwargs.im_func is not
+        JsonRecordList.json_to_initkwargs.im_func
+    ) or not (
+        isinstance(member_type, type) and issubclass(member_type, Record)
+    ):
+        return list_type(json_data)
+    if not chunk_size:
+        chunk_size = max(1, -(-len(json_data) // (workers * 4)))
+    jobs = (
+        (member_type, json_data[start:start + chunk_size], start)
+        for start in xrange(0, len(json_data), chunk_size)
+    )
+    values = []
+    for decoded, error in _map_batches(_decode_members_batch, jobs, workers):
+        values.extend(decoded)
+        if error is not None:
+            # decode the rest of the chunk here, to raise the exception in
+            # this process, or carry on if the failure was in the worker
+            decode = _member_decoder(member_type)
+            end = min(error - error % chunk_size + chunk_size, len(json_data))
+            for index in xrange(error, end):
+                x = json_data[index]
+                try:
+                    values.append(
+                        x if isinstance(x, member_type) else decode(x)
+                    )
+                except Exception as e:
+                    raise _box_ingress_error(index, e)
+    return list_type(values=values)
+
+
 class JsonDiffInfo(DiffInfo, JsonRecord):
     """Version of 'DiffInfo' that supports ``.json_data()``"""
     def json_data(self):
@@ -503,19 +1984,54 @@ class JsonDiff(Diff, JsonRecordList):
     itemtype = JsonDiffInfo
 
 
+_camel_case_re = re.compile(r'([a-z\d])([A-Z])')
+_underscore_re = re.compile(r'([a-z\d])_([a-z])')
+
+# key conversions for AutoJsonRecord, shared by all types and instances
+_json_key_in = _LruCache(functools.partial(
+    _camel_case_re.sub, lambda m: "%s_%s" % (m.group(1), m.group(2).lower()),
+))
+_json_key_out = _LruCache(functools.partial(
+    _underscore_re.sub, lambda m: "%s%s" % (m.group(1), m.group(2).upper()),
+))
+
+
+def _auto_compared_keys(self, value):
+    """``compare_as`` function for ``AutoJsonRecord.unknown_json_keys``; see
+    :py:meth:`AutoJsonRecord._compared_unknown_json_keys`"""
+    return self._compared_unknown_json_keys(value)
+
+
 class AutoJsonRecord(JsonRecord):
+    """A ``JsonRecord`` which keeps JSON keys it does not know as attributes,
+    converting their names from camelCase to python_form, and upgrading
+    dictionaries within to ``AutoJsonRecord`` (and lists of them to lists
+    of ``AutoJsonRecord``).
+
+    If the ``auto_upgrade_lazily`` class attribute is set, values are only
+    upgraded when they are first read as attributes, and dictionaries
+    within are upgraded to the same class, so they are lazy too.  The
+    upgraded values are kept aside; ``unknown_json_keys`` continues to
+    hold the values as they were passed in.  Comparisons (``==`` and the
+    diff functions) go through the upgraded values, so changes made to
+    them are seen.
+    """
     unknown_json_keys = JsonProperty(
         json_name=None, extraneous=False, default=lambda: {},
+        compare_as=_auto_compared_keys,
     )
+    auto_upgrade_lazily = False
 
     @classmethod
     def auto_upgrade_dict(cls, thing):
-        return AutoJsonRecord(thing)
+        return (cls if cls.auto_upgrade_lazily else AutoJsonRecord)(thing)
 
     @classmethod
     def auto_upgrade_list(cls, thing):
         if len(thing) and isinstance(thing[0], dict):
-            return list_of(AutoJsonRecord)(thing)
+            return list_of(
+                cls if cls.auto_upgrade_lazily else AutoJsonRecord
+            )(thing)
         else:
             return thing
 
@@ -530,19 +2046,11 @@ class AutoJsonRecord(JsonRecord):
 
     @classmethod
     def convert_json_key_in(cls, key):
-        return re.sub(
-            r'([a-z\d])([A-Z])',
-            lambda m: "%s_%s" % (m.group(1), m.group(2).lower()),
-            key,
-        )
+        return _json_key_in(key)
 
     @classmethod
     def convert_json_key_out(cls, key):
-        return re.sub(
-            r'([a-z\d])_([a-z])',
-            lambda m: "%s%s" % (m.group(1), m.group(2).upper()),
-            key,
-        )
+        return _json_key_out(key)
 
     @classmethod
     def json_to_initkwargs(cls, json_data, kwargs):
@@ -552,28 +2060,81 @@ class AutoJsonRecord(JsonRecord):
         # upgrade any dictionaries to AutoJsonRecord, and
         # any lists of dictionaries to list_of(AutoJsonRecord)
         if 'unknown_json_keys' in kwargs:
-            kwargs['unknown_json_keys'] = {
-                cls.convert_json_key_in(k): cls.auto_upgrade_any(v) for
-                k, v in kwargs['unknown_json_keys'].items()
-            }
+            if cls.auto_upgrade_lazily:
+                kwargs['unknown_json_keys'] = {
+                    cls.convert_json_key_in(k): v for
+                    k, v in kwargs['unknown_json_keys'].items()
+                }
+            else:
+                kwargs['unknown_json_keys'] = {
+                    cls.convert_json_key_in(k): cls.auto_upgrade_any(v) for
+                    k, v in kwargs['unknown_json_keys'].items()
+                }
         return kwargs
 
+    def _auto_upgraded(self, key, value):
+        """Returns ``value``, the value of ``key`` in ``unknown_json_keys``,
+        upgraded; the result is cached in the instance for as long as that
+        value stays the same."""
+        upgrades = self.__dict__.setdefault("_auto_upgrades", {})
+        cached = upgrades.get(key)
+        if cached is not None and cached[0] is value:
+            return cached[1]
+        upgraded = type(self).auto_upgrade_any(value)
+        upgrades[key] = (value, upgraded)
+        return upgraded
+
+    def _compared_unknown_json_keys(self, value):
+        """Returns ``value``, the ``unknown_json_keys`` dictionary, to be
+        compared in place of it.  For ``auto_upgrade_lazily`` types, its
+        ``dict`` and ``list`` values are replaced by the JSON form of their
+        upgraded versions, so that changes made to the upgraded values
+        already read are included."""
+        if not type(self).auto_upgrade_lazily:
+            return value
+        return dict(
+            (k, _json_data(self._auto_upgraded(k, v), False)
+             if isinstance(v, (dict, list)) else v)
+            for k, v in dict.iteritems(value)
+        )
+
+    def __eq__(self, other):
+        if type(self) != type(other) or not type(self).auto_upgrade_lazily:
+            return super(AutoJsonRecord, self).__eq__(other)
+        for propname, prop in type(self).properties.iteritems():
+            if not prop.extraneous:
+                a = getattr(self, propname, _none)
+                b = getattr(other, propname, _none)
+                if propname == "unknown_json_keys" and \
+                        a is not _none and b is not _none:
+                    a = self._compared_unknown_json_keys(a)
+                    b = other._compared_unknown_json_keys(b)
+                if a != b:
+                    return False
+        return True
+
     def json_data(self, extraneous=False):
         jd = to_json(self, extraneous)
         if hasattr(self, "unknown_json_keys"):
             prop = type(self).properties['unknown_json_keys']
             if extraneous or not prop.extraneous:
-                for k, v in self.unknown_json_keys.iteritems():
-                    k = type(self).convert_json_key_out(k)
-                    if k not in jd:
-                        jd[k] = to_json(v, extraneous)
+                lazy = type(self).auto_upgrade_lazily
+                for k, v in dict.iteritems(self.unknown_json_keys):
+                    json_key = type(self).convert_json_key_out(k)
+                    if json_key not in jd:
+                        # marshal out as if upgraded eagerly
+                        if lazy and isinstance(v, (dict, list)):
+                            v = self._auto_upgraded(k, v)
+                        jd[json_key] = _json_data(v, extraneous)
         return jd
 
     def __getattr__(self, attr):
         if attr in type(self).properties:
             return type(self).properties[attr].__get__(self)
-        else:
-            return self.unknown_json_keys[attr]
+        value = self.unknown_json_keys[attr]
+        if type(self).auto_upgrade_lazily and isinstance(value, (dict, list)):
+            value = self._auto_upgraded(attr, value)
+        return value
 
     def __setattr__(self, attr, value):
         if attr in type(self).properties:
@@ -601,11 +2162,13 @@ class NCAutoJsonRecord(AutoJsonRecord):
 
     @classmethod
     def auto_upgrade_dict(cls, thing):
-        return NCAutoJsonRecord(thing)
+        return (cls if cls.auto_upgrade_lazily else NCAutoJsonRecord)(thing)
 
     @classmethod
     def auto_upgrade_list(cls, thing):
         if len(thing) and isinstance(thing[0], dict):
-            return list_of(NCAutoJsonRecord)(thing)
+            return list_of(
+                cls if cls.auto_upgrade_lazily else NCAutoJsonRecord
+            )(thing)
         else:
             return thing
@@ -18,16 +18,179 @@
 from __future__ import absolute_import
 
 import normalize.exc as exc
+from normalize.property import _none
+from normalize.property import CompactProperty
+from normalize.property import LazyProperty
 from normalize.property import Property
+from normalize.property.meta import PROPERTY_TYPES
+
+
+def _not_known(self, init_dict, compiled, trusted):
+    """Initializes the keys in ``init_dict`` which are not in ``compiled``,
+    but are properties of the record being constructed, for properties
+    added since the constructor was compiled.  Raises ``PropertyNotKnown``
+    for the first key which is not a property."""
+    properties = type(self).properties
+    for propname, value in init_dict.iteritems():
+        if propname in compiled:
+            continue
+        prop = properties.get(propname, None)
+        if prop is None:
+            raise exc.PropertyNotKnown(
+                propname=propname,
+                recordtype=type(self),
+                typename=type(self).__name__,
+            )
+        if trusted:
+            prop._store_slot(self, value)
+        else:
+            prop.init_prop(self, value)
+
+
+def _init_added(self, init_dict, compiled):
+    """Applies the defaults of properties added since the constructor was
+    compiled."""
+    for propname, prop in type(self).properties.iteritems():
+        if propname not in compiled and propname not in init_dict and \
+                prop.eager_init():
+            prop.init_prop(self)
+
+
+def compile_init_props(properties, trusted=False):
+    """Returns a function which initializes the slots of a new record from a
+    dictionary of property values.  This does the work of
+    :py:meth:`normalize.record.Record.__init__`, but with the property list
+    unrolled into straight-line code for the type: values passed in are
+    initialized first, then any unknown keys are reported, then missing
+    required properties raise ``PropertyRequired``, and finally the missing
+    *eager* properties have their defaults applied.
+
+    If ``trusted`` is true, then the values passed in are stored directly,
+    without type checks, coercion or ``check`` functions; this is the
+    initializer used by :py:meth:`normalize.record.Record.from_trusted`.
+
+    The source is generated and compiled once per ``Record`` type, by
+    :py:meth:`RecordMeta.__new__`.  The ``required`` and ``default``
+    settings of the properties are read when the function runs, and
+    properties added to ``properties`` afterwards are initialized by the
+    slower, general code, so neither need the function to be compiled
+    again.
+    """
+    namespace = dict(
+        _none=_none,
+        _not_known=_not_known,
+        _init_added=_init_added,
+        _compiled=frozenset(properties),
+        _properties=properties,
+        PropertyRequired=exc.PropertyRequired,
+    )
+    passed = []
+    required = []
+    defaults = []
+    for i, propname in enumerate(sorted(properties)):
+        prop = properties[propname]
+        namespace["_prop%d" % i] = prop
+        namespace["_init%d" % i] = prop.init_prop
+        if prop.slot is None:
+            store = "self.__dict__[%(name)r] = %(value)s"
+        else:
+            namespace["_slot%d" % i] = prop.slot
+            store = "_slot%(i)d.__set__(self, %(value)s)"
+        if trusted:
+            store = "        " + store + "\n"
+            value = "init_dict[%r]" % propname
+        elif type(prop).init_prop.im_func in _STOCK_INIT_PROP:
+            # inline init_prop, calling the property's validator directly
+            store = (
+                "        value = _prop%(i)d.validator("
+                "init_dict[%(name)r], True)\n"
+                "        if value is not _none:\n"
+                "            " + store + "\n"
+                "        elif _prop%(i)d.required:\n"
+                "            raise PropertyRequired(prop=_prop%(i)d)\n"
+            )
+            value = "value"
+        else:
+            store = "        _init%(i)d(self, init_dict[%(name)r])\n"
+            value = None
+        passed.append(
+            ("    if %(name)r in init_dict:\n" + store +
+             "        found += 1\n") % dict(name=propname, i=i, value=value)
+        )
+        eager_init = type(prop).eager_init.im_func
+        if eager_init is LazyProperty.eager_init.im_func:
+            continue
+        elif eager_init is Property.eager_init.im_func:
+            eager = "(_prop%(i)d.required or _prop%(i)d.default is not _none)"
+        else:
+            eager = "_prop%(i)d.eager_init()"
+        if type(prop).init_prop.im_func is Property.init_prop.im_func:
+            required.append((
+                "    if %(name)r not in init_dict and _prop%(i)d.required "
+                "and _prop%(i)d.default is _none:\n"
+                "        raise PropertyRequired(prop=_prop%(i)d)\n"
+            ) % dict(name=propname, i=i))
+        defaults.append((
+            "    if %(name)r not in init_dict and " + eager + ":\n"
+            "        _init%(i)d(self)\n"
+        ) % dict(name=propname, i=i))
+
+    # required properties are checked before any defaults are computed, as
+    # a default method may refer to them
+    funcname = "_init_trusted" if trusted else "_init_props"
+    source = "".join(
+        ["def %s(self, init_dict):\n" % funcname, "    found = 0\n"] +
+        passed +
+        ["    if found != len(init_dict):\n",
+         "        _not_known(self, init_dict, _compiled, %r)\n" % trusted] +
+        required + defaults +
+        ["    if len(_properties) != %d:\n" % len(properties),
+         "        _init_added(self, init_dict, _compiled)\n"]
+    )
+    exec compile(source, "<normalize.record.meta>", "exec") in namespace
+    init_props = namespace[funcname]
+    init_props.source = source
+    return init_props
+
+
+# init_prop methods which do the same thing with a passed value
+_STOCK_INIT_PROP = frozenset((
+    Property.init_prop.im_func,
+    LazyProperty.init_prop.im_func,
+))
+
+
+def _compact_property_type(prop_type):
+    """Returns the version of a Property type which allows unchecked
+    assignment to its slot; that is, with the ``compact`` trait added."""
+    traits = tuple(sorted(set(prop_type.traits) | set(("compact",))))
+    if traits not in PROPERTY_TYPES:
+        type(
+            "Compact" + prop_type.__name__,
+            (CompactProperty, prop_type),
+            {},
+        )
+    return PROPERTY_TYPES[traits]
 
 
 class RecordMeta(type):
     """Metaclass for ``Record`` types.
+
+    Declaring ``compact = True`` in a class definition stores the values of
+    the properties declared in that class in ``__slots__`` instead of the
+    instance dictionary.  This saves memory when many small records are kept
+    around, at the expense of some attribute access speed.  The setting is
+    inherited, and there is only a saving if every ``Record`` class in the
+    hierarchy is compact; ``Record`` itself defines an empty ``__slots__``.
+    The usual ``__slots__`` restrictions apply: a class cannot derive from
+    two compact classes which both declare properties, and instances of
+    compact classes cannot be weakly referenced.
     """
     def __new__(mcs, name, bases, attrs):
         """Invoked when a new ``Record`` type is declared, and is responsible
         for copying the ``properties`` from superclass ``Record`` classes,
-        processing the ``primary_key`` declaration, and calling
+        processing the ``primary_key`` declaration, compiling the type's
+        constructor (see :py:func:`compile_init_props`), and calling
         :py:meth:`normalize.property.Property.bind` to link
         :py:class:`normalize.property.Property` instances to their containing
         :py:class:`normalize.record.Record` classes.
@@ -63,6 +226,23 @@ class RecordMeta(type):
 
         all_properties = set(properties.values())
 
+        compact = attrs.get("compact", None)
+        if compact is None or isinstance(compact, Property):
+            compact = any(
+                getattr(base, "compact", False) is True for base in bases
+            )
+        if compact:
+            slots = sorted(local_props)
+            if not any(base.__dictoffset__ for base in bases) and any(
+                prop.slot is None and propname not in local_props for
+                propname, prop in properties.iteritems()
+            ):
+                # a property shared with a non-compact class
+                slots.append("__dict__")
+            attrs['__slots__'] = tuple(slots)
+            for propname in local_props:
+                del attrs[propname]
+
         def coerce_prop_list(prop_list_field):
             proplist = attrs.get(prop_list_field, None)
             good_props = []
@@ -95,5 +275,24 @@ class RecordMeta(type):
 
         for propname, prop in local_props.iteritems():
             prop.bind(self)
+            if compact:
+                # swap the slot's member descriptor for the property
+                prop.slot = self.__dict__[propname]
+                if not hasattr(type(prop), "__set__"):
+                    prop.__class__ = _compact_property_type(type(prop))
+                setattr(self, propname, prop)
+
+        self._slot_properties = tuple(
+            prop for prop in properties.itervalues() if prop.slot is not None
+        )
+        self._init_props = staticmethod(compile_init_props(properties))
+        self._init_trusted = staticmethod(
+            compile_init_props(properties, trusted=True)
+        )
+
+        # indexes of sub-classes, for polymorphic JSON, need rebuilding
+        for base in self.__mro__[1:]:
+            if "_json_subtypes" in base.__dict__:
+                del base._json_subtypes
 
         return self
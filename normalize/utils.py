@@ -0,0 +1,50 @@
+#
+# This file is a part of the normalize python library
+#
+# normalize is free software: you can redistribute it and/or modify
+# it under the terms of the MIT License.
+#
+# normalize is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# MIT License for more details.
+#
+# You should have received a copy of the MIT license along with
+# normalize.  If not, refer to the upstream repository at
+# http://github.com/hearsaycorp/normalize
+#
+
+# sentinel for values not in a cache
+_missing = object()
+
+
+class _LruCache(object):
+    """Memoizes a function of one argument, keeping roughly the ``maxsize``
+    most recently used results.  Results are kept in two generations; when
+    the newer one fills up, the older one is dropped, and results used
+    again from it are moved to the newer one.  Lookups are counted in
+    ``hits`` and ``misses``."""
+    def __init__(self, func, maxsize=8192):
+        self.func = func
+        self.maxsize = maxsize
+        self.recent = {}
+        self.older = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __call__(self, key):
+        recent = self.recent
+        if key in recent:
+            self.hits += 1
+            return recent[key]
+        value = self.older.get(key, _missing)
+        if value is _missing:
+            self.misses += 1
+            value = self.func(key)
+        else:
+            self.hits += 1
+        if len(recent) >= self.maxsize // 2:
+            self.older = recent
+            recent = self.recent = {}
+        recent[key] = value
+        return value
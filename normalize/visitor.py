@@ -240,7 +240,7 @@ class VisitorPattern(object):
 
         if issubclass(value_type, Record):
             def propget(prop):
-                return prop.__get__(value)
+                return getattr(value, prop.name)
         else:
             propget = None
 
@@ -29,6 +29,7 @@ from normalize import Record
 from normalize import AutoJsonRecord
 from normalize import NCAutoJsonRecord
 import normalize.exc as exc
+from normalize.utils import _LruCache
 
 
 class TestAutoRecords(unittest2.TestCase):
@@ -91,3 +92,76 @@ class TestAutoRecords(unittest2.TestCase):
         self.assertEqual(my_record.krunch.eeeYow.whap, "aiee")
         self.assertEqual(my_record.ouchEth[0], "bap")
         self.assertEqual(my_record.whamEth[0].rip, "bloop")
+
+    def test_lazy_auto_json(self):
+
+        class LazyRecord(AutoJsonRecord):
+            auto_upgrade_lazily = True
+
+        json_data = {
+            "kerSploosh": "zlonk",
+            "krunch": {"crrAaack": "kapow", "eeeYow": {"whap": "aiee"}},
+            "ouchEth": ["bap", "bonk"],
+            "whamEth": [{"ripRip": "bloop"}],
+        }
+        my_record = LazyRecord(json_data)
+        self.assertIsInstance(my_record.unknown_json_keys["krunch"], dict)
+        self.assertEqual(my_record.ker_sploosh, "zlonk")
+        self.assertIsInstance(my_record.krunch, LazyRecord)
+        self.assertIs(my_record.krunch, my_record.krunch)
+        self.assertIsInstance(my_record.unknown_json_keys["krunch"], dict)
+        self.assertIsInstance(
+            my_record.krunch.unknown_json_keys["eee_yow"], dict,
+        )
+        self.assertEqual(my_record.krunch.eee_yow.whap, "aiee")
+        self.assertEqual(my_record.ouch_eth[0], "bap")
+        self.assertEqual(my_record.wham_eth[0].rip_rip, "bloop")
+        self.assertEqual(my_record.json_data(), json_data)
+        self.assertEqual(LazyRecord(json_data).json_data(), json_data)
+
+        # reading attributes does not change the record's value or output
+        snake_data = {"outer": {"snake_key": 1}, "items": [{"two_x": 2}]}
+        eager_out = AutoJsonRecord(snake_data).json_data()
+        self.assertEqual(eager_out,
+                         {"outer": {"snakeKey": 1}, "items": [{"twoX": 2}]})
+        lazy = LazyRecord(snake_data)
+        self.assertEqual(lazy.json_data(), eager_out)
+        self.assertEqual(lazy.outer.snake_key, 1)
+        self.assertEqual(lazy.items[0].two_x, 2)
+        self.assertEqual(lazy.json_data(), eager_out)
+        self.assertEqual(lazy, LazyRecord(snake_data))
+        self.assertNotIn("_auto_upgrades", lazy.__getstate__())
+
+        # the upgraded value follows changes to unknown_json_keys
+        lazy.unknown_json_keys["outer"] = {"snake_key": 3}
+        self.assertEqual(lazy.outer.snake_key, 3)
+
+        # changes to upgraded values are seen by comparisons
+        lazy = LazyRecord(snake_data)
+        lazy.items.append(LazyRecord({"three_x": 3}))
+        self.assertEqual(len(lazy.json_data()["items"]), 2)
+        self.assertNotEqual(lazy, LazyRecord(snake_data))
+        self.assertTrue(lazy.diff(LazyRecord(snake_data)))
+        self.assertEqual(LazyRecord(snake_data), LazyRecord(snake_data))
+        self.assertFalse(LazyRecord(snake_data).diff(LazyRecord(snake_data)))
+
+    def test_json_key_conversion(self):
+        self.assertEqual(
+            AutoJsonRecord.convert_json_key_in("eeeYowWhap"), "eee_yow_whap",
+        )
+        self.assertEqual(
+            AutoJsonRecord.convert_json_key_out("eee_yow_whap"), "eeeYowWhap",
+        )
+
+        calls = []
+
+        def convert(key):
+            calls.append(key)
+            return key.upper()
+
+        cache = _LruCache(convert, maxsize=4)
+        for key in "abacdaeaf":
+            self.assertEqual(cache(key), key.upper())
+        # "a" is used often enough to stay cached
+        self.assertEqual(calls, list("abcdef"))
+        self.assertLessEqual(len(cache.recent) + len(cache.older), 4)
@@ -211,6 +211,32 @@ class TestCollections(unittest2.TestCase):
         ):
             loi.append("foo")
 
+    def test_from_many(self):
+        class Row(Record):
+            id = Property(isa=int, required=True)
+            name = Property(isa=str, default="anon")
+
+        rows = Row.from_many([{"id": 1}, Row(id=2), {"id": 3, "name": "c"}])
+        self.assertEqual([r.id for r in rows], [1, 2, 3])
+        self.assertEqual(rows[0].name, "anon")
+
+        RowList = list_of(Row)
+        row_list = RowList.from_many(({"id": i} for i in range(3)))
+        self.assertIsInstance(row_list, RowList)
+        self.assertEqual(row_list, RowList([{"id": 0}, {"id": 1}, {"id": 2}]))
+
+        with self.assertRaises(exc.BatchConversionError) as ar:
+            RowList.from_many([{"id": 1}, {"id": 2}, {"name": "c"}])
+        self.assertEqual(ar.exception.error_fs.path, "[2]")
+        self.assertIsInstance(ar.exception.sub_exception,
+                              exc.PropertyRequired)
+
+        with self.assertRaisesRegexp(
+            exc.BatchConversionError, r"at \[1\]; coerce to int",
+        ):
+            list_of(int).from_many(["1", "one"])
+        self.assertEqual(list_of(int).from_many(["1", 2]), [1, 2])
+
     def test_dict_of(self):
         dos = dict_of(str)({"foo": "bar"})
         self.assertEqual(repr(dos), "strMap({'foo': 'bar'})")
@@ -16,10 +16,15 @@
 
 from __future__ import absolute_import
 
+import collections
+import pickle
 import unittest
 
 from normalize.coll import Collection
+import normalize.exc as exc
 from normalize.diff import *
+from normalize.diff import _nothing
+from normalize.diff import _parallel_min_pairs
 from normalize.record import Record
 from normalize.record.json import JsonRecord
 from normalize.property import Property
@@ -29,6 +34,28 @@ from normalize.property.json import JsonListProperty
 from testclasses import *
 
 
+class Reading(Record):
+    sensor = Property(isa=int)
+    value = Property(isa=int)
+    primary_key = [sensor]
+
+
+class ReadingList(RecordList):
+    itemtype = Reading
+
+
+class StripPrefixOptions(DiffOptions):
+    """Options with normalization state which ``digest_key`` can't see"""
+    def __init__(self, prefix, **kwargs):
+        super(StripPrefixOptions, self).__init__(**kwargs)
+        self.prefix = prefix
+
+    def normalize_slot(self, value=_nothing, prop=None):
+        if isinstance(value, basestring) and value.startswith(self.prefix):
+            value = value[len(self.prefix):]
+        return super(StripPrefixOptions, self).normalize_slot(value, prop)
+
+
 class TestRecordComparison(unittest.TestCase):
     def setUp(self):
         self.minimal = LegalPerson(id=7)
@@ -645,3 +672,370 @@ class TestRecordComparison(unittest.TestCase):
             ignore_empty_slots=True,
         )
         self.assertEqual(len(diffs), 1)
+
+    def test_diff_digest(self):
+        """Test skipping unchanged records using cached digests"""
+        def pleiades():
+            return StarSystem(
+                name="Pleiades",
+                components=[
+                    dict(hip_id=17573, name="maia",
+                         designations={"common": "Maia"}),
+                    dict(hip_id=17702, name="alcyone"),
+                ],
+            )
+
+        one, two = pleiades(), pleiades()
+        self.assertIsNotNone(diff_digest(one))
+        self.assertEqual(diff_digest(one), diff_digest(two))
+        self.assertEqual(len(one.diff(two)), 0)
+        self.assertIn("_diff_digest", one.components[0].__dict__)
+        self.assertDifferences(
+            one.diff_iter(two, unchanged=True),
+            {"UNCHANGED .name", "UNCHANGED .components[0]",
+             "UNCHANGED .components[1]", "UNCHANGED .components[0].name",
+             "UNCHANGED .components[0].hip_id",
+             "UNCHANGED .components[0].designations.common",
+             "UNCHANGED .components[1].name",
+             "UNCHANGED .components[1].hip_id"},
+        )
+
+        # digests are of the values as normalized for comparison
+        two.components[0].designations["common"] = " Maia "
+        self.assertEqual(diff_digest(one), diff_digest(two))
+        strict = DiffOptions(ignore_ws=False)
+        self.assertNotEqual(
+            diff_digest(one, strict), diff_digest(two, strict),
+        )
+        self.assertDifferences(
+            diff_iter(one, two, options=strict),
+            {"MODIFIED .components[0].designations.common"},
+        )
+
+        # checked assignments and collection mutators invalidate them
+        two.components[1].name = "Alcyone"
+        self.assertDifferences(
+            one.diff_iter(two), {"MODIFIED .components[1].name"},
+        )
+        two.components.append(Star(hip_id=17608, name="merope"))
+        self.assertDifferences(
+            one.diff_iter(two),
+            {"MODIFIED .components[1].name", "ADDED .components[2]"},
+        )
+        del two.components[2]
+        two.components[1].name = "alcyone"
+        self.assertEqual(diff_digest(one), diff_digest(two))
+
+        # values which can change without notice are not digested
+        self.assertIsNone(diff_digest(NamedStarList(name="M45")))
+        self.assertIsNone(diff_digest(Person(id=1, interests=["stars"])))
+        self.assertIsNone(diff_digest(one, DiffOptions(duck_type=True)))
+
+        self.assertNotIn(
+            "_diff_digest", pickle.loads(pickle.dumps(one)).__dict__,
+        )
+
+        # sub-classes with their own normalization state are not digested,
+        # unless they say how to key it
+        class KeyedStripPrefix(StripPrefixOptions):
+            def digest_key(self):
+                key = super(KeyedStripPrefix, self).digest_key()
+                return key and key + (self.prefix,)
+
+        one, two = pleiades(), pleiades()
+        two.components[0].name = "X-maia"
+        for options_type in StripPrefixOptions, KeyedStripPrefix:
+            self.assertDifferences(
+                diff_iter(one, two, options=options_type("X-")), set(),
+            )
+            self.assertDifferences(
+                diff_iter(one, two, options=options_type("Y-")),
+                {"MODIFIED .components[0].name"},
+            )
+        self.assertIsNone(StripPrefixOptions("X-").digest_key())
+        self.assertNotEqual(
+            KeyedStripPrefix("X-").digest_key(),
+            KeyedStripPrefix("Y-").digest_key(),
+        )
+
+    def test_diff_summary(self):
+        """Test counting differences without building DiffInfo objects"""
+        self.assertFalse(records_differ(self.bob1, self.bob1a))
+        self.assertTrue(records_differ(self.bob1, self.bill))
+        self.assertFalse(records_differ(
+            self.bob1, self.bob1a, options=DiffOptions(unchanged=True),
+        ))
+        self.assertEqual(
+            diff_summary(self.bob1, self.bill),
+            {(DiffTypes.MODIFIED, "name"): 1, (DiffTypes.MODIFIED, "age"): 1},
+        )
+
+        one = StarList([dict(hip_id=17573, name="maia"),
+                        dict(hip_id=17702, name="alcyone")])
+        two = StarList([dict(hip_id=17573, name="Maia"),
+                        dict(hip_id=17608, name="merope")])
+        self.assertTrue(records_differ(one, two))
+        summary = diff_summary(one, two)
+        expected = collections.Counter()
+        for diff in diff_iter(one, two):
+            selector = (
+                diff.other if diff.diff_type == DiffTypes.ADDED else diff.base
+            )
+            expected[diff.diff_type, selector[0]] += 1
+        self.assertEqual(summary, expected)
+        self.assertEqual(summary[DiffTypes.MODIFIED, 0], 1)
+        self.assertEqual(summary[DiffTypes.ADDED, 1], 1)
+        self.assertEqual(summary[DiffTypes.REMOVED, 1], 1)
+        self.assertEqual(
+            diff_summary(StarList(), StarList([dict(hip_id=17573)])),
+            {(DiffTypes.ADDED, 0): 1},
+        )
+        with self.assertRaises(exc.DiffOptionsException):
+            records_differ(one, two, options=DiffOptions(), moved=True)
+
+    def test_diff_info_fast_path(self):
+        """Test that DiffInfo objects built by the diff functions are the same
+        as ones built by the constructor"""
+        diffs = list(diff_iter(self.bob1, self.bill))
+        expected = [
+            DiffInfo(diff_type=DiffTypes.MODIFIED,
+                     base=FieldSelector(["age"]),
+                     other=FieldSelector(["age"])),
+            DiffInfo(diff_type="modified",
+                     base=FieldSelector(["name"]),
+                     other=FieldSelector(["name"])),
+        ]
+        self.assertEqual(diffs, expected)
+        for diff in diffs:
+            self.assertIs(type(diff), DiffInfo)
+            self.assertIs(type(diff.base), FieldSelector)
+            self.assertIs(type(diff.other), FieldSelector)
+
+        one = StarList([dict(hip_id=17573, name="maia")])
+        two = StarList([dict(hip_id=17573, name="Maia")])
+        diff = list(diff_iter(one, two))[0]
+        self.assertEqual(diff.base, FieldSelector([0, "name"]))
+        self.assertEqual(diff.base.path, "[0].name")
+
+        DiffInfo.validate_trusted = True
+        try:
+            self.assertEqual(list(diff_iter(self.bob1, self.bill)), expected)
+        finally:
+            del DiffInfo.validate_trusted
+
+    def test_diff_sorted_iter(self):
+        """Test merge-join diffs of sorted streams of records"""
+        class Row(Record):
+            id = Property(isa=int)
+            name = Property(isa=str)
+            primary_key = [id]
+
+        class RowList(RecordList):
+            itemtype = Row
+
+        rows_a = [dict(id=1, name="one"), dict(id=2, name="two"),
+                  dict(id=4, name="four"), dict(id=5, name="five")]
+        rows_b = [dict(id=0, name="zero"), dict(id=2, name="deux"),
+                  dict(id=3, name="three"), dict(id=4, name="four"),
+                  dict(id=6, name="six")]
+
+        def streamed(**kwargs):
+            return set(str(x) for x in diff_sorted_iter(
+                iter(rows_a), (Row(x) for x in rows_b), Row, **kwargs
+            ))
+
+        for kwargs in ({}, {"unchanged": True}, {"moved": True}):
+            self.assertEqual(
+                streamed(**kwargs),
+                set(str(x) for x in diff_iter(
+                    RowList(rows_a), RowList(rows_b), fuzzy_match=False,
+                    **kwargs
+                )),
+            )
+        self.assertEqual(
+            streamed(),
+            {"<DiffInfo: REMOVED [0]>", "<DiffInfo: ADDED [0]>",
+             "<DiffInfo: MODIFIED [1].name>",
+             "<DiffInfo: ADDED [2]>", "<DiffInfo: REMOVED [3]>",
+             "<DiffInfo: ADDED [4]>"},
+        )
+
+        with self.assertRaises(exc.DiffStreamNotSorted):
+            list(diff_sorted_iter(reversed(rows_a), rows_b, Row))
+
+    def test_diff_workers(self):
+        """Test comparing the members of large collections in parallel"""
+        count = _parallel_min_pairs + 200
+        one = ReadingList(
+            Reading(sensor=i, value=i) for i in range(count)
+        )
+        two = ReadingList(
+            Reading(sensor=i, value=i + (i % 3 == 0)) for i in range(5, count)
+        )
+        two.append(Reading(sensor=count, value=0))
+
+        serial = list(diff_iter(one, two))
+        parallel = list(diff_iter(one, two, workers=2))
+        self.assertEqual(len(parallel), len(serial))
+        self.assertEqual(
+            sorted(str(x) for x in parallel), sorted(str(x) for x in serial),
+        )
+        self.assertEqual(list(diff_iter(one, two, workers=2)), parallel)
+        modified = [x for x in parallel if x.diff_type == DiffTypes.MODIFIED]
+        self.assertEqual(modified, sorted(modified, key=lambda x: x.base))
+        self.assertIs(type(modified[0].base), FieldSelector)
+        self.assertEqual(
+            diff_summary(one, two, workers=2), diff_summary(one, two),
+        )
+
+        options = DiffOptions(
+            workers=2, compare_filter=MultiFieldSelector([None, "value"]),
+        )
+        thawed = pickle.loads(pickle.dumps(options))
+        self.assertEqual(thawed.workers, 2)
+        self.assertEqual(
+            list(diff_iter(one, two, options=thawed)),
+            list(diff_iter(one, two, options=options)),
+        )
+
+        # types which can't be pickled are compared in this process
+        class LocalReading(Reading):
+            pass
+
+        local_one = ReadingList(
+            LocalReading(sensor=x.sensor, value=x.value) for x in one
+        )
+        local_two = ReadingList(
+            LocalReading(sensor=x.sensor, value=x.value) for x in two
+        )
+        self.assertEqual(
+            len(list(diff_iter(local_one, local_two, workers=2))),
+            len(serial),
+        )
+
+    def test_diff_plan(self):
+        """Test the per-type plan used by compare_record_iter"""
+        class Probe(Record):
+            name = Property(isa=str, compare_as=lambda x: x.lower())
+            mass = Property(isa=int)
+            note = Property(isa=str, extraneous=True)
+
+        one = Probe(name="Voyager", mass=722, note="first")
+        two = Probe(name="VOYAGER", mass=825, note="second")
+        self.assertDifferences(compare_record_iter(one, two),
+                               {"MODIFIED .mass"})
+        self.assertEqual(
+            [x[0] for x in Probe.__dict__["_diff_plans"][False]],
+            ["mass", "name"],
+        )
+        self.assertDifferences(
+            compare_record_iter(one, two, options=DiffOptions(
+                extraneous=True,
+            )),
+            {"MODIFIED .mass", "MODIFIED .note"},
+        )
+
+        class NotesOptions(DiffOptions):
+            def is_filtered(self, prop, fs):
+                return fs.path == ".mass"
+
+        class ShoutOptions(DiffOptions):
+            def normalize_object_slot(self, value=_nothing, prop=None,
+                                      obj=None):
+                if isinstance(value, str):
+                    return value.upper()
+                return value
+
+        self.assertDifferences(
+            compare_record_iter(one, two, options=NotesOptions()),
+            {"MODIFIED .note"},
+        )
+        self.assertDifferences(
+            compare_record_iter(one, two, options=ShoutOptions()),
+            {"MODIFIED .mass"},
+        )
+        two.name = "Pioneer"
+        self.assertDifferences(
+            compare_record_iter(one, two, options=ShoutOptions()),
+            {"MODIFIED .mass", "MODIFIED .name"},
+        )
+
+    def test_normalize_memo(self):
+        calls = []
+
+        class CountingOptions(DiffOptions):
+            def normalize_text(self, value):
+                calls.append(value)
+                return super(CountingOptions, self).normalize_text(value)
+
+        options = CountingOptions(ignore_ws=True, normalize_memo=10)
+        self.assertEqual(options.normalize_val(" a  b "), "a b")
+        self.assertEqual(options.normalize_val(" a  b "), "a b")
+        self.assertEqual(options.normalize_val(u" a  b "), u"a b")
+        self.assertIsInstance(options.normalize_val(u" a  b "), unicode)
+        self.assertEqual(calls, [" a  b ", u" a  b "])
+        info = options.normalize_memo_info()
+        self.assertEqual((info.hits, info.misses), (2, 2))
+        self.assertEqual((info.maxsize, info.size), (10, 2))
+
+        self.assertIsNone(DiffOptions().normalize_memo_info())
+
+        # the memo is re-created, empty, when options are copied or pickled
+        options = DiffOptions(ignore_ws=True, normalize_memo=10)
+        options.normalize_val(" x ")
+        clone = pickle.loads(pickle.dumps(options))
+        self.assertEqual(clone.normalize_memo_info(), (0, 0, 10, 0))
+        self.assertEqual(clone.normalize_val(" x "), "x")
+
+        # ... and when the options it depends on are changed
+        options = DiffOptions(normalize_memo=10)
+        self.assertEqual(options.normalize_val("Abc"), "Abc")
+        options.ignore_case = True
+        self.assertEqual(options.normalize_val("Abc"), "ABC")
+        self.assertEqual(options.normalize_memo_info(), (0, 1, 10, 1))
+
+        one = Star(hip_id=1, name="Sol ", spectral_type="G2V")
+        two = Star(hip_id=1, name="Sol", spectral_type="G2 V")
+        self.assertDifferences(
+            compare_record_iter(
+                one, two, options=DiffOptions(
+                    ignore_ws=False, normalize_memo=100,
+                ),
+            ),
+            {"MODIFIED .name", "MODIFIED .spectral_type"},
+        )
+        self.assertDifferences(
+            compare_record_iter(
+                one, two, options=DiffOptions(
+                    ignore_ws=True, normalize_memo=100,
+                ),
+            ),
+            {"MODIFIED .spectral_type"},
+        )
+
+    def test_record_id_options_state(self):
+        """Test that cached record ids are not shared between options which
+        normalize differently"""
+        class Satellite(Record):
+            name = Property(isa=str)
+            primary_key = [name]
+
+        class SatelliteList(RecordList):
+            itemtype = Satellite
+
+        one = SatelliteList([Satellite(name="X-io")])
+        two = SatelliteList([Satellite(name="io")])
+        kwargs = dict(unchanged=True, fuzzy_match=False)
+        self.assertDifferences(
+            compare_collection_iter(
+                one, two, options=StripPrefixOptions("X-", **kwargs),
+            ),
+            {"UNCHANGED [0]", "UNCHANGED [0].name"},
+        )
+        self.assertDifferences(
+            compare_collection_iter(
+                one, two, options=StripPrefixOptions("Y-", **kwargs),
+            ),
+            {"REMOVED [0]", "ADDED [0]"},
+        )
+        self.assertNotIn("_record_ids", one[0].__dict__)
@@ -16,25 +16,39 @@
 
 from __future__ import absolute_import
 
+import copy
+from datetime import datetime
 import json
+import multiprocessing
 from os import environ
 import pickle
 import re
+from StringIO import StringIO
 import unittest2
 
 from richenum import RichEnum
 from richenum import RichEnumValue
 
+from normalize.coll import list_of
 import normalize.exc as exc
 from normalize.record import Record
+from normalize.record.json import dump
 from normalize.record.json import from_json
+from normalize.record.json import from_json_parallel
+from normalize.record.json import from_ndjson
+from normalize.record.json import iterencode
+from normalize.record.json import iterload
 from normalize.record.json import JsonRecord
 from normalize.record.json import JsonRecordDict
 from normalize.record.json import JsonRecordList
+from normalize.record.json import LazyJsonRecord
 from normalize.record.json import to_json
+from normalize.record.json import to_ndjson
+from normalize.property import LazyProperty
 from normalize.property import Property
 from normalize.property import ROProperty
 from normalize.property import SafeProperty
+from normalize.property import V1Property
 from normalize.property.coll import DictProperty
 from normalize.property.coll import ListProperty
 from normalize.property.json import JsonProperty
@@ -55,6 +69,44 @@ class CheeseCupboardRecord(Record):
     favorites = DictProperty(of=CheeseRecord)
 
 
+class CheeseList(JsonRecordList):
+    itemtype = CheeseRecord
+
+
+class LazyCheeseRecord(JsonRecord):
+    variety = Property(isa=str)
+    unknown_json_keys_policy = "lazy"
+
+
+class LazyCheeseList(JsonRecordList):
+    itemtype = LazyCheeseRecord
+
+
+def _not_fussy_in_worker(variety):
+    """Fails "fussy" cheeses in ``multiprocessing`` workers only"""
+    return variety != "fussy" or (
+        multiprocessing.current_process().name == "MainProcess"
+    )
+
+
+class FussyCheeseRecord(Record):
+    variety = SafeProperty(isa=str, check=_not_fussy_in_worker)
+
+
+class FussyCheeseList(JsonRecordList):
+    itemtype = FussyCheeseRecord
+
+
+def _fussy_json_out(variety):
+    if not _not_fussy_in_worker(variety):
+        raise ValueError("won't encode %r here" % variety)
+    return variety
+
+
+class FussyOutCheeseRecord(JsonRecord):
+    variety = JsonProperty(isa=str, json_out=_fussy_json_out)
+
+
 json_data_number_types = (basestring, int, long, float)
 
 
@@ -479,6 +531,630 @@ class TestRecordMarshaling(unittest2.TestCase):
                 e.sub_exception.passed, {"foo": "bar"},
             )
 
+    def test_json_decode_plan(self):
+        class Leaf(JsonRecord):
+            name = Property(isa=str)
+
+        class Branch(JsonRecord):
+            leaf = Property(isa=Leaf)
+            leaves = JsonListProperty(of=Leaf)
+            size = Property(json_name="Size", json_in=int)
+
+        json_data = {"leaf": {"name": "a", "x": 1}, "Size": "3",
+                     "leaves": [{"name": "b"}], "colour": "brown"}
+        branch = Branch(json_data)
+        self.assertEqual(branch.leaf.unknown_json_keys, {"x": 1})
+        self.assertEqual(branch.leaves[0].name, "b")
+        self.assertEqual(branch.size, 3)
+        self.assertEqual(branch.unknown_json_keys, {"colour": "brown"})
+        self.assertIn("_json_decode_plan", Branch.__dict__)
+        self.assertIn("_json_decoder", Leaf.__dict__)
+
+        class Twig(Branch):
+            length = Property(isa=int)
+
+        twig = Twig(json_data, length=1)
+        self.assertEqual(twig.size, 3)
+        self.assertEqual(twig.length, 1)
+        self.assertEqual(twig.unknown_json_keys, {"colour": "brown"})
+
+        class CustomLeaf(Leaf):
+            @classmethod
+            def from_json(cls, json_data):
+                return cls(name=json_data)
+
+        class Hedge(JsonRecord):
+            leaf = Property(isa=CustomLeaf)
+
+        self.assertEqual(Hedge({"leaf": "c"}).leaf.name, "c")
+        with self.assertRaisesRegexp(exc.JsonConversionError, r"\.leaf\b"):
+            Branch({"leaf": ["not", "a", "leaf"]})
+
+    def test_unknown_json_keys_policy(self):
+        class Leaf(JsonRecord):
+            name = Property(isa=str)
+
+        def leaf_data():
+            return {"name": "a", "veins": {"count": 3}, "tags": ["green"],
+                    "size": 2}
+
+        json_data = leaf_data()
+        leaf = Leaf(json_data)
+        self.assertIsNot(leaf.unknown_json_keys["veins"], json_data["veins"])
+
+        class SharedLeaf(Leaf):
+            unknown_json_keys_policy = "share"
+
+        leaf = SharedLeaf(json_data)
+        self.assertIs(leaf.unknown_json_keys["veins"], json_data["veins"])
+        self.assertEqual(leaf.json_data(extraneous=True), json_data)
+
+        class DroppedLeaf(Leaf):
+            unknown_json_keys_policy = "drop"
+
+        leaf = DroppedLeaf(json_data)
+        self.assertFalse(hasattr(leaf, "unknown_json_keys"))
+        self.assertEqual(leaf.json_data(extraneous=True), {"name": "a"})
+
+        class LazyLeaf(Leaf):
+            unknown_json_keys_policy = "lazy"
+
+        leaf = LazyLeaf(json_data)
+        self.assertEqual(leaf.json_data(extraneous=True), json_data)
+        self.assertEqual(json.loads("".join(iterencode(leaf, True))),
+                         json_data)
+        self.assertIs(dict.__getitem__(leaf.unknown_json_keys, "veins"),
+                      json_data["veins"])
+        veins = leaf.unknown_json_keys["veins"]
+        self.assertIsNot(veins, json_data["veins"])
+        veins["count"] = 4
+        self.assertEqual(json_data, leaf_data())
+        self.assertIs(leaf.unknown_json_keys["veins"], veins)
+        tags = dict(leaf.unknown_json_keys.items())["tags"]
+        self.assertIsNot(tags, json_data["tags"])
+        self.assertEqual(leaf.unknown_json_keys,
+                         {"veins": {"count": 4}, "tags": ["green"], "size": 2})
+        # copies take copies of the values; dict() does not
+        leaf = LazyLeaf(json_data)
+        for clone in (copy.copy(leaf.unknown_json_keys),
+                      leaf.unknown_json_keys.copy()):
+            clone["veins"]["count"] += 1
+            self.assertEqual(json_data, leaf_data())
+        leaf = LazyLeaf(json_data)
+        self.assertIs(dict(leaf.unknown_json_keys)["veins"],
+                      json_data["veins"])
+        leaf = LazyLeaf(json_data)
+        leaf.unknown_json_keys["veins"]["count"] = 4
+        del leaf.unknown_json_keys["size"]
+        self.assertEqual(leaf.json_data(extraneous=True),
+                         {"name": "a", "veins": {"count": 4},
+                          "tags": ["green"]})
+
+        # pickles as a plain copy of the current values
+        cheese = LazyCheeseRecord(
+            {"variety": "Brie", "rind": {"edible": True}, "age": 6},
+        )
+        cheese.unknown_json_keys["rind"]["edible"] = False
+        for protocol in 0, 1, 2:
+            clone = pickle.loads(pickle.dumps(cheese, protocol))
+            self.assertEqual(clone, cheese)
+            self.assertEqual(clone.unknown_json_keys,
+                             {"rind": {"edible": False}, "age": 6})
+            clone.unknown_json_keys["age"] = 7
+            self.assertEqual(cheese.unknown_json_keys["age"], 6)
+        cheeses = [{"variety": "Brie %d" % i, "rind": ["white"]}
+                   for i in range(10)]
+        self.assertEqual(
+            from_json_parallel(LazyCheeseList, cheeses, 2, chunk_size=3),
+            LazyCheeseList(cheeses),
+        )
+
+        class BadLeaf(Leaf):
+            unknown_json_keys_policy = "keep"
+
+        with self.assertRaises(exc.UnknownJsonKeysPolicyError):
+            BadLeaf(json_data)
+
+    def test_lazy_json_record(self):
+        class Bud(JsonRecord):
+            name = Property(isa=str)
+            size = Property(isa=int, check=lambda x: x > 0)
+
+        class Tree(LazyJsonRecord):
+            name = Property(isa=str)
+            top = Property(isa=Bud)
+            leaves = JsonListProperty(of=Bud)
+            root = Property(isa=Bud, required=True)
+
+        json_data = {
+            "name": "oak",
+            "top": {"name": "a", "size": 1},
+            "leaves": [{"name": "b", "size": 2}, {"name": "c", "size": -1}],
+            "root": {"name": "r"},
+        }
+        tree = Tree(json_data)
+        self.assertEqual(tree.name, "oak")
+        self.assertIsInstance(tree.root, Bud)
+        self.assertEqual(sorted(tree.deferred_json), ["leaves", "top"])
+        self.assertNotIn("top", tree.__dict__)
+
+        # untouched values are passed through
+        self.assertIs(to_json(tree)["leaves"], json_data["leaves"])
+        self.assertEqual(tree.json_data(), json_data)
+        self.assertEqual(json.loads("".join(iterencode(tree))), json_data)
+
+        self.assertIsInstance(tree.top, Bud)
+        self.assertEqual(tree.top.size, 1)
+        self.assertEqual(tree.deferred_json.keys(), ["leaves"])
+        self.assertEqual(to_json(tree), json_data)
+
+        with self.assertRaisesRegexp(
+            exc.JsonConversionError, r"\.leaves\[1\]",
+        ):
+            tree.leaves
+        self.assertEqual(tree.deferred_json.keys(), ["leaves"])
+        json_data["leaves"].pop()
+        self.assertEqual(len(tree.leaves), 1)
+        self.assertEqual(tree.deferred_json, {})
+        with self.assertRaises(AttributeError):
+            Tree({"root": {}}).top
+
+        self.assertFalse(Tree(json_data).diff(Tree(json_data)))
+        self.assertEqual(Tree(json_data), tree)
+
+        # assigned values replace the JSON ones
+        tree = Tree(json_data)
+        tree.top = Bud(name="d", size=4)
+        expected = dict(json_data, top={"name": "d", "size": 4})
+        self.assertEqual(tree.json_data(), expected)
+        self.assertEqual(json.loads("".join(iterencode(tree))), expected)
+        self.assertEqual(tree.deferred_json.keys(), ["leaves"])
+
+        # copies decode their own values
+        tree = Tree(json_data)
+        clone = copy.copy(tree)
+        self.assertEqual(clone.top.name, "a")
+        self.assertEqual(tree.top.name, "a")
+        self.assertIsNot(clone.top, tree.top)
+
+        # deleting a value not decoded yet discards it
+        tree = Tree(json_data)
+        del tree.top
+        with self.assertRaises(AttributeError):
+            tree.top
+        self.assertNotIn("top", tree.json_data())
+
+    def test_polymorphic_json(self):
+        class Animal(JsonRecord):
+            json_discriminator = "kind"
+            kind = Property(isa=str)
+            name = Property(isa=str)
+
+        class Cat(Animal):
+            json_discriminator_value = "cat"
+            lives = Property(isa=int)
+
+        class Dog(Animal):
+            json_discriminator_value = "dog"
+            tricks = JsonListProperty(of=str)
+
+        class Puppy(Dog):
+            pass
+
+        class Zoo(JsonRecord):
+            animals = JsonListProperty(of=Animal)
+            keepers = JsonDictProperty(of=Animal)
+            star = Property(isa=Dog)
+
+        zoo = Zoo({
+            "animals": [
+                {"kind": "cat", "name": "Tom", "lives": 9},
+                {"kind": "dog", "name": "Rex", "tricks": ["sit"]},
+                {"name": "Generic"},
+                {"kind": "Puppy", "name": "Bit"},
+            ],
+            "keepers": {"fred": {"kind": "cat", "name": "Ginger"}},
+            "star": {"kind": "Puppy", "name": "Lassie"},
+        })
+        self.assertEqual(
+            list(type(x) for x in zoo.animals), [Cat, Dog, Animal, Puppy],
+        )
+        self.assertEqual(zoo.animals[0].lives, 9)
+        self.assertEqual(zoo.animals[1].tricks, ["sit"])
+        self.assertIsInstance(zoo.keepers["fred"], Cat)
+        self.assertIsInstance(zoo.star, Puppy)
+        self.assertEqual(to_json(zoo.animals[0]),
+                         {"kind": "cat", "name": "Tom", "lives": 9})
+
+        self.assertIsInstance(from_json(Animal, '{"kind": "dog"}'), Dog)
+        self.assertIsInstance(Animal.from_json({"kind": "cat"}), Cat)
+        self.assertIsInstance(
+            from_json(Animal, {"kind": "cat"}, trusted=True), Cat,
+        )
+        self.assertIs(type(Animal({"kind": "cat"})), Animal)
+        with self.assertRaisesRegexp(exc.JsonConversionError,
+                                     r"\.animals\[0\].*'cow'"):
+            Zoo({"animals": [{"kind": "cow"}]})
+
+        class Bird(Animal):
+            json_discriminator_value = "bird"
+
+        self.assertIsInstance(from_json(Animal, {"kind": "bird"}), Bird)
+
+        class Shape(JsonRecord):
+            json_duck_typing = True
+            colour = Property(isa=str)
+
+        class Circle(Shape):
+            radius = Property(isa=float)
+
+        class Rectangle(Shape):
+            width = Property(isa=float, required=True)
+            height = Property(isa=float)
+
+        class Square(Shape):
+            width = Property(isa=float)
+
+        class Drawing(JsonRecord):
+            shapes = JsonListProperty(of=Shape)
+
+        drawing = Drawing({"shapes": [
+            {"colour": "red", "radius": 1.0},
+            {"width": 1.0, "height": 2.0},
+            {"width": 1.0},
+            {"colour": "blue"},
+            {"colour": "blue", "edges": 3},
+        ]})
+        self.assertEqual(
+            list(type(x) for x in drawing.shapes),
+            [Circle, Rectangle, Square, Shape, Shape],
+        )
+        self.assertEqual(drawing.shapes[4].unknown_json_keys, {"edges": 3})
+        self.assertEqual(len(Shape._json_subtypes[4]), 4)
+
+    def test_json_encoder(self):
+        class Shouty(JsonProperty):
+            __trait__ = "shouty"
+
+            def to_json(self, propval, extraneous=False, to_json_func=None):
+                return propval.upper()
+
+        class Inner(JsonRecord):
+            tag = Property()
+
+        class Outer(JsonRecord):
+            num = Property(isa=long)
+            when = Property(json_out=lambda x: "T%d" % x)
+            loud = Shouty()
+            hidden = Property(json_name=None)
+            cached = Property(extraneous=True)
+            maybe = V1Property(isa=str)
+            double = LazyProperty(default=lambda self: self.num * 2)
+            inner = Property(isa=Inner)
+
+        outer = Outer({"num": 2 ** 60, "when": 5, "loud": "hi",
+                       "hidden": 1, "cached": [1], "inner": {"tag": "x"},
+                       "other": {"key": 1}})
+        self.assertEqual(outer.json_data(), {
+            "num": str(2 ** 60), "when": "T5", "loud": "HI",
+            "inner": {"tag": "x"}, "double": str(2 ** 61),
+        })
+        self.assertEqual(outer.json_data(extraneous=True), {
+            "num": str(2 ** 60), "when": "T5", "loud": "HI", "cached": [1],
+            "inner": {"tag": "x"}, "double": str(2 ** 61),
+            "other": {"key": 1}, "hidden": 1,
+        })
+        self.assertIn(False, Outer.__dict__["_json_encoders"])
+        self.assertEqual(to_json(Outer(num=1), extraneous=True),
+                         {"num": 1, "double": 2})
+
+    def test_iterencode(self):
+        class Inner(JsonRecord):
+            tag = Property()
+            when = Property(json_out=lambda x: "T%d" % x)
+
+        class InnerList(JsonRecordList):
+            itemtype = Inner
+
+        class Outer(JsonRecord):
+            num = Property(isa=long)
+            inners = JsonListProperty(of=Inner, json_name="innerList")
+            by_name = JsonDictProperty(of=Inner)
+            cached = Property(extraneous=True)
+
+        json_data = {
+            "num": str(2 ** 60),
+            "innerList": [{"tag": "a", "when": 1}, {"tag": "b", "x": [1]}],
+            "by_name": {"c": {"tag": u"\u00e7"}},
+            "cached": {"some": "stuff"},
+            "other": [1, 2],
+        }
+        outer = Outer(json_data)
+        outer.inners[0].when = 2
+        for extraneous in False, True:
+            expected = outer.json_data(extraneous=extraneous)
+            self.assertEqual(
+                json.loads("".join(iterencode(outer, extraneous))),
+                expected,
+            )
+        buf = StringIO()
+        dump(outer.inners, buf, separators=(",", ":"))
+        self.assertNotIn(" ", buf.getvalue())
+        self.assertEqual(
+            json.loads(buf.getvalue()),
+            [{"tag": "a", "when": "T2"}, {"tag": "b"}],
+        )
+        self.assertEqual("".join(iterencode(2 ** 60)), str(2 ** 60))
+
+        # members are written out as they are visited
+        inners = InnerList([{"tag": "ok", "when": 1},
+                            {"tag": "bad", "when": "x"}])
+        chunks = iterencode(inners)
+        self.assertEqual(next(chunks), "[")
+        self.assertEqual(json.loads(next(chunks)), {"tag": "ok", "when": "T1"})
+        with self.assertRaises(TypeError):
+            list(chunks)
+
+    def test_iterload(self):
+        class Cheese(JsonRecord):
+            variety = Property(isa=unicode)
+            smelliness = Property(isa=float, coerce=float)
+
+        class CheeseList(JsonRecordList):
+            itemtype = Cheese
+
+        cheeses = [{"variety": u"Gruy\u00e8re", "smelliness": 12345.5},
+                   {"variety": "Brie", "smelliness": 3, "age": [1, 2]},
+                   {"variety": "Feta", "smelliness": 1e3}]
+        doc = json.dumps(cheeses)
+        for chunk_size in 1, 7, 65536:
+            loaded = list(iterload(CheeseList, StringIO(doc),
+                                   chunk_size=chunk_size))
+            self.assertEqual(CheeseList(loaded), CheeseList(cheeses))
+        self.assertEqual(loaded[1].unknown_json_keys, {"age": [1, 2]})
+
+        wrapped = json.dumps({"paging": {"next": "x"}, "data": cheeses,
+                              "trailer": [1, 2, 3]})
+        loaded = iterload(Cheese, StringIO(wrapped), key="data",
+                          chunk_size=5)
+        self.assertEqual(next(loaded).variety, u"Gruy\u00e8re")
+        self.assertEqual(len(list(loaded)), 2)
+
+        self.assertEqual(list(iterload(Cheese, StringIO(" [ ] "))), [])
+        self.assertEqual(
+            list(iterload(list_of(int), StringIO("[1, 2]"))), [1, 2],
+        )
+
+        # numbers split across reads at any point
+        doc = "[1.5, 22.75,3e2 , -4.0E+1,0.01,7]"
+        for chunk_size in range(1, len(doc) + 1):
+            self.assertEqual(
+                list(iterload(list_of(float), StringIO(doc),
+                              chunk_size=chunk_size)),
+                [1.5, 22.75, 300.0, -40.0, 0.01, 7.0],
+            )
+
+        bad = StringIO('{"data": [{"smelliness": 1}, {"smelliness": "x"}]}')
+        loaded = iterload(CheeseList, bad, key="data")
+        self.assertEqual(next(loaded).smelliness, 1.0)
+        with self.assertRaises(exc.JsonConversionError) as ar:
+            next(loaded)
+        self.assertEqual(ar.exception.error_fs.path, ".data[1]")
+        self.assertIsInstance(ar.exception.sub_exception, exc.CoerceError)
+
+        with self.assertRaisesRegexp(
+            exc.JsonConversionError, r"at \[2\]; Expecting ','",
+        ):
+            list(iterload(CheeseList, StringIO('[{}, {} {}]')))
+        with self.assertRaisesRegexp(exc.JsonConversionError, r"\[1\]"):
+            list(iterload(CheeseList, StringIO('[{}, {"variety": ')))
+
+        # syntax errors are raised without reading the rest of the input
+        for bad in '[{}, {"variety": "Brie",, ', '[{}, xyz, ', '[{}, {,}, ':
+            doc = StringIO(bad + '{"variety": "Edam"}, ' * 10000 + '{}]')
+            with self.assertRaisesRegexp(exc.JsonConversionError, r"\[1\]"):
+                list(iterload(CheeseList, doc, chunk_size=64))
+            self.assertLess(doc.tell(), 1024)
+        with self.assertRaisesRegexp(exc.JsonConversionError, r"not found"):
+            list(iterload(CheeseList, StringIO('{"a": []}'), key="b"))
+
+    def test_ndjson(self):
+        cheeses = [CheeseRecord(variety="Cheddar %d" % i, smelliness=i + 0.5)
+                   for i in range(25)]
+        for workers in None, 2:
+            buf = StringIO()
+            stats = to_ndjson(cheeses, buf, batch_size=10, workers=workers)
+            self.assertEqual(stats.records, 25)
+            self.assertEqual(stats.bytes, len(buf.getvalue()))
+            lines = buf.getvalue().splitlines()
+            self.assertEqual(len(lines), 25)
+            self.assertEqual(json.loads(lines[3]),
+                             {"variety": "Cheddar 3", "smelliness": 3.5})
+
+            buf.seek(0)
+            reports = []
+            loaded = list(from_ndjson(
+                CheeseRecord, buf, batch_size=10, workers=workers,
+                progress=lambda stats: reports.append(stats.records),
+            ))
+            self.assertEqual(loaded, cheeses)
+            self.assertEqual(reports, [10, 20, 25])
+
+        # a line which only fails to decode in a worker is decoded here,
+        # along with the rest of its batch
+        doc = "".join(
+            '{"variety": "%s"}\n' % ("fussy" if i == 5 else "Edam %d" % i)
+            for i in range(10)
+        )
+        reports = []
+        loaded = list(from_ndjson(
+            FussyCheeseRecord, StringIO(doc), batch_size=4, workers=2,
+            progress=lambda stats: reports.append((stats.records,
+                                                   stats.bytes)),
+        ))
+        self.assertEqual(len(loaded), 10)
+        self.assertEqual(loaded[5].variety, "fussy")
+        self.assertEqual(reports[-1], (10, len(doc)))
+
+        # likewise a record which only fails to encode in a worker
+        buf = StringIO()
+        stats = to_ndjson(
+            (FussyOutCheeseRecord(variety=x["variety"])
+             for x in map(json.loads, doc.splitlines())),
+            buf, batch_size=4, workers=2,
+        )
+        self.assertEqual(buf.getvalue(), doc)
+        self.assertEqual((stats.records, stats.bytes), (10, len(doc)))
+
+        data = StringIO('{"variety": "Brie"}\n\n{"smelliness": 101}\n')
+        loaded = from_ndjson(CheeseRecord, data)
+        self.assertEqual(next(loaded).variety, "Brie")
+        with self.assertRaises(exc.JsonConversionError) as ar:
+            next(loaded)
+        self.assertEqual(ar.exception.error_fs.path, "[2]")
+
+        with self.assertRaises(TypeError):
+            to_ndjson([CheeseRecord(variety="x"), object()], StringIO(),
+                      workers=2)
+
+    def test_from_json_parallel(self):
+        json_data = [{"variety": "Cheddar %d" % i, "smelliness": i + 0.5}
+                     for i in range(25)]
+        for workers in 1, 3:
+            cupboard = from_json_parallel(CheeseList, json_data, workers,
+                                          chunk_size=4)
+            self.assertIsInstance(cupboard, CheeseList)
+            self.assertEqual(cupboard, CheeseList(json_data))
+
+        self.assertEqual(
+            from_json_parallel(CheeseList, json.dumps(json_data), 2),
+            CheeseList(json_data),
+        )
+
+        # a member which only fails to decode in a worker is decoded here,
+        # along with the rest of its chunk
+        fussy = [{"variety": "fussy" if i == 5 else "Edam %d" % i}
+                 for i in range(10)]
+        self.assertEqual(
+            from_json_parallel(FussyCheeseList, fussy, 2, chunk_size=4),
+            FussyCheeseList(fussy),
+        )
+
+        json_data[17]["smelliness"] = 101
+        with self.assertRaises(exc.JsonConversionError) as ar:
+            from_json_parallel(CheeseList, json_data, 3, chunk_size=4)
+        self.assertEqual(ar.exception.error_fs.path, "[17]")
+        self.assertIsInstance(ar.exception.sub_exception,
+                              exc.ValueCheckError)
+
+    def test_from_json_collect(self):
+        class Shelf(JsonRecord):
+            name = Property(isa=str, required=True)
+            cheeses = JsonListProperty(of=CheeseRecord)
+
+        class Cupboard(JsonRecord):
+            id = Property(isa=int)
+            shelves = JsonDictProperty(of=Shelf)
+
+        json_data = {
+            "id": 1,
+            "shelves": {
+                "top": {"name": "Top", "cheeses": [
+                    {"variety": "Gouda", "smelliness": 12.0},
+                    {"variety": "Stinking Bishop", "smelliness": 150.0},
+                    {"variety": "Brie", "smelliness": 20.0},
+                ]},
+                "middle": {"cheeses": [
+                    {"variety": "Cheddar", "smelliness": 250.0},
+                ]},
+                "bottom": {"name": "Bottom", "cheeses": "none"},
+            },
+            "label": "pantry",
+        }
+        with self.assertRaises(exc.JsonConversionError):
+            from_json(Cupboard, json_data)
+
+        cupboard, failures = from_json(Cupboard, json_data, errors="collect")
+        self.assertEqual(cupboard.id, 1)
+        self.assertEqual(cupboard.unknown_json_keys, {"label": "pantry"})
+        self.assertEqual(cupboard.shelves.keys(), ["top"])
+        self.assertEqual(
+            list(x.variety for x in cupboard.shelves["top"].cheeses),
+            ["Gouda", "Brie"],
+        )
+        failures = dict((fs.path, (e, raw)) for fs, e, raw in failures)
+        self.assertEqual(
+            sorted(failures),
+            [".shelves.bottom", ".shelves.middle", ".shelves.top.cheeses[1]"],
+        )
+        e, raw = failures[".shelves.top.cheeses[1]"]
+        self.assertIsInstance(e, exc.ValueCheckError)
+        self.assertIs(raw, json_data["shelves"]["top"]["cheeses"][1])
+        # a failed member does not also report failures within it
+        e, raw = failures[".shelves.middle"]
+        self.assertIsInstance(e, exc.PropertyRequired)
+        e, raw = failures[".shelves.bottom"]
+        self.assertIsInstance(e, exc.JsonConversionError)
+        self.assertEqual(e.error_fs.path, ".cheeses")
+
+        cheeses, failures = from_json(
+            CheeseList, json.dumps(json_data["shelves"]["top"]["cheeses"]),
+            errors="collect",
+        )
+        self.assertEqual(len(cheeses), 2)
+        self.assertEqual(list(fs.path for fs, e, raw in failures), ["[1]"])
+
+        value, failures = from_json(Cupboard, [], errors="collect")
+        self.assertIsNone(value)
+        self.assertEqual(failures[0][0].path, "")
+        self.assertEqual(failures[0][2], [])
+
+        with self.assertRaises(exc.FromJsonErrorsMode):
+            from_json(Cupboard, json_data, errors="ignore")
+        with self.assertRaises(exc.FromJsonErrorsMode):
+            from_json(Cupboard, json_data, trusted=True, errors="collect")
+
+    def test_trusted_json(self):
+        class Cupboard(JsonRecord):
+            id = Property(isa=int, check=lambda x: x > 0)
+            made = Property(isa=datetime,
+                            coerce=lambda x: datetime.strptime(x, "%Y-%m-%d"))
+            best_cheese = Property(isa=CheeseRecord)
+            cheeses = JsonListProperty(of=CheeseRecord)
+
+        json_data = {
+            "id": 0,
+            "made": "2014-01-01",
+            "best_cheese": {"variety": "Gouda", "smelliness": 200.0},
+            "cheeses": [{"variety": "Brie", "smelliness": 150.0}],
+            "shelves": 3,
+        }
+        with self.assertRaises(exc.JsonConversionError):
+            from_json(Cupboard, json_data)
+
+        cupboard = from_json(Cupboard, json_data, trusted=True)
+        self.assertEqual(cupboard.id, 0)
+        self.assertEqual(cupboard.made, datetime(2014, 1, 1))
+        self.assertEqual(cupboard.best_cheese.smelliness, 200.0)
+        self.assertIsInstance(cupboard.cheeses[0], CheeseRecord)
+        self.assertEqual(cupboard.unknown_json_keys, {"shelves": 3})
+        self.assertEqual(
+            from_json(Cupboard, json.dumps(json_data), trusted=True),
+            cupboard,
+        )
+
+        class CheeseList(JsonRecordList):
+            itemtype = CheeseRecord
+
+        cheeses = from_json(CheeseList, json_data["cheeses"], trusted=True)
+        self.assertEqual(cheeses[0].smelliness, 150.0)
+
+        with self.assertRaisesRegexp(
+            exc.JsonConversionError, r'\.cheeses\[0\]',
+        ):
+            from_json(Cupboard, {"cheeses": [{"flavor": "mild"}]},
+                      trusted=True)
+
     def test_rich_enum(self):
         class MyEnum(RichEnum):
             class EnumValue(RichEnumValue):
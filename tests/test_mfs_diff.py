@@ -17,12 +17,16 @@
 from __future__ import absolute_import
 
 from datetime import date
+import itertools
+import random
 import re
 import unittest2
 
 from normalize import Property
 from normalize import Record
 from normalize import RecordList
+from normalize.diff import _fuzzy_match
+from normalize.diff import _fuzzy_score
 from normalize.diff import DiffOptions
 from normalize.property.coll import ListProperty
 from normalize.property.types import DateProperty
@@ -399,6 +403,42 @@ class TestDiffWithMultiFieldSelector(unittest2.TestCase):
             }
         )
 
+    def test_fuzzy_match_index(self):
+        def product_fuzzy_match(set_a, set_b):
+            # the original algorithm: score every pair, and sort
+            scores = list()
+            for a_pk_seq, b_pk_seq in itertools.product(set_a, set_b):
+                match, no_match = _fuzzy_score(a_pk_seq[0], b_pk_seq[0])
+                if match:
+                    scores.append((match - no_match, a_pk_seq, b_pk_seq))
+            remaining_a = set(set_a)
+            remaining_b = set(set_b)
+            for score, a_pk_seq, b_pk_seq in sorted(
+                scores, key=lambda x: x[0], reverse=True,
+            ):
+                if a_pk_seq in remaining_a and b_pk_seq in remaining_b:
+                    remaining_a.remove(a_pk_seq)
+                    remaining_b.remove(b_pk_seq)
+                    yield a_pk_seq, b_pk_seq
+
+        rand = random.Random(42)
+        values = ("a", "b", "c", "", None, 0, 1, ("x", None), ((), ""))
+
+        def pk_set(size):
+            return set(
+                (tuple(rand.choice(values) for j in range(rand.randint(1, 4))),
+                 rand.randint(0, 1))
+                for i in range(size)
+            )
+
+        for i in range(50):
+            set_a = pk_set(rand.randint(0, 40))
+            set_b = pk_set(rand.randint(0, 40))
+            self.assertEqual(
+                list(_fuzzy_match(set_a, set_b)),
+                list(product_fuzzy_match(set_a, set_b)),
+            )
+
     def test_ignore_empty_items(self):
         person = get_person(3)
         person.friends = []
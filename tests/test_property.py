@@ -447,6 +447,45 @@ class TestProperties(unittest2.TestCase):
         self.assertEqual(mixer.hmm, 4)
         self.assertEqual(mixer.huh, 4)
 
+    def test_compiled_validator(self):
+        """Test the validator selected for each combination of options"""
+
+        class LoggingProperty(SafeProperty):
+            __trait__ = "logging"
+            log = []
+
+            def type_safe_value(self, value, _none_ok=False):
+                self.log.append(value)
+                return super(LoggingProperty, self).type_safe_value(
+                    value, _none_ok,
+                )
+
+        class Shapes(Record):
+            anything = Property(required=True)
+            checked = Property(check=lambda x: x != "bad")
+            number = Property(isa=(int, long), coerce=int)
+            positive = Property(isa=int, check=lambda x: x > 0)
+            logged = Property(isa=int, traits=["logging"])
+
+        shapes = Shapes(anything=0, number="7", logged=1)
+        self.assertEqual(shapes.number, 7)
+        self.assertIs(Shapes.number.validator, Shapes.number._validate)
+        with self.assertRaises(exc.PropertyRequired):
+            shapes.anything = None
+        with self.assertRaises(exc.ValueCheckError):
+            shapes.checked = "bad"
+        with self.assertRaisesRegexp(exc.CoerceError, r"\(int, long\)"):
+            shapes.number = "seven"
+        with self.assertRaises(exc.ValueCheckError):
+            shapes.positive = 0
+        shapes.logged = 2
+        self.assertEqual(LoggingProperty.log, [1, 2])
+
+        Shapes.positive.check = None
+        Shapes.positive.compile_validator()
+        shapes.positive = 0
+        self.assertEqual(shapes.positive, 0)
+
     def test_list_of(self):
 
         class Person(Record):
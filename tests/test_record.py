@@ -19,9 +19,11 @@
 from __future__ import absolute_import
 
 from datetime import datetime
+import pickle
 import unittest2
 import warnings
 
+from normalize import LazyProperty
 from normalize import ListProperty
 from normalize import Property
 from normalize import Record
@@ -30,6 +32,13 @@ import normalize.exc as exc
 from normalize.visitor import VisitorPattern
 
 
+class CompactRecord(Record):
+    compact = True
+    num = Property(isa=int)
+    tag = Property()
+    double = LazyProperty(default=lambda self: self.num * 2)
+
+
 class TestRecords(unittest2.TestCase):
     """Test that the new data descriptor classes work"""
 
@@ -229,3 +238,205 @@ class TestRecords(unittest2.TestCase):
 
         sr.maybe_str = None
         self.assertEqual(sr.maybe_str, None)
+
+    def test_compiled_constructor(self):
+        """Test the constructor compiled by RecordMeta"""
+
+        class OrderRecord(Record):
+            order_id = Property(isa=int, required=True)
+            status = Property(isa=str, default="new")
+            total = Property(isa=float, coerce=float)
+            label = Property(default=lambda self: "#%d" % self.order_id)
+
+        order = OrderRecord(order_id=1, total="2.5")
+        self.assertEqual(order.status, "new")
+        self.assertEqual(order.total, 2.5)
+        self.assertEqual(order.label, "#1")
+        self.assertIn("raise PropertyRequired", OrderRecord._init_props.source)
+
+        order = OrderRecord({"order_id": 2, "status": "paid"})
+        self.assertEqual(order.status, "paid")
+        self.assertEqual(order.label, "#2")
+
+        with self.assertRaises(exc.PropertyNotKnown):
+            OrderRecord(order_id=3, color="red")
+        with self.assertRaises(exc.PropertyNotKnown):
+            OrderRecord(color="red")
+        with self.assertRaises(exc.AmbiguousConstruction):
+            OrderRecord({"order_id": 4}, status="paid")
+        with self.assertRaisesRegexp(exc.PropertyRequired, r"order_id"):
+            OrderRecord(status="paid")
+        with self.assertRaises(exc.CoerceError):
+            OrderRecord(order_id=5, total="lots")
+
+        class BigOrderRecord(OrderRecord):
+            priority = Property(isa=int, default=0)
+
+        big_order = BigOrderRecord(order_id=6)
+        self.assertEqual(big_order.priority, 0)
+        self.assertEqual(big_order.label, "#6")
+        with self.assertRaises(exc.PropertyNotKnown):
+            OrderRecord(order_id=7, priority=1)
+
+        # property settings are read when records are constructed
+        class NoteRecord(Record):
+            text = Property(isa=str, required=True)
+
+        with self.assertRaises(exc.PropertyRequired):
+            NoteRecord()
+        NoteRecord.properties["text"].required = False
+        NoteRecord.properties["text"].compile_validator()
+        self.assertFalse(hasattr(NoteRecord(), "text"))
+        NoteRecord.properties["text"].default = "hi"
+        self.assertEqual(NoteRecord().text, "hi")
+
+        # as are properties added after the type is declared
+        author = Property(isa=str, default="anon")
+        author.set_name("author")
+        author.bind(NoteRecord)
+        NoteRecord.properties["author"] = author
+        self.assertEqual(NoteRecord().author, "anon")
+        self.assertEqual(NoteRecord(author="me").author, "me")
+        self.assertEqual(NoteRecord.from_trusted(author="me").author, "me")
+        with self.assertRaises(exc.PropertyNotKnown):
+            NoteRecord(color="red")
+
+    def test_from_trusted(self):
+        """Test the unchecked constructor for known-good data"""
+
+        class OrderRecord(Record):
+            order_id = Property(isa=int, required=True,
+                                check=lambda x: x > 0)
+            total = Property(isa=float, coerce=float)
+            status = Property(default="new")
+
+        order = OrderRecord.from_trusted(order_id=0, total="2.5")
+        self.assertEqual(order.order_id, 0)
+        self.assertEqual(order.total, "2.5")
+        self.assertEqual(order.status, "new")
+        self.assertIn("__dict__", OrderRecord._init_trusted.source)
+
+        with self.assertRaises(exc.PropertyNotKnown):
+            OrderRecord.from_trusted(order_id=1, color="red")
+        with self.assertRaises(exc.PropertyRequired):
+            OrderRecord.from_trusted(total=1.0)
+
+        compact = CompactRecord.from_trusted(num="3")
+        self.assertEqual(compact.num, "3")
+        self.assertEqual(compact, CompactRecord.from_trusted(num="3"))
+
+        Record.validate_trusted = True
+        try:
+            with self.assertRaises(ValueError):
+                OrderRecord.from_trusted(order_id=0)
+            order = OrderRecord.from_trusted(order_id=1, total="2.5")
+            self.assertEqual(order.total, 2.5)
+        finally:
+            Record.validate_trusted = False
+
+    def test_compact_records(self):
+        """Test records which store their properties in __slots__"""
+
+        class LooseRecord(Record):
+            num = Property(isa=int)
+            tag = Property()
+            double = LazyProperty(default=lambda self: self.num * 2)
+
+        self.assertEqual(CompactRecord.__slots__, ("double", "num", "tag"))
+        self.assertIsInstance(CompactRecord.__dict__['num'], Property)
+
+        loose = LooseRecord(num=3, tag="x")
+        compact = CompactRecord(num=3, tag="x")
+        self.assertFalse(hasattr(compact, "__dict__"))
+        self.assertEqual(repr(compact), "CompactRecord(num=3, tag='x')")
+        self.assertEqual(compact.double, 6)
+        self.assertEqual(compact.double, 6)
+        self.assertEqual(repr(compact), "CompactRecord(double=6, num=3, tag='x')")
+        self.assertEqual(loose.double, 6)
+
+        with self.assertRaises(exc.CoerceError):
+            compact.num = "three"
+        compact.tag = ["unchecked"]
+        self.assertEqual(compact.tag, ["unchecked"])
+        del compact.tag
+        self.assertTrue(CompactRecord.tag.slot_is_empty(compact))
+        with self.assertRaises(AttributeError):
+            compact.tag
+        self.assertFalse(compact.tag0)
+        with self.assertRaises(AttributeError):
+            compact.undeclared = True
+
+        for protocol in 0, 1, 2:
+            thawed = pickle.loads(pickle.dumps(compact, protocol))
+            self.assertEqual(thawed, compact)
+            self.assertEqual(thawed.double, 6)
+
+        class CompactSubRecord(CompactRecord):
+            extra = Property(default="new")
+
+        sub = CompactSubRecord(num=1)
+        self.assertFalse(hasattr(sub, "__dict__"))
+        self.assertEqual(sub.extra, "new")
+        self.assertEqual(sub.double, 2)
+
+        class MixedRecord(LooseRecord):
+            compact = True
+            extra = Property(default="new")
+
+        mixed = MixedRecord(num=1)
+        self.assertEqual(mixed.__dict__, {"num": 1})
+        self.assertEqual(repr(mixed), "MixedRecord(extra='new', num=1)")
+
+    def test_record_id_cache(self):
+        from normalize.coll import list_of
+        from normalize.identity import record_id
+
+        class Crater(Record):
+            name = Property(isa=str)
+            diameter = Property(isa=int)
+
+        class Moon(Record):
+            name = Property(isa=str)
+            craters = Property(isa=list_of(Crater))
+
+        class LooseMoon(Record):
+            name = Property()
+
+        moon = Moon(name="luna", craters=[{"name": "tycho"}])
+        self.assertEqual(record_id(moon), (((None, "tycho"),), "luna"))
+        self.assertIn("_record_ids", moon.__dict__)
+        moons = set([moon])
+        self.assertIn(Moon(name="luna", craters=[{"name": "tycho"}]), moons)
+
+        # checked assignments and collection mutations invalidate it
+        moon.craters[0].diameter = 85
+        self.assertEqual(record_id(moon), (((85, "tycho"),), "luna"))
+        moon.craters.append(Crater(name="copernicus"))
+        self.assertEqual(
+            record_id(moon),
+            (((85, "tycho"), (None, "copernicus")), "luna"),
+        )
+        del moon.name
+        self.assertEqual(record_id(moon)[1], None)
+        self.assertNotIn("_record_ids", moon.__getstate__())
+
+        # unchecked assignments can't be seen, so it is not cached
+        loose = LooseMoon(name="luna")
+        self.assertEqual(hash(loose), hash(("luna",)))
+        self.assertNotIn("_record_ids", loose.__dict__)
+        loose.name = "selene"
+        self.assertEqual(record_id(loose), ("selene",))
+
+        # nor if normalize_object_slot does not come with a key
+        def shout(value, prop, obj):
+            return value.upper() if isinstance(value, str) else value
+
+        crater = Crater(name="tycho")
+        self.assertEqual(record_id(crater, normalize_object_slot=shout),
+                         (None, "TYCHO"))
+        self.assertEqual(record_id(crater), (None, "tycho"))
+        self.assertEqual(
+            record_id(crater, normalize_object_slot=shout, cache_key="up"),
+            (None, "TYCHO"),
+        )
+        self.assertEqual(len(crater.__dict__["_record_ids"]), 2)